@@ -0,0 +1,63 @@
+"""Measures validation of a batch of messages, with a loop calling validate(),
+which resolves validator for every message, and with validate_many(), and
+validation of repeated message fields, which use batch validators
+
+Usage: PYTHONPATH=src python benchmarks/validate_many.py
+"""
+import timeit
+import tempfile
+
+from google.protobuf.message_factory import GetMessages
+
+from harness.cli.utils import load_descriptor_set
+from harness.runtime._validate import validate, validate_many
+
+
+PROTO = """
+syntax = "proto3";
+package bench;
+import "validate/validate.proto";
+
+message Item {
+    string name = 1 [(validate.rules).string.min_len = 1];
+    uint32 count = 2 [(validate.rules).uint32.gt = 0];
+    double price = 3 [(validate.rules).double.gte = 0];
+}
+message Batch {
+    repeated Item items = 1;
+}
+"""
+
+
+def load_types():
+    with tempfile.NamedTemporaryFile(suffix=".proto") as proto_file:
+        proto_file.write(PROTO.encode("utf-8"))
+        proto_file.flush()
+        file_descriptor_set = load_descriptor_set(proto_file.name)
+    return GetMessages(file_descriptor_set.file)
+
+
+def validate_loop(messages):
+    for message in messages:
+        validate(message)
+
+
+def main():
+    types = load_types()
+    size = 10000
+    items = [types["bench.Item"](name="x", count=i + 1, price=1.5) for i in range(size)]
+    batch = types["bench.Batch"](items=items)
+    cases = [
+        ("validate() loop", lambda: validate_loop(items)),
+        ("validate_many()", lambda: validate_many(items)),
+        ("validate(repeated)", lambda: validate(batch)),
+    ]
+    for name, func in cases:
+        func()
+        number = 10
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print(f"{name}: {size * number / best / 1000:.0f}k items/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Measures validation of deep and wide trees of repeated messages
+
+Usage: PYTHONPATH=src python benchmarks/validate_nested.py
+"""
+import timeit
+import tempfile
+
+from google.protobuf.message_factory import GetMessages
+
+from harness.cli.utils import load_descriptor_set
+from harness.runtime._validate import validate
+
+
+PROTO = """
+syntax = "proto3";
+package bench;
+import "validate/validate.proto";
+import "google/protobuf/timestamp.proto";
+
+message Leaf {
+    string name = 1 [(validate.rules).string.min_len = 1];
+    google.protobuf.Timestamp ts = 2;
+}
+message Node {
+    repeated Leaf leaves = 1;
+    repeated Node children = 2;
+}
+"""
+
+
+def load_types():
+    with tempfile.NamedTemporaryFile(suffix=".proto") as proto_file:
+        proto_file.write(PROTO.encode("utf-8"))
+        proto_file.flush()
+        file_descriptor_set = load_descriptor_set(proto_file.name)
+    return GetMessages(file_descriptor_set.file)
+
+
+def build(node_type, depth, width, leaves):
+    node = node_type(leaves=[dict(name="x") for _ in range(leaves)])
+    if depth:
+        node.children.extend(
+            build(node_type, depth - 1, width, leaves) for _ in range(width)
+        )
+    return node
+
+
+def main():
+    node_type = load_types()["bench.Node"]
+    for depth, width, leaves in [(3, 3, 50), (10, 1, 50), (1, 50, 50)]:
+        node = build(node_type, depth, width, leaves)
+        validate(node)
+        number = 20
+        best = min(timeit.repeat(lambda: validate(node), number=number, repeat=5))
+        print(
+            f"depth={depth} width={width} leaves={leaves}:"
+            f" {best / number * 1000:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
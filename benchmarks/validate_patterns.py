@@ -0,0 +1,55 @@
+"""Measures validation of a message with many distinct string patterns,
+more than the ``re`` module caches
+
+Usage: PYTHONPATH=src python benchmarks/validate_patterns.py
+"""
+import timeit
+import tempfile
+
+from google.protobuf.message_factory import GetMessages
+
+from harness.cli.utils import load_descriptor_set
+from harness.runtime._validate import validate
+
+
+FIELDS = 600
+
+PROTO = """
+syntax = "proto3";
+package bench;
+import "validate/validate.proto";
+
+enum Kind {
+    A = 0;
+    B = 1;
+}
+message Message {
+    %s
+    Kind kind = %d [(validate.rules).enum.defined_only = true];
+}
+"""
+
+
+def load_types():
+    fields = "\n    ".join(
+        f'string f{i} = {i + 1} [(validate.rules).string.pattern = "^v{i}-[a-z]+$"];'
+        for i in range(FIELDS)
+    )
+    with tempfile.NamedTemporaryFile(suffix=".proto") as proto_file:
+        proto_file.write((PROTO % (fields, FIELDS + 1)).encode("utf-8"))
+        proto_file.flush()
+        file_descriptor_set = load_descriptor_set(proto_file.name)
+    return GetMessages(file_descriptor_set.file)
+
+
+def main():
+    message_type = load_types()["bench.Message"]
+    message = message_type(**{f"f{i}": f"v{i}-abc" for i in range(FIELDS)})
+    validate(message)
+    number = 200
+    best = min(timeit.repeat(lambda: validate(message), number=number, repeat=5))
+    print(f"fields={FIELDS}: {best / number * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
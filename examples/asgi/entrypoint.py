@@ -5,9 +5,9 @@ import sys
 
 from harness.runtime import Runner
 
-import mccoy
 import mccoy_pb2
 import mccoy_wires
+import mccoy
 
 runner = Runner(
     mccoy_pb2.Configuration,
@@ -0,0 +1,81 @@
+# Generated by the Protocol Buffers compiler. DO NOT EDIT!
+# source: mccoy.proto
+# plugin: harness.plugin.python
+# mypy: ignore-errors
+from harness.runtime._validate import CTX
+
+globals().update(CTX)
+
+
+def _validate_mccoy_Configuration(p):
+    if not p.HasField('server'):
+        raise ValidationError('server is required')
+    if p.HasField("server"):
+        _validate_harness_http_Server(p.server)
+    if not p.HasField('console'):
+        raise ValidationError('console is required')
+    if not p.HasField('tracing'):
+        raise ValidationError('tracing is required')
+    if p.HasField("tracing"):
+        _validate_harness_tracing_Jaeger(p.tracing)
+
+
+def _validate_all_mccoy_Configuration(p, violations, path):
+    if not p.HasField('server'):
+        violations.append(Violation(path + 'server', 'message.required', 'server is required'))
+    if p.HasField("server"):
+        _validate_all_harness_http_Server(p.server, violations, path + "server.")
+    if not p.HasField('console'):
+        violations.append(Violation(path + 'console', 'message.required', 'console is required'))
+    if not p.HasField('tracing'):
+        violations.append(Violation(path + 'tracing', 'message.required', 'tracing is required'))
+    if p.HasField("tracing"):
+        _validate_all_harness_tracing_Jaeger(p.tracing, violations, path + "tracing.")
+
+
+def _validate_many_mccoy_Configuration(ps, errors):
+    for i, p in enumerate(ps):
+        try:
+            if not p.HasField('server'):
+                raise ValidationError('server is required')
+            if p.HasField("server"):
+                _validate_harness_http_Server(p.server)
+            if not p.HasField('console'):
+                raise ValidationError('console is required')
+            if not p.HasField('tracing'):
+                raise ValidationError('tracing is required')
+            if p.HasField("tracing"):
+                _validate_harness_tracing_Jaeger(p.tracing)
+        except ValidationError as exc:
+            if errors is None:
+                raise
+            errors[i] = exc
+
+
+_validate_harness_http_Server = validate
+_validate_harness_tracing_Jaeger = validate
+_validate_all_harness_http_Server = collect
+_validate_all_harness_tracing_Jaeger = collect
+
+
+VALIDATORS = {
+    'mccoy.Configuration': _validate_mccoy_Configuration,
+}
+
+
+COLLECTORS = {
+    'mccoy.Configuration': _validate_all_mccoy_Configuration,
+}
+
+
+BATCH_VALIDATORS = {
+    'mccoy.Configuration': _validate_many_mccoy_Configuration,
+}
+
+
+EXTERNAL = {
+    '_validate_harness_http_Server': ('validator', 'harness.http.Server'),
+    '_validate_harness_tracing_Jaeger': ('validator', 'harness.tracing.Jaeger'),
+    '_validate_all_harness_http_Server': ('collector', 'harness.http.Server'),
+    '_validate_all_harness_tracing_Jaeger': ('collector', 'harness.tracing.Jaeger'),
+}
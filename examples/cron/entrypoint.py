@@ -5,9 +5,9 @@ import sys
 
 from harness.runtime import Runner
 
-import pulsar
 import pulsar_pb2
 import pulsar_wires
+import pulsar
 
 runner = Runner(
     pulsar_pb2.Configuration,
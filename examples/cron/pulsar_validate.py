@@ -0,0 +1,71 @@
+# Generated by the Protocol Buffers compiler. DO NOT EDIT!
+# source: pulsar.proto
+# plugin: harness.plugin.python
+# mypy: ignore-errors
+from harness.runtime._validate import CTX
+
+globals().update(CTX)
+
+
+def _validate_pulsar_Configuration(p):
+    if not p.HasField('redis_job_store'):
+        raise ValidationError('redis_job_store is required')
+    if p.HasField("redis_job_store"):
+        _validate_harness_redis_Connection(p.redis_job_store)
+    if not p.HasField('console'):
+        raise ValidationError('console is required')
+    if not p.HasField('scheduler'):
+        raise ValidationError('scheduler is required')
+
+
+def _validate_all_pulsar_Configuration(p, violations, path):
+    if not p.HasField('redis_job_store'):
+        violations.append(Violation(path + 'redis_job_store', 'message.required', 'redis_job_store is required'))
+    if p.HasField("redis_job_store"):
+        _validate_all_harness_redis_Connection(p.redis_job_store, violations, path + "redis_job_store.")
+    if not p.HasField('console'):
+        violations.append(Violation(path + 'console', 'message.required', 'console is required'))
+    if not p.HasField('scheduler'):
+        violations.append(Violation(path + 'scheduler', 'message.required', 'scheduler is required'))
+
+
+def _validate_many_pulsar_Configuration(ps, errors):
+    for i, p in enumerate(ps):
+        try:
+            if not p.HasField('redis_job_store'):
+                raise ValidationError('redis_job_store is required')
+            if p.HasField("redis_job_store"):
+                _validate_harness_redis_Connection(p.redis_job_store)
+            if not p.HasField('console'):
+                raise ValidationError('console is required')
+            if not p.HasField('scheduler'):
+                raise ValidationError('scheduler is required')
+        except ValidationError as exc:
+            if errors is None:
+                raise
+            errors[i] = exc
+
+
+_validate_harness_redis_Connection = validate
+_validate_all_harness_redis_Connection = collect
+
+
+VALIDATORS = {
+    'pulsar.Configuration': _validate_pulsar_Configuration,
+}
+
+
+COLLECTORS = {
+    'pulsar.Configuration': _validate_all_pulsar_Configuration,
+}
+
+
+BATCH_VALIDATORS = {
+    'pulsar.Configuration': _validate_many_pulsar_Configuration,
+}
+
+
+EXTERNAL = {
+    '_validate_harness_redis_Connection': ('validator', 'harness.redis.Connection'),
+    '_validate_all_harness_redis_Connection': ('collector', 'harness.redis.Connection'),
+}
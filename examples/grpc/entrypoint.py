@@ -5,9 +5,9 @@ import sys
 
 from harness.runtime import Runner
 
-import scotty
 import scotty_pb2
 import scotty_wires
+import scotty
 
 runner = Runner(
     scotty_pb2.Configuration,
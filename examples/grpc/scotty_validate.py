@@ -0,0 +1,95 @@
+# Generated by the Protocol Buffers compiler. DO NOT EDIT!
+# source: scotty.proto
+# plugin: harness.plugin.python
+# mypy: ignore-errors
+from harness.runtime._validate import CTX
+
+globals().update(CTX)
+
+
+def _validate_scotty_Configuration(p):
+    if not p.HasField('db'):
+        raise ValidationError('db is required')
+    if p.HasField("db"):
+        _validate_harness_postgres_Pool(p.db)
+    if p.HasField("tracing"):
+        _validate_harness_tracing_Jaeger(p.tracing)
+    if not p.HasField('server'):
+        raise ValidationError('server is required')
+    if p.HasField("server"):
+        _validate_harness_grpc_Server(p.server)
+    if p.HasField("prometheus"):
+        _validate_harness_metrics_Prometheus(p.prometheus)
+
+
+def _validate_all_scotty_Configuration(p, violations, path):
+    if not p.HasField('db'):
+        violations.append(Violation(path + 'db', 'message.required', 'db is required'))
+    if p.HasField("db"):
+        _validate_all_harness_postgres_Pool(p.db, violations, path + "db.")
+    if p.HasField("tracing"):
+        _validate_all_harness_tracing_Jaeger(p.tracing, violations, path + "tracing.")
+    if not p.HasField('server'):
+        violations.append(Violation(path + 'server', 'message.required', 'server is required'))
+    if p.HasField("server"):
+        _validate_all_harness_grpc_Server(p.server, violations, path + "server.")
+    if p.HasField("prometheus"):
+        _validate_all_harness_metrics_Prometheus(p.prometheus, violations, path + "prometheus.")
+
+
+def _validate_many_scotty_Configuration(ps, errors):
+    for i, p in enumerate(ps):
+        try:
+            if not p.HasField('db'):
+                raise ValidationError('db is required')
+            if p.HasField("db"):
+                _validate_harness_postgres_Pool(p.db)
+            if p.HasField("tracing"):
+                _validate_harness_tracing_Jaeger(p.tracing)
+            if not p.HasField('server'):
+                raise ValidationError('server is required')
+            if p.HasField("server"):
+                _validate_harness_grpc_Server(p.server)
+            if p.HasField("prometheus"):
+                _validate_harness_metrics_Prometheus(p.prometheus)
+        except ValidationError as exc:
+            if errors is None:
+                raise
+            errors[i] = exc
+
+
+_validate_harness_postgres_Pool = validate
+_validate_harness_tracing_Jaeger = validate
+_validate_harness_grpc_Server = validate
+_validate_harness_metrics_Prometheus = validate
+_validate_all_harness_postgres_Pool = collect
+_validate_all_harness_tracing_Jaeger = collect
+_validate_all_harness_grpc_Server = collect
+_validate_all_harness_metrics_Prometheus = collect
+
+
+VALIDATORS = {
+    'scotty.Configuration': _validate_scotty_Configuration,
+}
+
+
+COLLECTORS = {
+    'scotty.Configuration': _validate_all_scotty_Configuration,
+}
+
+
+BATCH_VALIDATORS = {
+    'scotty.Configuration': _validate_many_scotty_Configuration,
+}
+
+
+EXTERNAL = {
+    '_validate_harness_postgres_Pool': ('validator', 'harness.postgres.Pool'),
+    '_validate_harness_tracing_Jaeger': ('validator', 'harness.tracing.Jaeger'),
+    '_validate_harness_grpc_Server': ('validator', 'harness.grpc.Server'),
+    '_validate_harness_metrics_Prometheus': ('validator', 'harness.metrics.Prometheus'),
+    '_validate_all_harness_postgres_Pool': ('collector', 'harness.postgres.Pool'),
+    '_validate_all_harness_tracing_Jaeger': ('collector', 'harness.tracing.Jaeger'),
+    '_validate_all_harness_grpc_Server': ('collector', 'harness.grpc.Server'),
+    '_validate_all_harness_metrics_Prometheus': ('collector', 'harness.metrics.Prometheus'),
+}
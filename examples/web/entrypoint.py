@@ -5,9 +5,9 @@ import sys
 
 from harness.runtime import Runner
 
-import kirk
 import kirk_pb2
 import kirk_wires
+import kirk
 
 runner = Runner(
     kirk_pb2.Configuration,
@@ -0,0 +1,129 @@
+# Generated by the Protocol Buffers compiler. DO NOT EDIT!
+# source: kirk.proto
+# plugin: harness.plugin.python
+# mypy: ignore-errors
+from harness.runtime._validate import CTX
+
+globals().update(CTX)
+
+
+def _validate_kirk_Configuration(p):
+    if not p.HasField('db'):
+        raise ValidationError('db is required')
+    if p.HasField("db"):
+        _validate_harness_postgres_Pool(p.db)
+    if not p.HasField('scotty'):
+        raise ValidationError('scotty is required')
+    if p.HasField("scotty"):
+        _validate_harness_grpc_Channel(p.scotty)
+    if not p.HasField('console'):
+        raise ValidationError('console is required')
+    if not p.HasField('tracing'):
+        raise ValidationError('tracing is required')
+    if p.HasField("tracing"):
+        _validate_harness_tracing_Jaeger(p.tracing)
+    if not p.HasField('server'):
+        raise ValidationError('server is required')
+    if p.HasField("server"):
+        _validate_harness_http_Server(p.server)
+    if not p.HasField('monitor'):
+        raise ValidationError('monitor is required')
+    if p.HasField("monitor"):
+        _validate_harness_net_Server(p.monitor)
+
+
+def _validate_all_kirk_Configuration(p, violations, path):
+    if not p.HasField('db'):
+        violations.append(Violation(path + 'db', 'message.required', 'db is required'))
+    if p.HasField("db"):
+        _validate_all_harness_postgres_Pool(p.db, violations, path + "db.")
+    if not p.HasField('scotty'):
+        violations.append(Violation(path + 'scotty', 'message.required', 'scotty is required'))
+    if p.HasField("scotty"):
+        _validate_all_harness_grpc_Channel(p.scotty, violations, path + "scotty.")
+    if not p.HasField('console'):
+        violations.append(Violation(path + 'console', 'message.required', 'console is required'))
+    if not p.HasField('tracing'):
+        violations.append(Violation(path + 'tracing', 'message.required', 'tracing is required'))
+    if p.HasField("tracing"):
+        _validate_all_harness_tracing_Jaeger(p.tracing, violations, path + "tracing.")
+    if not p.HasField('server'):
+        violations.append(Violation(path + 'server', 'message.required', 'server is required'))
+    if p.HasField("server"):
+        _validate_all_harness_http_Server(p.server, violations, path + "server.")
+    if not p.HasField('monitor'):
+        violations.append(Violation(path + 'monitor', 'message.required', 'monitor is required'))
+    if p.HasField("monitor"):
+        _validate_all_harness_net_Server(p.monitor, violations, path + "monitor.")
+
+
+def _validate_many_kirk_Configuration(ps, errors):
+    for i, p in enumerate(ps):
+        try:
+            if not p.HasField('db'):
+                raise ValidationError('db is required')
+            if p.HasField("db"):
+                _validate_harness_postgres_Pool(p.db)
+            if not p.HasField('scotty'):
+                raise ValidationError('scotty is required')
+            if p.HasField("scotty"):
+                _validate_harness_grpc_Channel(p.scotty)
+            if not p.HasField('console'):
+                raise ValidationError('console is required')
+            if not p.HasField('tracing'):
+                raise ValidationError('tracing is required')
+            if p.HasField("tracing"):
+                _validate_harness_tracing_Jaeger(p.tracing)
+            if not p.HasField('server'):
+                raise ValidationError('server is required')
+            if p.HasField("server"):
+                _validate_harness_http_Server(p.server)
+            if not p.HasField('monitor'):
+                raise ValidationError('monitor is required')
+            if p.HasField("monitor"):
+                _validate_harness_net_Server(p.monitor)
+        except ValidationError as exc:
+            if errors is None:
+                raise
+            errors[i] = exc
+
+
+_validate_harness_postgres_Pool = validate
+_validate_harness_grpc_Channel = validate
+_validate_harness_tracing_Jaeger = validate
+_validate_harness_http_Server = validate
+_validate_harness_net_Server = validate
+_validate_all_harness_postgres_Pool = collect
+_validate_all_harness_grpc_Channel = collect
+_validate_all_harness_tracing_Jaeger = collect
+_validate_all_harness_http_Server = collect
+_validate_all_harness_net_Server = collect
+
+
+VALIDATORS = {
+    'kirk.Configuration': _validate_kirk_Configuration,
+}
+
+
+COLLECTORS = {
+    'kirk.Configuration': _validate_all_kirk_Configuration,
+}
+
+
+BATCH_VALIDATORS = {
+    'kirk.Configuration': _validate_many_kirk_Configuration,
+}
+
+
+EXTERNAL = {
+    '_validate_harness_postgres_Pool': ('validator', 'harness.postgres.Pool'),
+    '_validate_harness_grpc_Channel': ('validator', 'harness.grpc.Channel'),
+    '_validate_harness_tracing_Jaeger': ('validator', 'harness.tracing.Jaeger'),
+    '_validate_harness_http_Server': ('validator', 'harness.http.Server'),
+    '_validate_harness_net_Server': ('validator', 'harness.net.Server'),
+    '_validate_all_harness_postgres_Pool': ('collector', 'harness.postgres.Pool'),
+    '_validate_all_harness_grpc_Channel': ('collector', 'harness.grpc.Channel'),
+    '_validate_all_harness_tracing_Jaeger': ('collector', 'harness.tracing.Jaeger'),
+    '_validate_all_harness_http_Server': ('collector', 'harness.http.Server'),
+    '_validate_all_harness_net_Server': ('collector', 'harness.net.Server'),
+}
@@ -5,8 +5,8 @@ from contextlib import closing
 
 from google.protobuf.json_format import ParseDict, ParseError
 
-from ..runtime._utils import load_config
-from ..runtime._validate import validate, ValidationError
+from ..runtime._utils import load_config, snapshot_key, write_snapshot
+from ..runtime._validate import validate_all
 
 from .utils import get_configuration, load_descriptor_set, get_messages
 
@@ -18,6 +18,7 @@ def check(
     *,
     merge_file: Optional[StringIO] = None,
     patch_file: Optional[StringIO] = None,
+    snapshot_dir: Optional[str] = None,
 ) -> None:
     with closing(config_file):
         config_content = config_file.read()
@@ -59,9 +60,15 @@ def check(
     except ParseError as err:
         print(f"Parse error: {err}")
         sys.exit(1)
-    try:
-        validate(config)
-    except ValidationError as err:
-        print(f"Validation error: {err}")
+    violations = validate_all(config)
+    if violations:
+        for violation in violations:
+            print(f"Validation error: {violation.path}: {violation.message}")
         sys.exit(1)
+    if snapshot_dir is not None:
+        key = snapshot_key(
+            config.DESCRIPTOR, config_content, merge_content, patch_content
+        )
+        path = write_snapshot(snapshot_dir, key, config.SerializeToString())
+        print(f"Snapshot: {path}")
     print("OK")
@@ -44,6 +44,7 @@ def add_check(subparsers: Any) -> None:
             args.proto_path,
             merge_file=args.merge,
             patch_file=args.patch,
+            snapshot_dir=args.emit_snapshot,
         )
 
     parser = subparsers.add_parser("check")
@@ -56,6 +57,7 @@ def add_check(subparsers: Any) -> None:
     parser.add_argument(
         "--patch", type=argparse.FileType(encoding="utf-8"), default=None
     )
+    parser.add_argument("--emit-snapshot", metavar="DIR", default=None)
     parser.set_defaults(func=func)
 
 
@@ -69,6 +71,19 @@ def add_protopath(subparsers: Any) -> None:
     check_parser.set_defaults(func=func)
 
 
+def add_profile_startup(subparsers: Any) -> None:
+    def func(args: argparse.Namespace) -> int:
+        from . import profile
+
+        return profile.profile_startup(args.command, trace=args.trace, top=args.top)
+
+    parser = subparsers.add_parser("profile-startup")
+    parser.add_argument("--trace", metavar="PATH", default=None)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    parser.set_defaults(func=func)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     subparser = parser.add_subparsers()
@@ -76,6 +91,7 @@ def main() -> None:
     add_kubegen(subparser)
     add_check(subparser)
     add_protopath(subparser)
+    add_profile_startup(subparser)
 
     args = parser.parse_args()
     if "func" in args:
@@ -0,0 +1,154 @@
+import os
+import re
+import sys
+import json
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+
+
+_IMPORT_TIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass(frozen=True)
+class Import:
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+    children: Tuple["Import", ...]
+
+
+def parse_import_time(lines: List[str]) -> List[Import]:
+    """Parses ``-X importtime`` output into a list of the top-level imports,
+    lines are written in post-order, nesting is encoded by indentation
+    """
+    pending: Dict[int, List[Import]] = {}
+    for line in lines:
+        match = _IMPORT_TIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        depth = (len(indent) - 1) // 2
+        children = tuple(pending.pop(depth + 1, []))
+        item = Import(name, depth, int(self_us), int(cumulative_us), children)
+        pending.setdefault(depth, []).append(item)
+    return pending.get(0, [])
+
+
+def _walk(imports: Tuple[Import, ...]) -> List[Import]:
+    result = []
+    for item in imports:
+        result.append(item)
+        result.extend(_walk(item.children))
+    return result
+
+
+def _import_events(imports: List[Import]) -> List[Dict[str, Any]]:
+    # -X importtime doesn't report when imports were started, so imports are
+    # laid out one after another, children at the beginning of their parent
+    events = []
+
+    def add(items: Tuple[Import, ...], start: int) -> None:
+        for item in items:
+            events.append(
+                {
+                    "name": item.name,
+                    "cat": "import",
+                    "ph": "X",
+                    "ts": start,
+                    "dur": item.cumulative_us,
+                    "pid": 1,
+                    "tid": "imports",
+                }
+            )
+            add(item.children, start)
+            start += item.cumulative_us
+
+    add(tuple(imports), 0)
+    return events
+
+
+def _timing_events(timings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not timings:
+        return []
+    origin = min(t["start"] for t in timings)
+    return [
+        {
+            "name": f"{t['name']}.{t['stage']}",
+            "cat": "startup",
+            "ph": "X",
+            "ts": (t["start"] - origin) // 1000,
+            "dur": (t["end"] - t["start"]) // 1000,
+            "pid": 1,
+            "tid": "startup",
+            "args": {"type": t["type"]},
+        }
+        for t in timings
+    ]
+
+
+def print_report(
+    imports: List[Import], timings: List[Dict[str, Any]], top: int
+) -> None:
+    total_us = sum(i.cumulative_us for i in imports)
+    print(f"Imports: {total_us / 1e6:.3f}s")
+    print(f"  {'self':>8}  {'cumulative':>10}  module")
+    by_self = sorted(_walk(tuple(imports)), key=lambda i: i.self_us, reverse=True)
+    for item in by_self[:top]:
+        print(
+            f"  {item.self_us / 1e6:>7.3f}s  {item.cumulative_us / 1e6:>9.3f}s"
+            f"  {item.name}"
+        )
+    if timings:
+        total_ns = max(t["end"] for t in timings) - min(t["start"] for t in timings)
+        print(f"Startup: {total_ns / 1e9:.3f}s")
+        for t in timings:
+            name = f"{t['name']}.{t['stage']}"
+            duration = (t["end"] - t["start"]) / 1e9
+            print(f"  {duration:>7.3f}s  {name:<30}  {t['type']}".rstrip())
+
+
+def profile_startup(
+    command: List[str], *, trace: Optional[str] = None, top: int = 20
+) -> int:
+    fd, profile_path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                *command,
+                f"--profile-startup={profile_path}",
+            ],
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        with open(profile_path, encoding="utf-8") as f:
+            content = f.read()
+    finally:
+        os.unlink(profile_path)
+
+    import_lines = []
+    for line in process.stderr.splitlines():
+        if line.startswith("import time:"):
+            import_lines.append(line)
+        else:
+            print(line, file=sys.stderr)
+    if process.returncode != 0 or not content:
+        print(f"Service exited with code {process.returncode}", file=sys.stderr)
+        return process.returncode or 1
+
+    imports = parse_import_time(import_lines)
+    timings = json.loads(content)["timings"]
+    print_report(imports, timings, top)
+    if trace is not None:
+        with open(trace, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": _import_events(imports) + _timing_events(timings)}, f
+            )
+        print(f"Trace: {trace}")
+    return 0
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: harness/concurrent.proto
+
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import message as _message
+from google.protobuf import reflection as _reflection
+from google.protobuf import symbol_database as _symbol_database
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.protobuf import duration_pb2 as google_dot_protobuf_dot_duration__pb2
+
+
+DESCRIPTOR = _descriptor.FileDescriptor(
+  name='harness/concurrent.proto',
+  package='harness.concurrent',
+  syntax='proto3',
+  serialized_options=None,
+  serialized_pb=b'\n\x18harness/concurrent.proto\x12\x12harness.concurrent\x1a\x1egoogle/protobuf/duration.proto\"Q\n\nThreadPool\x12\x13\n\x0bmax_workers\x18\x01 \x01(\r\x12\x12\n\nqueue_size\x18\x02 \x01(\r\x12\x1a\n\x12thread_name_prefix\x18\x03 \x01(\t\"\xf4\x01\n\x0bProcessPool\x12\x13\n\x0bmax_workers\x18\x01 \x01(\r\x12\x41\n\x0cstart_method\x18\x02 \x01(\x0e\x32+.harness.concurrent.ProcessPool.StartMethod\x12\x0f\n\x07preload\x18\x03 \x03(\t\x12*\n\x07timeout\x18\x04 \x01(\x0b\x32\x19.google.protobuf.Duration\x12\x1c\n\x14max_tasks_per_worker\x18\x05 \x01(\r\"2\n\x0bStartMethod\x12\x0e\n\nFORKSERVER\x10\x00\x12\t\n\x05SPAWN\x10\x01\x12\x08\n\x04\x46ORK\x10\x02\x62\x06proto3'
+  ,
+  dependencies=[google_dot_protobuf_dot_duration__pb2.DESCRIPTOR,])
+
+
+
+_PROCESSPOOL_STARTMETHOD = _descriptor.EnumDescriptor(
+  name='StartMethod',
+  full_name='harness.concurrent.ProcessPool.StartMethod',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='FORKSERVER', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='SPAWN', index=1, number=1,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='FORK', index=2, number=2,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=358,
+  serialized_end=408,
+)
+_sym_db.RegisterEnumDescriptor(_PROCESSPOOL_STARTMETHOD)
+
+
+_THREADPOOL = _descriptor.Descriptor(
+  name='ThreadPool',
+  full_name='harness.concurrent.ThreadPool',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='max_workers', full_name='harness.concurrent.ThreadPool.max_workers', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='queue_size', full_name='harness.concurrent.ThreadPool.queue_size', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='thread_name_prefix', full_name='harness.concurrent.ThreadPool.thread_name_prefix', index=2,
+      number=3, type=9, cpp_type=9, label=1,
+      has_default_value=False, default_value=b"".decode('utf-8'),
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=80,
+  serialized_end=161,
+)
+
+
+_PROCESSPOOL = _descriptor.Descriptor(
+  name='ProcessPool',
+  full_name='harness.concurrent.ProcessPool',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='max_workers', full_name='harness.concurrent.ProcessPool.max_workers', index=0,
+      number=1, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='start_method', full_name='harness.concurrent.ProcessPool.start_method', index=1,
+      number=2, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='preload', full_name='harness.concurrent.ProcessPool.preload', index=2,
+      number=3, type=9, cpp_type=9, label=3,
+      has_default_value=False, default_value=[],
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='timeout', full_name='harness.concurrent.ProcessPool.timeout', index=3,
+      number=4, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='max_tasks_per_worker', full_name='harness.concurrent.ProcessPool.max_tasks_per_worker', index=4,
+      number=5, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _PROCESSPOOL_STARTMETHOD,
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=164,
+  serialized_end=408,
+)
+
+_PROCESSPOOL.fields_by_name['start_method'].enum_type = _PROCESSPOOL_STARTMETHOD
+_PROCESSPOOL.fields_by_name['timeout'].message_type = google_dot_protobuf_dot_duration__pb2._DURATION
+_PROCESSPOOL_STARTMETHOD.containing_type = _PROCESSPOOL
+DESCRIPTOR.message_types_by_name['ThreadPool'] = _THREADPOOL
+DESCRIPTOR.message_types_by_name['ProcessPool'] = _PROCESSPOOL
+_sym_db.RegisterFileDescriptor(DESCRIPTOR)
+
+ThreadPool = _reflection.GeneratedProtocolMessageType('ThreadPool', (_message.Message,), {
+  'DESCRIPTOR' : _THREADPOOL,
+  '__module__' : 'harness.concurrent_pb2'
+  # @@protoc_insertion_point(class_scope:harness.concurrent.ThreadPool)
+  })
+_sym_db.RegisterMessage(ThreadPool)
+
+ProcessPool = _reflection.GeneratedProtocolMessageType('ProcessPool', (_message.Message,), {
+  'DESCRIPTOR' : _PROCESSPOOL,
+  '__module__' : 'harness.concurrent_pb2'
+  # @@protoc_insertion_point(class_scope:harness.concurrent.ProcessPool)
+  })
+_sym_db.RegisterMessage(ProcessPool)
+
+
+# @@protoc_insertion_point(module_scope)
@@ -11,6 +11,7 @@ from google.protobuf import symbol_database as _symbol_database
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import duration_pb2 as google_dot_protobuf_dot_duration__pb2
 from harness import wire_pb2 as harness_dot_wire__pb2
 from harness import net_pb2 as harness_dot_net__pb2
 
@@ -20,9 +21,9 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='harness.http',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=b'\n\x12harness/http.proto\x12\x0charness.http\x1a\x12harness/wire.proto\x1a\x11harness/net.proto\"9\n\nConnection\x12+\n\x07\x61\x64\x64ress\x18\x01 \x01(\x0b\x32\x13.harness.net.SocketB\x05\x92}\x02\x08\x01\"2\n\x06Server\x12(\n\x04\x62ind\x18\x01 \x01(\x0b\x32\x13.harness.net.SocketB\x05\x92}\x02\x08\x01\x62\x06proto3'
+  serialized_pb=b'\n\x12harness/http.proto\x12\x0charness.http\x1a\x1egoogle/protobuf/duration.proto\x1a\x12harness/wire.proto\x1a\x11harness/net.proto\"9\n\nConnection\x12+\n\x07\x61\x64\x64ress\x18\x01 \x01(\x0b\x32\x13.harness.net.SocketB\x05\x92}\x02\x08\x01\"d\n\x06Server\x12(\n\x04\x62ind\x18\x01 \x01(\x0b\x32\x13.harness.net.SocketB\x05\x92}\x02\x08\x01\x12\x30\n\rdrain_timeout\x18\x02 \x01(\x0b\x32\x19.google.protobuf.Durationb\x06proto3'
   ,
-  dependencies=[harness_dot_wire__pb2.DESCRIPTOR,harness_dot_net__pb2.DESCRIPTOR,])
+  dependencies=[google_dot_protobuf_dot_duration__pb2.DESCRIPTOR,harness_dot_wire__pb2.DESCRIPTOR,harness_dot_net__pb2.DESCRIPTOR,])
 
 
 
@@ -53,8 +54,8 @@ _CONNECTION = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=75,
-  serialized_end=132,
+  serialized_start=107,
+  serialized_end=164,
 )
 
 
@@ -72,6 +73,13 @@ _SERVER = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=b'\222}\002\010\001', file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='drain_timeout', full_name='harness.http.Server.drain_timeout', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
@@ -84,12 +92,13 @@ _SERVER = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=134,
-  serialized_end=184,
+  serialized_start=166,
+  serialized_end=266,
 )
 
 _CONNECTION.fields_by_name['address'].message_type = harness_dot_net__pb2._SOCKET
 _SERVER.fields_by_name['bind'].message_type = harness_dot_net__pb2._SOCKET
+_SERVER.fields_by_name['drain_timeout'].message_type = google_dot_protobuf_dot_duration__pb2._DURATION
 DESCRIPTOR.message_types_by_name['Connection'] = _CONNECTION
 DESCRIPTOR.message_types_by_name['Server'] = _SERVER
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
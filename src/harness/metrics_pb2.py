@@ -11,6 +11,7 @@ from google.protobuf import symbol_database as _symbol_database
 _sym_db = _symbol_database.Default()
 
 
+from google.protobuf import duration_pb2 as google_dot_protobuf_dot_duration__pb2
 from harness import net_pb2 as harness_dot_net__pb2
 from harness import wire_pb2 as harness_dot_wire__pb2
 
@@ -20,9 +21,9 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='harness.metrics',
   syntax='proto3',
   serialized_options=None,
-  serialized_pb=b'\n\x15harness/metrics.proto\x12\x0fharness.metrics\x1a\x11harness/net.proto\x1a\x12harness/wire.proto\"F\n\nPrometheus\x12\x0e\n\x06prefix\x18\x01 \x01(\t\x12(\n\x04\x62ind\x18\x02 \x01(\x0b\x32\x13.harness.net.SocketB\x05\x92}\x02\x08\x01\x62\x06proto3'
+  serialized_pb=b'\n\x15harness/metrics.proto\x12\x0fharness.metrics\x1a\x1egoogle/protobuf/duration.proto\x1a\x11harness/net.proto\x1a\x12harness/wire.proto\"F\n\nPrometheus\x12\x0e\n\x06prefix\x18\x01 \x01(\t\x12(\n\x04\x62ind\x18\x02 \x01(\x0b\x32\x13.harness.net.SocketB\x05\x92}\x02\x08\x01\"v\n\x0bLoopMonitor\x12+\n\x08interval\x18\x01 \x01(\x0b\x32\x19.google.protobuf.Duration\x12:\n\x17slow_callback_threshold\x18\x02 \x01(\x0b\x32\x19.google.protobuf.Durationb\x06proto3'
   ,
-  dependencies=[harness_dot_net__pb2.DESCRIPTOR,harness_dot_wire__pb2.DESCRIPTOR,])
+  dependencies=[google_dot_protobuf_dot_duration__pb2.DESCRIPTOR,harness_dot_net__pb2.DESCRIPTOR,harness_dot_wire__pb2.DESCRIPTOR,])
 
 
 
@@ -60,12 +61,53 @@ _PROMETHEUS = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=81,
-  serialized_end=151,
+  serialized_start=113,
+  serialized_end=183,
+)
+
+
+_LOOPMONITOR = _descriptor.Descriptor(
+  name='LoopMonitor',
+  full_name='harness.metrics.LoopMonitor',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='interval', full_name='harness.metrics.LoopMonitor.interval', index=0,
+      number=1, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='slow_callback_threshold', full_name='harness.metrics.LoopMonitor.slow_callback_threshold', index=1,
+      number=2, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto3',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=185,
+  serialized_end=303,
 )
 
 _PROMETHEUS.fields_by_name['bind'].message_type = harness_dot_net__pb2._SOCKET
+_LOOPMONITOR.fields_by_name['interval'].message_type = google_dot_protobuf_dot_duration__pb2._DURATION
+_LOOPMONITOR.fields_by_name['slow_callback_threshold'].message_type = google_dot_protobuf_dot_duration__pb2._DURATION
 DESCRIPTOR.message_types_by_name['Prometheus'] = _PROMETHEUS
+DESCRIPTOR.message_types_by_name['LoopMonitor'] = _LOOPMONITOR
 _sym_db.RegisterFileDescriptor(DESCRIPTOR)
 
 Prometheus = _reflection.GeneratedProtocolMessageType('Prometheus', (_message.Message,), {
@@ -75,6 +117,13 @@ Prometheus = _reflection.GeneratedProtocolMessageType('Prometheus', (_message.Me
   })
 _sym_db.RegisterMessage(Prometheus)
 
+LoopMonitor = _reflection.GeneratedProtocolMessageType('LoopMonitor', (_message.Message,), {
+  'DESCRIPTOR' : _LOOPMONITOR,
+  '__module__' : 'harness.metrics_pb2'
+  # @@protoc_insertion_point(class_scope:harness.metrics.LoopMonitor)
+  })
+_sym_db.RegisterMessage(LoopMonitor)
+
 
 _PROMETHEUS.fields_by_name['bind']._options = None
 # @@protoc_insertion_point(module_scope)
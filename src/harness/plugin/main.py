@@ -2,6 +2,8 @@ import os
 import sys
 from typing import Callable, Generator, Tuple
 
+from google.protobuf.descriptor import FileDescriptor
+from google.protobuf.descriptor_pool import DescriptorPool
 from google.protobuf.descriptor_pb2 import FileDescriptorProto
 from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest
 from google.protobuf.compiler.plugin_pb2 import CodeGeneratorResponse
@@ -21,8 +23,11 @@ class ConfigurationError(ValueError):
 
 
 def process_file(
-    renderer: Callable[[str, ConfigSpec], Generator[Tuple[str, str], None, None]],
+    renderer: Callable[
+        [FileDescriptor, ConfigSpec], Generator[Tuple[str, str], None, None]
+    ],
     proto_file: FileDescriptorProto,
+    pool: DescriptorPool,
     response: CodeGeneratorResponse,
 ) -> None:
     for config_message in proto_file.message_type:
@@ -32,7 +37,9 @@ def process_file(
         raise ConfigurationError("Missing configuration message")
 
     config_spec = translate_descriptor_proto(config_message)
-    for name, content in renderer(proto_file.name, config_spec):
+    file_name = proto_file.name
+    file_descriptor = pool.FindFileByName(file_name)  # type: ignore[no-untyped-call]
+    for name, content in renderer(file_descriptor, config_spec):
         f = response.file.add()
         f.name = name
         f.content = content
@@ -53,10 +60,14 @@ def process(request: CodeGeneratorRequest) -> CodeGeneratorResponse:
 
     files_to_generate = set(request.file_to_generate)
 
+    pool = DescriptorPool()
+    for pf in request.proto_file:
+        pool.Add(pf)  # type: ignore[no-untyped-call]
+
     response = CodeGeneratorResponse()
     for pf in request.proto_file:
         if pf.name in files_to_generate:
-            process_file(renderer, pf, response)
+            process_file(renderer, pf, pool, response)
     return response
 
 
@@ -1,7 +1,11 @@
-from typing import Tuple, Generator
+from typing import Dict, Iterable, Iterator, List, Tuple, Generator
+
+from google.protobuf.descriptor import Descriptor, FileDescriptor
 
 from ..config import ConfigSpec
 from ..runtime._utils import Buffer
+from ..runtime._validate import file_gen, validator_name, validators_module
+from ..runtime._validate import MAPPINGS, VALIDATOR, COLLECTOR, BATCH_VALIDATOR
 
 
 def _render_wires(proto_file: str, spec: ConfigSpec) -> Tuple[str, str]:
@@ -76,9 +80,11 @@ def _render_entrypoint(proto_file: str) -> Tuple[str, str]:
     pb2_module = proto_file.replace("/", ".").replace(".proto", "_pb2")
     wires_module = proto_file.replace("/", ".").replace(".proto", "_wires")
 
-    buf.add(f"import {main_module}")
+    # wires are imported before the main module, so telemetry providers are
+    # set up before module-level tracers and meters are created
     buf.add(f"import {pb2_module}")
     buf.add(f"import {wires_module}")
+    buf.add(f"import {main_module}")
     buf.add("")
     buf.add("runner = Runner(")
     buf.add(f"    {pb2_module}.Configuration,")
@@ -92,6 +98,80 @@ def _render_entrypoint(proto_file: str) -> Tuple[str, str]:
     return "entrypoint.py", buf.content()
 
 
-def render(proto_file: str, spec: ConfigSpec) -> Generator[Tuple[str, str], None, None]:
-    yield _render_wires(proto_file, spec)
-    yield _render_entrypoint(proto_file)
+def _walk_messages(descriptors: Iterable[Descriptor]) -> Iterator[Descriptor]:
+    for descriptor in descriptors:
+        if descriptor.GetOptions().map_entry:
+            continue
+        yield descriptor
+        yield from _walk_messages(descriptor.nested_types)
+
+
+_FALLBACKS = {
+    VALIDATOR: "validate",
+    COLLECTOR: "collect",
+    BATCH_VALIDATOR: "validate_batch",
+}
+
+
+def _render_validators(file_descriptor: FileDescriptor) -> Tuple[str, str]:
+    buf = Buffer()
+    buf.add("# Generated by the Protocol Buffers compiler. DO NOT EDIT!")
+    buf.add(f"# source: {file_descriptor.name}")
+    buf.add(f"# plugin: {__name__}")
+    buf.add("# mypy: ignore-errors")
+    buf.add("from harness.runtime._validate import CTX")
+    buf.add("")
+    buf.add("globals().update(CTX)")
+
+    messages = _walk_messages(file_descriptor.message_types_by_name.values())
+    functions: Dict[str, List[Tuple[str, str]]] = {kind: [] for kind in MAPPINGS}
+    external: Dict[str, Tuple[str, str]] = {}
+    for descriptor in messages:
+        for kind in MAPPINGS:
+            func_name = validator_name(descriptor, kind)
+            bindings: Dict[str, Tuple[str, Descriptor]] = {}
+            source = file_gen(descriptor, func_name, kind=kind, bindings=bindings)
+            if source is None:
+                continue
+            buf.add("")
+            buf.add("")
+            for line in source.splitlines():
+                buf.add("{}", line)
+            functions[kind].append((descriptor.full_name, func_name))
+            for name, (nested_kind, nested) in bindings.items():
+                if nested.file.name != file_descriptor.name:
+                    external[name] = (nested_kind, nested.full_name)
+
+    # validators of the messages from other files are bound by the runtime,
+    # until then they are dispatched by the message type
+    if external:
+        buf.add("")
+        buf.add("")
+    for name, (kind, _) in external.items():
+        buf.add(f"{name} = {_FALLBACKS[kind]}")
+
+    for kind, mapping in MAPPINGS.items():
+        buf.add("")
+        buf.add("")
+        buf.add(f"{mapping} = {{{{")
+        with buf.indent():
+            for full_name, func_name in functions[kind]:
+                buf.add(f"{full_name!r}: {func_name},")
+        buf.add("}}")
+    buf.add("")
+    buf.add("")
+    buf.add("EXTERNAL = {{")
+    with buf.indent():
+        for name, value in external.items():
+            buf.add(f"{name!r}: {value!r},")
+    buf.add("}}")
+    file_name = validators_module(file_descriptor.name).replace(".", "/") + ".py"
+    return file_name, buf.content()
+
+
+def render(
+    proto_file: FileDescriptor, spec: ConfigSpec
+) -> Generator[Tuple[str, str], None, None]:
+    yield _render_wires(proto_file.name, spec)
+    yield _render_entrypoint(proto_file.name)
+    yield _render_validators(proto_file)
@@ -1,8 +1,15 @@
-from ._runner import Runner
-from ._validate import validate, ValidationError
+from ._runner import Runner, ServiceHandle
+from ._warmup import add_warmup
+from ._validate import validate, validate_all, validate_many, ValidationError
+from ._validate import Violation
 
 __all__ = (
     "Runner",
+    "ServiceHandle",
+    "add_warmup",
     "validate",
+    "validate_all",
+    "validate_many",
     "ValidationError",
+    "Violation",
 )
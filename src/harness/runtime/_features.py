@@ -1,13 +1,74 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+from functools import lru_cache
+
+if TYPE_CHECKING:
+    from opentelemetry.metrics import Meter
+
+
+_log = logging.getLogger(__name__)
+
+
+_metrics_enabled = False
+_tracing_enabled = False
+
+
 def enable_metrics() -> None:
+    """Sets up metrics provider, called by wires which produce or export
+    metrics. Providers are not set up at import time to keep startup cheap
+    for processes which don't need them
+    """
+    global _metrics_enabled
+    if _metrics_enabled:
+        return
     from opentelemetry.metrics import set_meter_provider
     from opentelemetry.sdk.metrics import MeterProvider
 
     set_meter_provider(MeterProvider())
+    _metrics_enabled = True
 
 
 def enable_tracing() -> None:
+    """Sets up tracer provider, called by wires which produce or export
+    spans
+    """
+    global _tracing_enabled
+    if _tracing_enabled:
+        return
     from opentelemetry.trace import set_tracer_provider
     from opentelemetry.sdk.trace import TracerProvider
     from opentelemetry.trace.sampling import DEFAULT_OFF
 
     set_tracer_provider(TracerProvider(sampler=DEFAULT_OFF))
+    _tracing_enabled = True
+
+
+@lru_cache()
+def get_meter() -> "Meter":
+    """Returns meter which is shared by all harness instruments and
+    exporters. OpenTelemetry returns new meter on every ``get_meter`` call and
+    controllers collect metrics only from their own meter
+    """
+    from opentelemetry import metrics
+
+    enable_metrics()
+    return metrics.get_meter("harness")
+
+
+def metrics_enabled() -> bool:
+    return _metrics_enabled
+
+
+def tracing_enabled() -> bool:
+    return _tracing_enabled
+
+
+def install_loop_policy(name: str) -> None:
+    if name == "uvloop":
+        try:
+            import uvloop
+        except ImportError:
+            _log.warning("uvloop is not installed, using default event loop")
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
@@ -0,0 +1,96 @@
+import gc
+import time
+import logging
+import argparse
+from typing import Deque, Dict, List, Optional, Tuple, TYPE_CHECKING
+from collections import deque
+
+from ._features import get_meter
+
+if TYPE_CHECKING:
+    from opentelemetry.metrics import Observer
+
+
+_log = logging.getLogger(__name__)
+
+
+def gc_threshold(value: str) -> Tuple[int, ...]:
+    """Parses ``--gc-threshold`` option value, e.g. ``50000,20,20``"""
+    try:
+        threshold = tuple(int(i) for i in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid threshold: {value!r}")
+    if not 1 <= len(threshold) <= 3 or any(i < 0 for i in threshold):
+        raise argparse.ArgumentTypeError(f"invalid threshold: {value!r}")
+    return threshold
+
+
+def tune_gc(freeze: bool, threshold: Optional[Tuple[int, ...]]) -> None:
+    if threshold is not None:
+        gc.set_threshold(*threshold)
+        _log.info("GC threshold: %s", gc.get_threshold())
+    if freeze:
+        # garbage is collected first in order to not keep it forever
+        gc.collect()
+        # not in the typeshed of the pinned mypy version
+        gc.freeze()  # type: ignore[attr-defined]
+        frozen = gc.get_freeze_count()  # type: ignore[attr-defined]
+        _log.info("GC frozen objects: %d", frozen)
+
+
+# pauses are collected without locks and exported by observers, because
+# metrics instruments can't be used while collection is in progress
+_pauses: Deque[Tuple[int, float]] = deque(maxlen=10000)
+_gc_start = 0.0
+_observers: List["Observer"] = []
+
+
+def _gc_callback(phase: str, info: Dict[str, int]) -> None:
+    global _gc_start
+    if phase == "start":
+        _gc_start = time.perf_counter()
+    else:
+        _pauses.append((info["generation"], time.perf_counter() - _gc_start))
+
+
+def _observe_pauses(observer: "Observer") -> None:
+    while _pauses:
+        generation, pause = _pauses.popleft()
+        observer.observe(pause, {"generation": str(generation)})
+
+
+def _observe_collections(observer: "Observer") -> None:
+    for generation, stats in enumerate(gc.get_stats()):
+        observer.observe(stats["collections"], {"generation": str(generation)})
+
+
+def monitor_gc() -> None:
+    """Exports garbage collections durations and counts as metrics"""
+    if _observers:
+        return
+    from opentelemetry.sdk.metrics import SumObserver, ValueObserver
+
+    meter = get_meter()
+    _observers.extend(
+        [
+            meter.register_observer(
+                _observe_pauses,
+                "harness_gc_pause",
+                "Duration of the garbage collections",
+                "s",
+                float,
+                ValueObserver,
+                ("generation",),
+            ),
+            meter.register_observer(
+                _observe_collections,
+                "harness_gc_collections",
+                "Number of the garbage collections",
+                "1",
+                int,
+                SumObserver,
+                ("generation",),
+            ),
+        ]
+    )
+    gc.callbacks.append(_gc_callback)
@@ -1,30 +1,188 @@
+import time
+import signal
 import asyncio
+import logging
 import argparse
 from typing import Generic, TypeVar, Callable, List, Type, Coroutine, Any, Optional
+from typing import Tuple, Dict, Awaitable, Union
+from types import TracebackType
 from contextlib import AsyncExitStack
 from dataclasses import fields
 
 from google.protobuf.message import Message
 from google.protobuf.json_format import ParseDict
 
-from ..wires.base import Wire
+from ..wire_pb2 import Service
+from ..wires.base import Wire, SocketMixin, inherit_socket, readiness
 
 from ._utils import load_config, graceful_exit
-from ._validate import validate
-from ._features import enable_metrics, enable_tracing
+from ._utils import snapshot_key, read_snapshot, write_snapshot
+from ._workers import bind_socket, run_workers
+from ._validate import validate, set_format_cache_size, monitor_format_cache
+from ._validate import set_code_cache_dir
+from ._features import install_loop_policy, metrics_enabled
+from ._gc import gc_threshold, tune_gc, monitor_gc
+from ._timings import Timings
+from ._warmup import warmup, _hooks as _warmup_hooks
 
 
-# Temporary decision to enable metrics and tracing by default. But maybe it
-# would be better to make this [auto]configurable.
-enable_metrics()
-enable_tracing()
+_log = logging.getLogger(__name__)
 
 
+DEFAULT_WARMUP_TIMEOUT = 10.0
+
 _CT = TypeVar("_CT", bound=Message)
 _WI = TypeVar("_WI")
 _WO = TypeVar("_WO")
 
 
+def _wire_type(wire: Wire) -> str:
+    return f"{type(wire).__module__}.{type(wire).__qualname__}"
+
+
+def _configure(timings: Timings, name: str, wire: Wire, value: Message) -> None:
+    with timings.record(name, "configure", _wire_type(wire)):
+        wire.configure(value)
+
+
+async def _enter(timings: Timings, name: str, wire: Wire) -> None:
+    start = time.monotonic()
+    with timings.record(name, "enter", _wire_type(wire)):
+        await wire.__aenter__()
+    readiness.add(name, wire.ready)
+    _log.info("Wire %s started in %.3fs", name, time.monotonic() - start)
+
+
+def _push_exit(stack: AsyncExitStack, timings: Timings, name: str, wire: Wire) -> None:
+    async def exit_(
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> bool:
+        try:
+            with timings.record(name, "exit", _wire_type(wire)):
+                await wire.__aexit__(exc_type, exc_val, exc_tb)
+        finally:
+            readiness.remove(name)
+        # wires don't suppress exceptions
+        return False
+
+    stack.push_async_exit(exit_)
+
+
+def _report(timings: Timings, message: str, span_name: str) -> None:
+    if timings.records:
+        _log.info("%s in %s", message, timings.summary())
+        timings.export(span_name)
+
+
+async def _start_wires(
+    stack: AsyncExitStack,
+    timings: Timings,
+    wires: List[Tuple[str, Wire]],
+    *,
+    concurrent: bool,
+) -> None:
+    if not concurrent:
+        for name, wire in wires:
+            await _enter(timings, name, wire)
+            _push_exit(stack, timings, name, wire)
+        return
+
+    tasks = [asyncio.ensure_future(_enter(timings, name, wire)) for name, wire in wires]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        # wires which are still starting are cancelled after first failure
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        await asyncio.wait(tasks)
+        error = None
+        for (name, wire), task in zip(wires, tasks):
+            if task.cancelled():
+                continue
+            exc = task.exception()
+            if exc is None:
+                # wire was started and should be closed in reverse order
+                _push_exit(stack, timings, name, wire)
+            elif error is None:
+                error = exc
+            else:
+                _log.error("Failed to start wire %s", name, exc_info=exc)
+    if error is not None:
+        raise error
+
+
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+async def _reconfigure(name: str, wire: Wire, value: Message) -> None:
+    start = time.monotonic()
+    await wire.reconfigure(value)
+    _log.info("Wire %s reconfigured in %.3fs", name, time.monotonic() - start)
+
+
+def _service_option(config_type: Type[Message]) -> Service:
+    for _, option in config_type.DESCRIPTOR.GetOptions().ListFields():
+        if isinstance(option, Service):
+            return option
+    return Service()
+
+
+class ServiceHandle:
+    """Handle of a service started using :py:meth:`Runner.start` method"""
+
+    def __init__(
+        self, task: "asyncio.Task[None]", started: "asyncio.Future[Dict[str, Wire]]",
+    ) -> None:
+        self._task = task
+        self._started = started
+        self._output_wires: Dict[str, Wire] = {}
+        #: Addresses of the listening sockets of the output wires, by name
+        self.addresses: Dict[str, Tuple[str, int]] = {}
+        #: Resolves when all output wires are started
+        self.ready: "asyncio.Future[None]" = asyncio.get_event_loop().create_future()
+        started.add_done_callback(self._on_started)
+        task.add_done_callback(self._on_done)
+
+    def _on_started(self, started: "asyncio.Future[Dict[str, Wire]]") -> None:
+        if started.cancelled() or started.exception() is not None:
+            return
+        self._output_wires = started.result()
+        for name, wire in self._output_wires.items():
+            if isinstance(wire, SocketMixin):
+                address = wire.bound_address()
+                if address is not None:
+                    self.addresses[name] = address
+        self.ready.set_result(None)
+
+    def _on_done(self, task: "asyncio.Task[None]") -> None:
+        if self.ready.done():
+            return
+        if task.cancelled():
+            self.ready.cancel()
+        elif task.exception() is not None:
+            self.ready.set_exception(task.exception())  # type: ignore
+        else:
+            self.ready.set_result(None)
+
+    async def stop(self) -> None:
+        """Gracefully closes output wires and then input wires"""
+        if self._started.done():
+            for wire in self._output_wires.values():
+                wire.close()
+        else:
+            self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            if not self._task.cancelled():
+                raise
+
+
 class Runner(Generic[_CT, _WI, _WO]):
     def __init__(
         self,
@@ -54,12 +212,82 @@ class Runner(Generic[_CT, _WI, _WO]):
             type=argparse.FileType("r", encoding="utf-8"),
             help="Patch config with a file",
         )
+        self._arg_parser.add_argument(
+            "--concurrent-start",
+            action="store_true",
+            help="Start independent wires concurrently",
+        )
+        self._arg_parser.add_argument(
+            "--workers", type=int, default=1, help="Number of worker processes to run",
+        )
+        self._arg_parser.add_argument(
+            "--loop",
+            choices=("asyncio", "uvloop"),
+            default=None,
+            help="Event loop implementation",
+        )
+        self._arg_parser.add_argument(
+            "--warmup-timeout",
+            type=float,
+            default=DEFAULT_WARMUP_TIMEOUT,
+            help="Time budget of the warmup stage in seconds",
+        )
+        self._arg_parser.add_argument(
+            "--snapshot-dir",
+            default=None,
+            help="Directory to store and load validated config snapshots",
+        )
+        self._arg_parser.add_argument(
+            "--validators-cache-dir",
+            default=None,
+            help="Directory to store and load compiled validators",
+        )
+        self._arg_parser.add_argument(
+            "--profile-startup",
+            metavar="PATH",
+            default=None,
+            help="Write startup timings into a file and exit after startup",
+        )
+        self._arg_parser.add_argument(
+            "--gc-freeze",
+            action="store_true",
+            help="Move objects created during startup into a permanent generation",
+        )
+        self._arg_parser.add_argument(
+            "--gc-threshold",
+            type=gc_threshold,
+            default=None,
+            help="Garbage collection thresholds, e.g. 50000,20,20",
+        )
+        self._arg_parser.add_argument(
+            "--gc-monitor",
+            action="store_true",
+            help="Export garbage collection pauses and counts as metrics",
+        )
 
     async def _wrapper(
-        self, main_func: Callable[[_CT, _WI], Coroutine[Any, Any, _WO]], config: _CT
+        self,
+        main_func: Callable[[_CT, _WI], Coroutine[Any, Any, _WO]],
+        config: _CT,
+        *,
+        concurrent_start: bool = False,
+        reload_config: Optional[Callable[[], _CT]] = None,
+        warmup_timeout: Optional[float] = None,
+        signals: bool = True,
+        started: Optional["asyncio.Future[Dict[str, Wire]]"] = None,
+        gc_freeze: bool = False,
+        gc_threshold: Optional[Tuple[int, ...]] = None,
+        gc_monitor: bool = False,
+        timings: Optional[Timings] = None,
+        profile_path: Optional[str] = None,
     ) -> None:
+        if timings is None:
+            timings = Timings()
         async with AsyncExitStack() as stack:
+            # the first callback is called after all wires are closed
+            stack.callback(_report, timings, "Stopped", "shutdown")
             input_wires = {}
+            input_to_start = []
             for field in fields(self._wires_in_type):
                 wire: Optional[Wire]
                 if config.HasField(field.name):
@@ -73,8 +301,8 @@ class Runner(Generic[_CT, _WI, _WO]):
                             wire_type, Wire
                         ), type(wire_type)
                     wire = wire_type()
-                    wire.configure(wire_config)
-                    await stack.enter_async_context(wire)
+                    _configure(timings, field.name, wire, wire_config)
+                    input_to_start.append((field.name, wire))
                 else:
                     if isinstance(field.type, type) and issubclass(field.type, Wire):
                         raise RuntimeError(
@@ -82,9 +310,20 @@ class Runner(Generic[_CT, _WI, _WO]):
                         )
                     wire = None
                 input_wires[field.name] = wire
+            await _start_wires(
+                stack, timings, input_to_start, concurrent=concurrent_start
+            )
+            loop_type = type(asyncio.get_event_loop())
+            _log.info("Using %s.%s", loop_type.__module__, loop_type.__qualname__)
             wires_in = self._wires_in_type(**input_wires)  # type: ignore
 
-            wires_out = await main_func(config, wires_in)
+            warmup_hooks: List[Callable[[], Awaitable[None]]] = []
+            token = _warmup_hooks.set(warmup_hooks)
+            try:
+                with timings.record("main", "call"):
+                    wires_out = await main_func(config, wires_in)
+            finally:
+                _warmup_hooks.reset(token)
 
             if not isinstance(wires_out, self._wires_out_type):
                 raise RuntimeError(
@@ -92,24 +331,176 @@ class Runner(Generic[_CT, _WI, _WO]):
                     f"expected: {self._wires_out_type!r}"
                 )
 
-            waiters = set()
             output_wires = []
+            output_to_start = []
             for field in fields(self._wires_out_type):
                 if not config.HasField(field.name):
                     continue
                 wire = getattr(wires_out, field.name)
                 assert isinstance(wire, Wire), type(wire)
                 wire_config = getattr(config, field.name)
-                wire.configure(wire_config)
-                await stack.enter_async_context(wire)
-                waiters.add(wire.wait_closed())
+                _configure(timings, field.name, wire, wire_config)
+                output_to_start.append((field.name, wire))
                 output_wires.append(wire)
+            warmers: List[Tuple[str, Callable[[], Awaitable[None]]]] = [
+                (name, wire.warmup)
+                for name, wire in input_to_start + output_to_start
+                if type(wire).warmup is not Wire.warmup
+            ]
+            warmers.extend((func.__qualname__, func) for func in warmup_hooks)
+            await warmup(timings, warmers, warmup_timeout)
+
+            await _start_wires(
+                stack, timings, output_to_start, concurrent=concurrent_start
+            )
+            if profile_path is not None:
+                timings.dump(profile_path)
+            _report(timings, "Started", "startup")
+            if metrics_enabled():
+                if gc_monitor:
+                    monitor_gc()
+                if _service_option(self._config_type).python.validation_cache_size:
+                    monitor_format_cache()
+            tune_gc(gc_freeze, gc_threshold)
+            if started is not None:
+                started.set_result(dict(output_to_start))
+
+            if output_wires and profile_path is None:
+                wires = dict(input_to_start + output_to_start)
+                if signals:
+                    with graceful_exit(output_wires):
+                        await self._serve(config, wires, output_wires, reload_config)
+                else:
+                    await self._serve(config, wires, output_wires, None)
+
+    async def _serve(
+        self,
+        config: _CT,
+        wires: Dict[str, Wire],
+        output_wires: List[Wire],
+        reload_config: Optional[Callable[[], _CT]],
+    ) -> None:
+        loop = asyncio.get_event_loop()
+        reload_event = asyncio.Event()
+        if reload_config is not None:
+            loop.add_signal_handler(signal.SIGHUP, reload_event.set)
+            # workers block SIGHUP until the handler is installed
+            sigmask = signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGHUP})
+        waiters = {
+            wire: asyncio.ensure_future(wire.wait_closed()) for wire in output_wires
+        }
+        try:
+            while True:
+                reload_waiter = asyncio.ensure_future(reload_event.wait())
+                pending: List["asyncio.Future[Any]"] = [reload_waiter]
+                pending.extend(waiters.values())
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                if reload_waiter not in done or len(done) > 1:
+                    break
+                reload_event.clear()
+                assert reload_config is not None
+                await self._reload(config, reload_config, wires, waiters)
+        finally:
+            reload_waiter.cancel()
+            for waiter in waiters.values():
+                waiter.cancel()
+            if reload_config is not None:
+                signal.pthread_sigmask(signal.SIG_SETMASK, sigmask)
+                loop.remove_signal_handler(signal.SIGHUP)
 
-            if output_wires:
-                with graceful_exit(output_wires):
-                    await asyncio.wait(
-                        waiters, return_when=asyncio.FIRST_COMPLETED,
+    async def _reload(
+        self,
+        config: _CT,
+        reload_config: Callable[[], _CT],
+        wires: Dict[str, Wire],
+        waiters: Dict[Wire, "asyncio.Future[None]"],
+    ) -> None:
+        _log.info("Reloading configuration")
+        try:
+            new_config = reload_config()
+        except (Exception, SystemExit):
+            _log.exception("Failed to reload configuration")
+            return
+
+        changed = []
+        for field in fields(self._wires_in_type) + fields(self._wires_out_type):
+            has_field = config.HasField(field.name)
+            if has_field != new_config.HasField(field.name):
+                _log.warning(
+                    "Wire %s can't be added or removed without restart", field.name
+                )
+                if has_field:
+                    getattr(new_config, field.name).CopyFrom(
+                        getattr(config, field.name)
                     )
+                else:
+                    new_config.ClearField(field.name)
+            elif has_field and getattr(config, field.name) != getattr(
+                new_config, field.name
+            ):
+                changed.append(field.name)
+        config.CopyFrom(new_config)
+
+        for name in changed:
+            wire = wires[name]
+            waiter = waiters.get(wire)
+            if waiter is not None:
+                # wire is going to be closed during restart, it is not
+                # a reason to exit
+                waiter.cancel()
+                await asyncio.wait([waiter])
+            await _reconfigure(name, wire, getattr(config, name))
+            if waiter is not None:
+                waiters[wire] = asyncio.ensure_future(wire.wait_closed())
+        _log.info("Configuration reloaded, reconfigured wires: %d", len(changed))
+
+    def _bind_sockets(self, config: _CT) -> None:
+        for field in fields(self._wires_out_type):
+            if not config.HasField(field.name):
+                continue
+            if not (
+                isinstance(field.type, type) and issubclass(field.type, SocketMixin)
+            ):
+                continue
+            wire_config = getattr(config, field.name)
+            if "bind" not in wire_config.DESCRIPTOR.fields_by_name:
+                continue
+            host, port = wire_config.bind.host, wire_config.bind.port
+            inherit_socket(host, port, bind_socket(host, port))
+
+    async def start(
+        self,
+        main_func: Callable[[_CT, _WI], Coroutine[Any, Any, _WO]],
+        config: Union[_CT, Dict[str, Any]],
+        *,
+        warmup_timeout: Optional[float] = DEFAULT_WARMUP_TIMEOUT,
+    ) -> ServiceHandle:
+        """Starts service in the current event loop, without reading files
+        and installing signal handlers. Configuration is not validated, so
+        it is possible to use port 0 to bind random ports
+        """
+        python = _service_option(self._config_type).python
+        set_format_cache_size(python.validation_cache_size)
+        config_message: _CT
+        if isinstance(config, dict):
+            config_message = self._config_type()
+            ParseDict(config, config_message)
+        else:
+            config_message = config
+        loop = asyncio.get_event_loop()
+        started: "asyncio.Future[Dict[str, Wire]]" = loop.create_future()
+        task = loop.create_task(
+            self._wrapper(
+                main_func,
+                config_message,
+                warmup_timeout=warmup_timeout,
+                signals=False,
+                started=started,
+            )
+        )
+        return ServiceHandle(task, started)
 
     def run(
         self,
@@ -117,26 +508,94 @@ class Runner(Generic[_CT, _WI, _WO]):
         argv: List[str],
     ) -> int:
         args = self._arg_parser.parse_args(argv[1:])
+        timings = Timings()
+        python = _service_option(self._config_type).python
+        set_format_cache_size(python.validation_cache_size)
+        set_code_cache_dir(args.validators_cache_dir)
 
-        with args.config:
-            config_content = args.config.read()
+        with timings.record("config", "read"):
+            with args.config:
+                config_content = args.config.read()
 
-        if args.merge is not None:
-            with args.merge:
-                merge_content = args.merge.read()
-        else:
-            merge_content = None
+            if args.merge is not None:
+                with args.merge:
+                    merge_content = args.merge.read()
+            else:
+                merge_content = None
 
-        if args.patch is not None:
-            with args.patch:
-                patch_content = args.patch.read()
-        else:
-            patch_content = None
+            if args.patch is not None:
+                with args.patch:
+                    patch_content = args.patch.read()
+            else:
+                patch_content = None
 
-        config_data = load_config(config_content, merge_content, patch_content)
         config = self._config_type()
-        ParseDict(config_data, config)
-        validate(config)
+        snapshot = None
+        if args.snapshot_dir is not None:
+            with timings.record("config", "snapshot"):
+                key = snapshot_key(
+                    config.DESCRIPTOR, config_content, merge_content, patch_content
+                )
+                snapshot = read_snapshot(args.snapshot_dir, key)
+                if snapshot is not None:
+                    config.ParseFromString(snapshot)
+        if snapshot is None:
+            with timings.record("config", "load"):
+                config_data = load_config(config_content, merge_content, patch_content)
+            with timings.record("config", "parse"):
+                ParseDict(config_data, config)
+            with timings.record("config", "validate"):
+                validate(config)
+            if args.snapshot_dir is not None:
+                write_snapshot(args.snapshot_dir, key, config.SerializeToString())
+
+        loop = args.loop
+        if loop is None:
+            loop = Service.Python.Loop.Name(python.loop).lower()
+        install_loop_policy(loop)
 
-        asyncio.run(self._wrapper(main_func, config))
-        return 0
+        def reload_config() -> _CT:
+            merge_path = args.merge.name if args.merge is not None else None
+            patch_path = args.patch.name if args.patch is not None else None
+            config_data = load_config(
+                _read_file(args.config.name),
+                _read_file(merge_path) if merge_path is not None else None,
+                _read_file(patch_path) if patch_path is not None else None,
+            )
+            new_config = self._config_type()
+            ParseDict(config_data, new_config)
+            validate(new_config)
+            return new_config
+
+        def reload_workers_config() -> None:
+            try:
+                new_config = reload_config()
+            except (Exception, SystemExit):
+                _log.exception("Failed to reload configuration")
+            else:
+                config.CopyFrom(new_config)
+
+        def target() -> int:
+            asyncio.run(
+                self._wrapper(
+                    main_func,
+                    config,
+                    concurrent_start=args.concurrent_start,
+                    reload_config=reload_config,
+                    warmup_timeout=args.warmup_timeout,
+                    gc_freeze=args.gc_freeze,
+                    gc_threshold=args.gc_threshold,
+                    gc_monitor=args.gc_monitor,
+                    timings=timings,
+                    profile_path=args.profile_startup,
+                )
+            )
+            return 0
+
+        if args.workers > 1 and args.profile_startup is None:
+            self._bind_sockets(config)
+            # to not break copy-on-write sharing of the memory with workers
+            tune_gc(args.gc_freeze, args.gc_threshold)
+            return run_workers(target, args.workers, reload=reload_workers_config)
+        else:
+            return target()
@@ -0,0 +1,97 @@
+import json
+import time
+from typing import List, Iterator, NamedTuple, TYPE_CHECKING
+from functools import lru_cache
+from contextlib import contextmanager
+
+from ._features import get_meter, metrics_enabled, tracing_enabled
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics import ValueRecorder
+
+
+class Timing(NamedTuple):
+    name: str
+    stage: str
+    type: str
+    start: int
+    end: int
+
+    @property
+    def duration(self) -> float:
+        return (self.end - self.start) / 1e9
+
+
+@lru_cache()
+def _duration_metric() -> "ValueRecorder":
+    from opentelemetry.sdk.metrics import ValueRecorder
+
+    return get_meter().create_metric(
+        "harness_wire_stage_duration",
+        "Time spent in a wire lifecycle stage",
+        "s",
+        float,
+        ValueRecorder,
+        ("wire", "wire_type", "stage"),
+    )
+
+
+class Timings:
+    """Records monotonic timings of the wires lifecycle stages"""
+
+    def __init__(self) -> None:
+        self.records: List[Timing] = []
+        # to convert monotonic time into the wall-clock time for spans
+        self._offset = time.time_ns() - time.monotonic_ns()
+
+    @contextmanager
+    def record(self, name: str, stage: str, type_: str = "") -> Iterator[None]:
+        start = time.monotonic_ns()
+        try:
+            yield
+        finally:
+            self.records.append(Timing(name, stage, type_, start, time.monotonic_ns()))
+
+    def summary(self) -> str:
+        if not self.records:
+            return "0.000s"
+        total = (
+            max(r.end for r in self.records) - min(r.start for r in self.records)
+        ) / 1e9
+        stages = " ".join(f"{r.name}.{r.stage}={r.duration:.3f}s" for r in self.records)
+        return f"{total:.3f}s: {stages}"
+
+    def dump(self, path: str) -> None:
+        """Writes recorded timings into a file in the JSON format"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"timings": [r._asdict() for r in self.records]}, f)
+
+    def export(self, span_name: str) -> None:
+        """Exports recorded timings as spans and metrics, if they are enabled,
+        and clears them
+        """
+        records, self.records = self.records, []
+        if not records:
+            return
+        if tracing_enabled():
+            from opentelemetry.trace import get_tracer
+
+            tracer = get_tracer(__name__)
+            parent = tracer.start_span(
+                span_name, start_time=min(r.start for r in records) + self._offset,
+            )
+            for r in records:
+                span = tracer.start_span(
+                    f"{r.name}.{r.stage}",
+                    parent=parent,
+                    attributes={"wire.type": r.type},
+                    start_time=r.start + self._offset,
+                )
+                span.end(end_time=r.end + self._offset)
+            parent.end(end_time=max(r.end for r in records) + self._offset)
+        if metrics_enabled():
+            metric = _duration_metric()
+            for r in records:
+                metric.record(
+                    r.duration, {"wire": r.name, "wire_type": r.type, "stage": r.stage}
+                )
@@ -1,12 +1,19 @@
+import os
+import json
 import signal
 import asyncio
-from typing import Collection, List, Optional, Iterator, Any, Dict, cast
+import hashlib
+import tempfile
+from typing import Collection, List, Optional, Iterator, Iterable, Any, Dict, cast
 from contextlib import contextmanager
 
 import yaml
 from jsonpatch import JsonPatch
 from json_merge_patch import merge
+from google.protobuf.descriptor import Descriptor, FileDescriptor
+from google.protobuf.descriptor_pb2 import FileDescriptorProto, DescriptorProto
 
+from .. import __version__
 from ..wires.base import Wire
 
 
@@ -35,6 +42,90 @@ def load_config(
     return cast(_JSONDict, config_data)
 
 
+_file_hashes: Dict[FileDescriptor, str] = {}
+
+
+def _clear_json_names(message_types: Iterable[DescriptorProto]) -> None:
+    for message_type in message_types:
+        for field in list(message_type.field) + list(message_type.extension):
+            field.ClearField("json_name")
+        _clear_json_names(message_type.nested_type)
+
+
+def _canonical_file(file_descriptor: FileDescriptor) -> bytes:
+    # generated modules and descriptor sets produced by protoc differ in
+    # source info and json names, they are omitted to get the same bytes
+    file_proto = FileDescriptorProto()
+    file_descriptor.CopyToProto(file_proto)  # type: ignore[no-untyped-call]
+    file_proto.ClearField("source_code_info")
+    _clear_json_names(file_proto.message_type)
+    for extension in file_proto.extension:
+        extension.ClearField("json_name")
+    return file_proto.SerializeToString(deterministic=True)
+
+
+def file_hash(file_descriptor: FileDescriptor) -> str:
+    """Returns a hash of the file descriptor and its dependencies, which
+    changes when anything is changed in these files, including options.
+    Well-known types are skipped, as protobuf and grpcio-tools packages
+    may ship different revisions of them
+    """
+    # files with the same name may be loaded into different pools
+    digest = _file_hashes.get(file_descriptor)
+    if digest is None:
+        data = [hashlib.sha256(_canonical_file(file_descriptor)).hexdigest()]
+        data.extend(
+            file_hash(dep)
+            for dep in file_descriptor.dependencies
+            if dep.package != "google.protobuf"
+        )
+        digest = hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+        _file_hashes[file_descriptor] = digest
+    return digest
+
+
+def snapshot_key(
+    descriptor: Descriptor,
+    config_content: str,
+    merge_content: Optional[str] = None,
+    patch_content: Optional[str] = None,
+) -> str:
+    """Returns a key of the config snapshot, which changes when config
+    files, config schema, validation rules or harness version are changed
+    """
+    data = [
+        __version__,
+        file_hash(descriptor.file),
+        config_content,
+        merge_content,
+        patch_content,
+    ]
+    return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+
+def snapshot_path(snapshot_dir: str, key: str) -> str:
+    return os.path.join(snapshot_dir, f"{key}.bin")
+
+
+def read_snapshot(snapshot_dir: str, key: str) -> Optional[bytes]:
+    try:
+        with open(snapshot_path(snapshot_dir, key), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(snapshot_dir: str, key: str, data: bytes) -> str:
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = snapshot_path(snapshot_dir, key)
+    # write and rename, so concurrently starting processes never read
+    # partially written snapshot
+    with tempfile.NamedTemporaryFile(dir=snapshot_dir, delete=False) as f:
+        f.write(data)
+    os.replace(f.name, path)
+    return path
+
+
 def _first_stage(sig_num: signal.Signals, wires: Collection[Wire]) -> None:
     fail = False
     for wire in wires:
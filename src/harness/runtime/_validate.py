@@ -1,9 +1,15 @@
 import re
+import json
+import time
+import marshal
+import hashlib
+import importlib
 import ipaddress
+import importlib.util
 from abc import ABC
 from typing import TYPE_CHECKING, Union, List, Any, Dict, Collection, AnyStr, Optional
-from typing import Callable, ClassVar
-from decimal import Decimal
+from typing import Callable, ClassVar, Type, Set, NamedTuple, Tuple, Sequence
+from functools import lru_cache
 from collections import Counter
 from urllib.parse import urlparse
 from email.headerregistry import AddressHeader
@@ -15,16 +21,28 @@ from google.protobuf.timestamp_pb2 import Timestamp
 
 from validate import validate_pb2
 
-from ._utils import Buffer
+from .. import __version__
+from ._utils import Buffer, file_hash, read_snapshot, write_snapshot
+from ._features import get_meter
 
 if TYPE_CHECKING:
-    from typing_extensions import Literal, TypedDict
+    from functools import _CacheInfo
+    from typing_extensions import Literal
+    from opentelemetry.metrics import Observer
 
 
 class ValidationError(ValueError):
     pass
 
 
+class Violation(NamedTuple):
+    #: Path to the field, e.g. ``server.bind.port``
+    path: str
+    #: Violated rule, e.g. ``uint32.gt``
+    rule: str
+    message: str
+
+
 class Format:
     # Based on Django 3.0.2: django.core.validators.URLValidator
     _scheme = r"^(?:[a-z0-9\.\-\+]*)://"
@@ -57,107 +75,233 @@ class Format:
         re.IGNORECASE,
     )
 
-    def check_email(self, field_name: str, value: str) -> None:
+    _checks = (
+        "email",
+        "hostname",
+        "ip",
+        "ipv4",
+        "ipv6",
+        "uri",
+        "uri_ref",
+        "address",
+        "uuid",
+    )
+
+    def __init__(self, cache_size: int = 0) -> None:
+        self.set_cache_size(cache_size)
+
+    def set_cache_size(self, cache_size: int) -> None:
+        """Enables bounded LRU caches of the check results, ``0`` disables
+        caches
+        """
+        self._errors: Dict[str, Callable[[Any], Optional[str]]] = {}
+        for name in self._checks:
+            func = getattr(self, f"_{name}_error")
+            if cache_size:
+                func = lru_cache(cache_size)(func)
+            self._errors[name] = func
+
+    def cache_info(self) -> Dict[str, "_CacheInfo"]:
+        """Returns hits and misses of the caches by the check names"""
+        return {
+            name: func.cache_info()  # type: ignore
+            for name, func in self._errors.items()
+            if hasattr(func, "cache_info")
+        }
+
+    def _check(self, name: str, field_name: str, value: Any) -> None:
+        error = self._errors[name](value)
+        if error is not None:
+            raise ValidationError(f"{field_name} {error}")
+
+    def _email_error(self, value: str) -> Optional[str]:
+        # cheap check to reject obviously invalid values before parsing
+        local, _, domain = value.rpartition("@")
+        if not local or not domain:
+            return "contains invalid email address"
         result: Dict[str, Any] = {}
-        AddressHeader.parse(value, result)
+        try:
+            AddressHeader.parse(value, result)
+        except (IndexError, AttributeError):
+            # parser fails on some malformed values instead of reporting defects
+            return "contains invalid email address"
         defects = result["defects"]
         if defects:
             errors = "\n".join(f" - {str(defect)}" for defect in defects)
-            raise ValidationError(
-                f"{field_name} contains invalid email address:\n{errors}"
-            )
+            return f"contains invalid email address:\n{errors}"
 
         groups = result["groups"]
+        if not groups:
+            return "contains invalid email address"
         if len(groups) > 1 or len(groups[0].addresses) > 1:
-            raise ValidationError(f"{field_name} contains more than one email address")
-
-    def check_hostname(self, field_name: str, value: str) -> None:
+            return "contains more than one email address"
+        # named groups, e.g. "team: foo@example.com;", are not email addresses
+        if groups[0].display_name is not None or not groups[0].addresses:
+            return "contains invalid email address"
+        address = groups[0].addresses[0]
+        if not address.username or not address.domain:
+            return "contains invalid email address"
+        return None
+
+    def _hostname_error(self, value: str) -> Optional[str]:
         if self._host_re.match(value) is None:
-            raise ValidationError(f"{field_name} contains invalid hostname")
+            return "contains invalid hostname"
+        return None
 
-    def check_ip(self, field_name: str, value: Union[str, bytes]) -> None:
+    def _ip_error(self, value: Union[str, bytes]) -> Optional[str]:
         try:
             ipaddress.ip_address(value)
         except ValueError:
-            raise ValidationError(f"{field_name} contains invalid IP address") from None
+            return "contains invalid IP address"
+        return None
 
-    def check_ipv4(self, field_name: str, value: Union[str, bytes]) -> None:
+    def _ipv4_error(self, value: Union[str, bytes]) -> Optional[str]:
         try:
             ipaddress.IPv4Address(value)
         except ValueError:
-            raise ValidationError(
-                f"{field_name} contains invalid IPv4 address"
-            ) from None
+            return "contains invalid IPv4 address"
+        return None
 
-    def check_ipv6(self, field_name: str, value: Union[str, bytes]) -> None:
+    def _ipv6_error(self, value: Union[str, bytes]) -> Optional[str]:
         try:
             ipaddress.IPv6Address(value)
         except ValueError:
-            raise ValidationError(
-                f"{field_name} contains invalid IPv6 address"
-            ) from None
+            return "contains invalid IPv6 address"
+        return None
 
-    def check_uri(self, field_name: str, value: str) -> None:
+    def _uri_error(self, value: str) -> Optional[str]:
         if not self._uri_re.match(value):
-            raise ValidationError(f"{field_name} contains invalid URI")
+            return "contains invalid URI"
         url = urlparse(value)
         assert url.hostname, url
-        self.check_address(field_name, url.hostname)
+        return self._address_error(url.hostname)
 
-    def check_uri_ref(self, field_name: str, value: str) -> None:
+    def _uri_ref_error(self, value: str) -> Optional[str]:
         if not self._uri_ref_re.match(value):
-            raise ValidationError(f"{field_name} contains invalid URI-reference")
+            return "contains invalid URI-reference"
         url = urlparse(value)
         if url.hostname:
-            self.check_address(field_name, url.hostname)
+            return self._address_error(url.hostname)
+        return None
 
-    def check_address(self, field_name: str, value: str) -> None:
+    def _address_error(self, value: str) -> Optional[str]:
         if self._host_re.match(value) is None:
             try:
                 ipaddress.ip_address(value)
-                return
             except ValueError:
-                pass
-        else:
-            return
-        raise ValidationError(f"{field_name} contains invalid address")
+                return "contains invalid address"
+        return None
 
-    def check_uuid(self, field_name: str, value: str) -> None:
+    def _uuid_error(self, value: str) -> Optional[str]:
         if self._uuid_re.match(value) is None:
-            raise ValidationError(f"{field_name} contains invalid UUID") from None
+            return "contains invalid UUID"
+        return None
+
+    def check_email(self, field_name: str, value: str) -> None:
+        self._check("email", field_name, value)
+
+    def check_hostname(self, field_name: str, value: str) -> None:
+        self._check("hostname", field_name, value)
+
+    def check_ip(self, field_name: str, value: Union[str, bytes]) -> None:
+        self._check("ip", field_name, value)
+
+    def check_ipv4(self, field_name: str, value: Union[str, bytes]) -> None:
+        self._check("ipv4", field_name, value)
+
+    def check_ipv6(self, field_name: str, value: Union[str, bytes]) -> None:
+        self._check("ipv6", field_name, value)
+
+    def check_uri(self, field_name: str, value: str) -> None:
+        self._check("uri", field_name, value)
+
+    def check_uri_ref(self, field_name: str, value: str) -> None:
+        self._check("uri_ref", field_name, value)
+
+    def check_address(self, field_name: str, value: str) -> None:
+        self._check("address", field_name, value)
+
+    def check_uuid(self, field_name: str, value: str) -> None:
+        self._check("uuid", field_name, value)
 
 
 _AnyTime = Union[Timestamp, Duration]
 
 
-def dec(value: str) -> Decimal:
-    return Decimal(value)
+def nanos(value: _AnyTime) -> int:
+    return value.seconds * 1_000_000_000 + value.nanos
+
+
+# kinds of the generated functions
+VALIDATOR = "validator"
+COLLECTOR = "collector"
+BATCH_VALIDATOR = "batch_validator"
+
+_FUNC_NAMES = {
+    VALIDATOR: "_validate",
+    COLLECTOR: "_validate_all",
+    BATCH_VALIDATOR: "_validate_many",
+}
+
+#: nested validator name -> (kind, message descriptor)
+_Bindings = Dict[str, Tuple[str, Descriptor]]
+
+
+class ValidatorBuffer(Buffer):
+    #: generated function reads current time once, at the beginning
+    uses_now = False
+
+    def __init__(self, func_name: str = "_validate") -> None:
+        super().__init__()
+        self.func_name = func_name
+        #: validators of the nested messages, called directly by their names
+        self.bindings: _Bindings = {}
+        #: source code of the constants, evaluated once at the module level
+        self.constants: Dict[str, str] = {}
 
+    def constant(self, source: str) -> str:
+        """Returns name of the module-level constant with the given value"""
+        name = self.constants.get(source)
+        if name is None:
+            name = self.constants[source] = f"_{self.func_name}_{len(self.constants)}"
+        return name
 
-def dec_repr(value: _AnyTime) -> str:
-    return f"{value.seconds}.{value.nanos:09d}"
+    def bind(self, kind: str, descriptor: Descriptor) -> str:
+        """Returns name of the nested validator of the given kind"""
+        name = validator_name(descriptor, kind)
+        self.bindings[name] = (kind, descriptor)
+        return name
 
+    def insert(self, position: int, string: str) -> None:
+        self._lines.insert(position, " " * self._indent * 4 + string)
 
-def sec(value: _AnyTime) -> Decimal:
-    return Decimal(dec_repr(value))
 
+class CollectBuffer(ValidatorBuffer):
+    """Buffer to generate validators which collect all violations instead of
+    raising an error on the first one
+    """
 
-def now() -> Decimal:
-    ts = Timestamp()
-    ts.GetCurrentTime()
-    return sec(ts)
+    #: source code of the violation path, relative to the message path
+    path = "''"
+    rule = ""
 
 
-def err_gen(buf: Buffer, message: str, **ctx: str) -> None:
+def err_gen(buf: ValidatorBuffer, message: str, **ctx: str) -> None:
     message_repr = repr(message)
     if ctx:
         ctx_items = ", ".join("{}={}".format(key, val) for key, val in ctx.items())
         message_repr += f".format({ctx_items})"
-    buf.add(f"raise {ValidationError.__name__}({message_repr})")
+    if isinstance(buf, CollectBuffer):
+        buf.add(
+            f"violations.append({Violation.__name__}("
+            f"path + {buf.path}, {buf.rule!r}, {message_repr}))"
+        )
+    else:
+        buf.add(f"raise {ValidationError.__name__}({message_repr})")
 
 
 class FieldRulesBase:
-    buf: Buffer
+    buf: ValidatorBuffer
     field: FieldDescriptor
     code_path: List[str]
     proto_path: List[str]
@@ -168,19 +312,47 @@ class FieldRulesBase:
     def proto_name(self) -> str:
         return "".join(self.proto_path)
 
+    def path_code(self) -> str:
+        # index of the repeated field item is known only in runtime
+        if self.proto_path[-1] == "[]":
+            return f"{''.join(self.proto_path[:-1])!r} + '[' + str(index) + ']'"
+        return repr(self.proto_name())
+
     def rule_value(self, value: Any) -> str:
         return repr(value)
 
     def rule_value_repr(self, value: Any) -> str:
         return repr(value)
 
+    def fmt_check(self, method: str) -> None:
+        call = f"fmt.{method}({self.proto_name()!r}, {self.field_value()})"
+        if isinstance(self.buf, CollectBuffer):
+            self.buf.add("try:")
+            with self.buf.indent():
+                self.buf.add(call)
+            self.buf.add(f"except {ValidationError.__name__} as exc:")
+            with self.buf.indent():
+                self.buf.add(
+                    f"violations.append({Violation.__name__}("
+                    f"path + {self.buf.path}, {self.buf.rule!r}, str(exc)))"
+                )
+        else:
+            self.buf.add(call)
+
+
+_RULE_NAMES = {
+    field.message_type.full_name: field.name
+    for field in validate_pb2.FieldRules.DESCRIPTOR.fields
+    if field.message_type is not None
+}
+
 
 class FieldRules(FieldRulesBase, ABC):
     rule_descriptor: ClassVar[Descriptor]
 
     def __init__(
         self,
-        buf: Buffer,
+        buf: ValidatorBuffer,
         field: FieldDescriptor,
         code_path: List[str],
         proto_path: List[str],
@@ -204,6 +376,10 @@ class FieldRules(FieldRulesBase, ABC):
                 visit_fn = getattr(self, f"visit_{field.name}")
             except AttributeError:
                 raise NotImplementedError(field.full_name)
+            if isinstance(self.buf, CollectBuffer):
+                rule_name = _RULE_NAMES[self.rule_descriptor.full_name]
+                self.buf.rule = f"{rule_name}.{field.name}"
+                self.buf.path = self.path_code()
             visit_fn(rule_value)
 
 
@@ -219,7 +395,8 @@ class ConstRulesMixin(FieldRulesBase):
 
 class InRulesMixin(FieldRulesBase):
     def _set(self, value: Collection[Any]) -> str:
-        return "{{" + ", ".join([self.rule_value(i) for i in value]) + "}}"
+        items = ", ".join([self.rule_value(i) for i in value])
+        return self.buf.constant(f"frozenset([{items}])")
 
     def _set_repr(self, value: Collection[Any]) -> str:
         return "{{" + ", ".join([self.rule_value_repr(i) for i in value]) + "}}"
@@ -421,9 +598,8 @@ class StringRules(
             )
 
     def visit_pattern(self, value: str) -> None:
-        self.buf.add(
-            f"if re.search({self.rule_value(value)}, {self.field_value()}) is None:"
-        )
+        pattern = self.buf.constant(f"re.compile({self.rule_value(value)})")
+        self.buf.add(f"if {pattern}.search({self.field_value()}) is None:")
         with self.buf.indent():
             err_gen(
                 self.buf,
@@ -432,31 +608,31 @@ class StringRules(
             )
 
     def visit_email(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_email({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_email")
 
     def visit_hostname(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_hostname({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_hostname")
 
     def visit_ip(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_ip({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_ip")
 
     def visit_ipv4(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_ipv4({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_ipv4")
 
     def visit_ipv6(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_ipv6({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_ipv6")
 
     def visit_uri(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_uri({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_uri")
 
     def visit_uri_ref(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_uri_ref({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_uri_ref")
 
     def visit_address(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_address({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_address")
 
     def visit_uuid(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_uuid({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_uuid")
 
 
 class BytesRules(
@@ -472,10 +648,8 @@ class BytesRules(
                 self.buf, f"{self.proto_name()} has invalid validation pattern {value}"
             )
         else:
-            self.buf.add(
-                f"if re.search({self.rule_value(value_bytes)},"
-                f" {self.field_value()}) is None:"
-            )
+            pattern = self.buf.constant(f"re.compile({self.rule_value(value_bytes)})")
+            self.buf.add(f"if {pattern}.search({self.field_value()}) is None:")
             with self.buf.indent():
                 err_gen(
                     self.buf,
@@ -484,22 +658,22 @@ class BytesRules(
                 )
 
     def visit_ip(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_ip({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_ip")
 
     def visit_ipv4(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_ipv4({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_ipv4")
 
     def visit_ipv6(self, _: "Literal[True]") -> None:
-        self.buf.add(f"fmt.check_ipv6({self.proto_name()!r}, {self.field_value()})")
+        self.fmt_check("check_ipv6")
 
 
 class EnumRules(ConstRulesMixin, InRulesMixin, FieldRules):
     rule_descriptor = validate_pb2.EnumRules.DESCRIPTOR
 
     def visit_defined_only(self, _: "Literal[True]") -> None:
-        ids = [e.number for e in self.field.enum_type.values]
-        ids_repr = "{{" + ", ".join(map(repr, ids)) + "}}"
-        self.buf.add(f"if {self.field_value()} not in {ids_repr}:")
+        ids = ", ".join([repr(e.number) for e in self.field.enum_type.values])
+        ids_set = self.buf.constant(f"frozenset([{ids}])")
+        self.buf.add(f"if {self.field_value()} not in {ids_set}:")
         with self.buf.indent():
             err_gen(self.buf, f"{self.proto_name()} is not defined")
 
@@ -532,7 +706,10 @@ class RepeatedRules(FieldRules):
             )
 
     def visit_items(self, value: validate_pb2.FieldRules) -> None:
-        self.buf.add(f"for item in {self.field_value()}:")
+        if isinstance(self.buf, CollectBuffer):
+            self.buf.add(f"for index, item in enumerate({self.field_value()}):")
+        else:
+            self.buf.add(f"for item in {self.field_value()}:")
         with self.buf.indent():
             proto_path = self.proto_path + ["[]"]
             dispatch_field(self.buf, self.field, ["item"], proto_path, value)
@@ -597,21 +774,14 @@ class AnyRules(MessageRulesMixin, InRulesMixin, FieldRules):
     def proto_name(self) -> str:
         return f"{super().proto_name()}.type_url"
 
-    def visit_in(self, value: Collection[Any]) -> None:
-        self.buf.add("print(p.field.type_url)")
-        value_set = self._set(value)
-        value_set_repr = self._set_repr(value)
-        self.buf.add(f"if {self.field_value()} not in {value_set}:")
-        with self.buf.indent():
-            err_gen(self.buf, f"{self.proto_name()} not in {value_set_repr}")
-
 
 class TimeFormatMixin(FieldRulesBase):
     def field_value(self) -> str:
-        return f"sec({super().field_value()})"
+        value = super().field_value()
+        return f"({value}.seconds * 1_000_000_000 + {value}.nanos)"
 
     def rule_value(self, value: _AnyTime) -> str:
-        return f'dec("{dec_repr(value)}")'
+        return repr(nanos(value))
 
     def rule_value_repr(self, value: _AnyTime) -> str:
         return value.ToJsonString()
@@ -651,13 +821,14 @@ class TimestampRules(
         pass
 
     def visit_within(self, value: Duration) -> None:
+        self.buf.uses_now = True
         if self.lt_now:
             self._visit_within_past(value)
         elif self.gt_now:
             self._visit_within_future(value)
         else:
             self.buf.add(
-                f"if not abs({self.field_value()} - now()) < {self.rule_value(value)}:"
+                f"if not abs({self.field_value()} - _now) < {self.rule_value(value)}:"
             )
             with self.buf.indent():
                 err_gen(
@@ -668,7 +839,7 @@ class TimestampRules(
 
     def _visit_within_past(self, value: Duration) -> None:
         self.buf.add(
-            f"if not (0 < now() - {self.field_value()} < {self.rule_value(value)}):"
+            f"if not (0 < _now - {self.field_value()} < {self.rule_value(value)}):"
         )
         with self.buf.indent():
             err_gen(
@@ -679,7 +850,7 @@ class TimestampRules(
 
     def _visit_within_future(self, value: Duration) -> None:
         self.buf.add(
-            f"if not (0 < {self.field_value()} - now() < {self.rule_value(value)}):"
+            f"if not (0 < {self.field_value()} - _now < {self.rule_value(value)}):"
         )
         with self.buf.indent():
             err_gen(
@@ -724,7 +895,7 @@ FIELD_RULE_TYPES: Dict[str, type] = {
 
 
 def dispatch_field(
-    buf: Buffer,
+    buf: ValidatorBuffer,
     field: FieldDescriptor,
     code_path: List[str],
     proto_path: List[str],
@@ -741,7 +912,10 @@ def dispatch_field(
 
 
 def field_gen(
-    buf: Buffer, field: FieldDescriptor, code_path: List[str], proto_path: List[str]
+    buf: ValidatorBuffer,
+    field: FieldDescriptor,
+    code_path: List[str],
+    proto_path: List[str],
 ) -> None:
     for opt, opt_value in field.GetOptions().ListFields():
         if opt.full_name == "validate.rules":
@@ -752,54 +926,176 @@ def field_gen(
                     return
 
     if field.message_type:
-        for opt, opt_value in field.message_type.GetOptions().ListFields():
-            if (
-                opt.full_name == "google.protobuf.MessageOptions.map_entry"
-                and opt_value is True
-            ):
-                return
+        if _is_map_entry(field.message_type):
+            return
+        if not has_rules(field.message_type):
+            return
         field_value = ".".join(code_path)
+        if isinstance(buf, CollectBuffer):
+            name = buf.bind(COLLECTOR, field.message_type)
+        elif field.label == FieldDescriptor.LABEL_REPEATED:
+            name = buf.bind(BATCH_VALIDATOR, field.message_type)
+        else:
+            name = buf.bind(VALIDATOR, field.message_type)
         if field.label == FieldDescriptor.LABEL_REPEATED:
-            buf.add(f"for item in {field_value}:")
-            with buf.indent():
-                buf.add("validate(item)")
+            if isinstance(buf, CollectBuffer):
+                buf.add(f"for i, item in enumerate({field_value}):")
+                with buf.indent():
+                    buf.add(
+                        f"{name}(item, violations,"
+                        f' path + "{"".join(proto_path)}[" + str(i) + "].")'
+                    )
+            else:
+                buf.add(f"{name}({field_value}, None)")
         else:
             outer = ".".join(code_path[:-1])
             inner = code_path[-1]
             buf.add(f'if {outer}.HasField("{inner}"):')
             with buf.indent():
-                buf.add(f"validate({field_value})")
+                if isinstance(buf, CollectBuffer):
+                    buf.add(
+                        f"{name}({field_value}, violations,"
+                        f' path + "{"".join(proto_path)}.")'
+                    )
+                else:
+                    buf.add(f"{name}({field_value})")
+
 
+def validator_name(descriptor: Descriptor, kind: str = VALIDATOR) -> str:
+    return f"{_FUNC_NAMES[kind]}_{descriptor.full_name.replace('.', '_')}"
 
-def file_gen(message: Message) -> Optional[str]:
-    for opt, opt_value in message.DESCRIPTOR.GetOptions().ListFields():
+
+def _is_disabled(descriptor: Descriptor) -> bool:
+    for opt, opt_value in descriptor.GetOptions().ListFields():
         if opt.full_name == "validate.disabled" and opt_value:
-            return None
+            return True
+    return False
+
+
+def _is_map_entry(descriptor: Descriptor) -> bool:
+    return descriptor.GetOptions().map_entry
+
 
-    buf = Buffer()
-    buf.add("def _validate(p):")
+_has_rules: Dict[str, bool] = {}
+
+
+def has_rules(descriptor: Descriptor) -> bool:
+    """Checks whether message or any of the nested messages has validation
+    rules, so validation of this message can be skipped completely
+    """
+    result = _has_rules.get(descriptor.full_name)
+    if result is not None:
+        return result
+    result = False
+    seen: Set[str] = set()
+    pending = [descriptor]
+    while pending and not result:
+        current = pending.pop()
+        if current.full_name in seen or _is_disabled(current):
+            continue
+        seen.add(current.full_name)
+        for oneof in current.oneofs:
+            for opt, opt_value in oneof.GetOptions().ListFields():
+                if opt.name == "required" and opt_value:
+                    result = True
+        for field in current.fields:
+            buf = ValidatorBuffer()
+            skip = False
+            for opt, opt_value in field.GetOptions().ListFields():
+                if opt.full_name == "validate.rules":
+                    dispatch_field(
+                        buf, field, ["p", field.name], [field.name], opt_value
+                    )
+                    skip = opt_value.message.skip
+            if buf.position:
+                result = True
+            elif field.message_type and not skip:
+                if not _is_map_entry(field.message_type):
+                    pending.append(field.message_type)
+    _has_rules[descriptor.full_name] = result
+    return result
+
+
+def _body_gen(buf: ValidatorBuffer, descriptor: Descriptor) -> None:
+    for oneof in descriptor.oneofs:
+        buf.add(f"__{oneof.name} = p.WhichOneof('{oneof.name}')")
+        for i, field in enumerate(oneof.fields):
+            ctrl = "elif" if i else "if"
+            buf.add(f"{ctrl} __{oneof.name} == '{field.name}':")
+            with buf.indent():
+                inner_pos = buf.position
+                field_gen(buf, field, ["p", field.name], [field.name])
+                if buf.position == inner_pos:
+                    buf.add("pass")
+        for opt, opt_value in oneof.GetOptions().ListFields():
+            if opt.name == "required" and opt_value:
+                if isinstance(buf, CollectBuffer):
+                    buf.path, buf.rule = repr(oneof.name), "oneof.required"
+                buf.add("else:")
+                with buf.indent():
+                    err_gen(buf, f"Oneof {oneof.name} is required")
+    for field in descriptor.fields:
+        if not field.containing_oneof:
+            field_gen(buf, field, ["p", field.name], [field.name])
+
+
+def file_gen(
+    descriptor: Descriptor,
+    func_name: Optional[str] = None,
+    *,
+    kind: str = VALIDATOR,
+    bindings: Optional[_Bindings] = None,
+) -> Optional[str]:
+    """Generates source code of the validator, names of the validators of
+    the nested messages are stored into the ``bindings``
+    """
+    if _is_disabled(descriptor):
+        return None
+    if func_name is None:
+        func_name = _FUNC_NAMES[kind]
+
+    buf: ValidatorBuffer
+    if kind == COLLECTOR:
+        buf = CollectBuffer(func_name)
+        buf.add(f"def {func_name}(p, violations, path):")
+    elif kind == BATCH_VALIDATOR:
+        buf = ValidatorBuffer(func_name)
+        buf.add(f"def {func_name}(ps, errors):")
+    else:
+        buf = ValidatorBuffer(func_name)
+        buf.add(f"def {func_name}(p):")
     pos = buf.position
     with buf.indent():
-        for oneof in message.DESCRIPTOR.oneofs:
-            buf.add(f"__{oneof.name} = p.WhichOneof('{oneof.name}')")
-            for i, field in enumerate(oneof.fields):
-                ctrl = "elif" if i else "if"
-                buf.add(f"{ctrl} __{oneof.name} == '{field.name}':")
+        if kind == BATCH_VALIDATOR:
+            # validator is inlined into the loop, errors are raised when
+            # there is no place to store them
+            buf.add("for i, p in enumerate(ps):")
+            with buf.indent():
+                buf.add("try:")
                 with buf.indent():
-                    inner_pos = buf.position
-                    field_gen(buf, field, ["p", field.name], [field.name])
-                    if buf.position == inner_pos:
+                    body_pos = buf.position
+                    _body_gen(buf, descriptor)
+                    if buf.position == body_pos:
                         buf.add("pass")
-            for opt, opt_value in oneof.GetOptions().ListFields():
-                if opt.name == "required" and opt_value:
-                    buf.add("else:")
+                buf.add(f"except {ValidationError.__name__} as exc:")
+                with buf.indent():
+                    buf.add("if errors is None:")
                     with buf.indent():
-                        err_gen(buf, f"Oneof {oneof.name} is required")
-        for field in message.DESCRIPTOR.fields:
-            if not field.containing_oneof:
-                field_gen(buf, field, ["p", field.name], [field.name])
-        if buf.position == pos:
-            buf.add("pass")
+                        buf.add("raise")
+                    buf.add("errors[i] = exc")
+        else:
+            _body_gen(buf, descriptor)
+            if buf.position == pos:
+                buf.add("pass")
+        if buf.uses_now:
+            buf.insert(pos, "_now = time_ns()")
+    if bindings is not None:
+        bindings.update(buf.bindings)
+    constants = "".join(
+        f"{name} = {source}\n" for source, name in buf.constants.items()
+    )
+    if constants:
+        return constants + "\n\n" + buf.content()
     return buf.content()
 
 
@@ -807,38 +1103,250 @@ def _validate_disabled(message: Message) -> None:
     pass
 
 
-_validators: Dict[str, Callable[[Message], None]] = {}
+def _collect_disabled(message: Message, violations: List[Violation], path: str) -> None:
+    pass
 
 
-if TYPE_CHECKING:
+def _validate_many_disabled(
+    messages: Sequence[Message], errors: Optional[Dict[int, ValidationError]]
+) -> None:
+    pass
 
-    class _Locals(TypedDict):
-        _validate: Optional[Callable[[Message], None]]
 
+_validators: Dict[str, Callable[..., None]] = {}
+_collectors: Dict[str, Callable[..., None]] = {}
+_batch_validators: Dict[str, Callable[..., None]] = {}
+_loaded_modules: Set[str] = set()
 
-def validate(message: Message) -> None:
-    key = message.DESCRIPTOR.full_name
-    func = _validators.get(key, None)
+_CACHES = {
+    VALIDATOR: _validators,
+    COLLECTOR: _collectors,
+    BATCH_VALIDATOR: _batch_validators,
+}
+_DISABLED: Dict[str, Callable[..., None]] = {
+    VALIDATOR: _validate_disabled,
+    COLLECTOR: _collect_disabled,
+    BATCH_VALIDATOR: _validate_many_disabled,
+}
+#: names of the mappings in the modules generated by the plugin
+MAPPINGS = {
+    VALIDATOR: "VALIDATORS",
+    COLLECTOR: "COLLECTORS",
+    BATCH_VALIDATOR: "BATCH_VALIDATORS",
+}
+
+
+def validators_module(proto_file: str) -> str:
+    """Returns name of the module with validators, generated by the
+    ``protoc-gen-harness`` plugin for the proto file
+    """
+    return proto_file.replace("/", ".").replace(".proto", "_validate")
+
+
+def _load_validators(descriptor: Descriptor) -> None:
+    module_name = validators_module(descriptor.file.name)
+    if module_name in _loaded_modules:
+        return
+    _loaded_modules.add(module_name)
+    try:
+        module = importlib.import_module(module_name)
+    except ModuleNotFoundError as exc:
+        if exc.name is None or not (
+            module_name == exc.name or module_name.startswith(exc.name + ".")
+        ):
+            raise
+    else:
+        for kind, mapping in MAPPINGS.items():
+            for key, func in getattr(module, mapping, {}).items():
+                _CACHES[kind].setdefault(key, func)
+        pool = descriptor.file.pool
+        external = getattr(module, "EXTERNAL", {})
+        bindings = {
+            name: (kind, pool.FindMessageTypeByName(full_name))
+            for name, (kind, full_name) in external.items()
+        }
+        _bind(vars(module), bindings)
+
+
+_code_cache_dir: Optional[str] = None
+
+
+def set_code_cache_dir(path: Optional[str]) -> None:
+    """Enables cache of the compiled validators in the directory, so other
+    processes and restarted services don't generate them again
+    """
+    global _code_cache_dir
+    _code_cache_dir = path
+
+
+def code_cache_key(kind: str, descriptor: Descriptor) -> str:
+    """Returns a key of the compiled validator, which changes when message
+    schema, validation rules, harness or Python versions are changed
+    """
+    data = [
+        __version__,
+        importlib.util.MAGIC_NUMBER.hex(),
+        kind,
+        descriptor.full_name,
+        # generated code depends on rules of the nested messages, which may be
+        # defined in other files
+        file_hash(descriptor.file),
+    ]
+    return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
+
+
+def _generate(kind: str, descriptor: Descriptor) -> Tuple[Any, _Bindings]:
+    cache_dir = _code_cache_dir
+    if cache_dir is not None:
+        key = code_cache_key(kind, descriptor)
+        data = read_snapshot(cache_dir, key)
+        if data is not None:
+            code, names = marshal.loads(data)
+            pool = descriptor.file.pool
+            bindings: _Bindings = {
+                name: (nested_kind, pool.FindMessageTypeByName(full_name))
+                for name, (nested_kind, full_name) in names.items()
+            }
+            return code, bindings
+
+    bindings = {}
+    source = file_gen(descriptor, kind=kind, bindings=bindings)
+    code = None if source is None else compile(source, "<string>", "exec")
+    if cache_dir is not None:
+        names = {
+            name: (nested_kind, nested.full_name)
+            for name, (nested_kind, nested) in bindings.items()
+        }
+        write_snapshot(cache_dir, key, marshal.dumps((code, names)))
+    return code, bindings
+
+
+def _bind(namespace: Dict[str, Any], bindings: _Bindings) -> None:
+    for name, (kind, descriptor) in bindings.items():
+        namespace[name] = _resolve(kind, descriptor)
+
+
+def _resolve(kind: str, descriptor: Descriptor) -> Callable[..., None]:
+    cache = _CACHES[kind]
+    key = descriptor.full_name
+    func: Optional[Callable[..., None]] = cache.get(key, None)
+    if func is None:
+        _load_validators(descriptor)
+        func = cache.get(key, None)
     if func is None:
-        source = file_gen(message)
-        if source is not None:
-            locals_: "_Locals" = {"_validate": None}
-            exec(source, CTX, locals_)
-            func = locals_["_validate"]
-            assert func is not None
+        code, bindings = _generate(kind, descriptor)
+        if code is None:
+            func = cache[key] = _DISABLED[kind]
         else:
-            func = _validate_disabled
-        _validators[key] = func
-    func(message)
+            namespace: Dict[str, Any] = dict(CTX)
+            exec(code, namespace)
+            # validator is registered before binding nested validators in
+            # order to support recursive messages
+            func = cache[key] = namespace[_FUNC_NAMES[kind]]
+            _bind(namespace, bindings)
+    return func
+
+
+def validate(message: Message) -> None:
+    _resolve(VALIDATOR, message.DESCRIPTOR)(message)
+
+
+def collect(message: Message, violations: List[Violation], path: str) -> None:
+    _resolve(COLLECTOR, message.DESCRIPTOR)(message, violations, path)
+
+
+def validate_batch(
+    messages: Sequence[Message], errors: Optional[Dict[int, ValidationError]]
+) -> None:
+    if messages:
+        _resolve(BATCH_VALIDATOR, messages[0].DESCRIPTOR)(messages, errors)
+
+
+def validate_all(message: Message) -> List[Violation]:
+    """Validates message and returns all found violations instead of raising
+    an error on the first one
+    """
+    violations: List[Violation] = []
+    collect(message, violations, "")
+    return violations
+
+
+def validate_many(messages: Sequence[Message]) -> Dict[int, ValidationError]:
+    """Validates messages of the same type and returns errors by indexes of
+    the invalid messages
+    """
+    errors: Dict[int, ValidationError] = {}
+    validate_batch(messages, errors)
+    return errors
+
+
+def compile_validators(message_type: Type[Message]) -> None:
+    """Generates validators for the message type and all nested message types
+    in advance, to save time on the first validation
+    """
+    seen: Set[str] = set()
+    pending = [message_type.DESCRIPTOR]
+    while pending:
+        descriptor = pending.pop()
+        if descriptor.full_name in seen:
+            continue
+        seen.add(descriptor.full_name)
+        _resolve(VALIDATOR, descriptor)
+        pending.extend(
+            field.message_type
+            for field in descriptor.fields
+            if field.message_type is not None
+        )
+
+
+_format = Format()
+_cache_observers: List["Observer"] = []
+
+
+def set_format_cache_size(cache_size: int) -> None:
+    """Enables bounded LRU caches of the format checks results, e.g. emails
+    and URIs, ``0`` disables caches
+    """
+    _format.set_cache_size(cache_size)
+
+
+def _observe_cache(field: str) -> Callable[["Observer"], None]:
+    def observe(observer: "Observer") -> None:
+        for check, info in _format.cache_info().items():
+            observer.observe(getattr(info, field), {"check": check})
+
+    return observe
+
+
+def monitor_format_cache() -> None:
+    """Exports hits and misses of the format checks caches as metrics"""
+    if _cache_observers:
+        return
+    from opentelemetry.sdk.metrics import SumObserver
+
+    meter = get_meter()
+    _cache_observers.extend(
+        meter.register_observer(
+            _observe_cache(field),
+            f"harness_validation_cache_{field}",
+            f"Number of the format checks cache {field}",
+            "1",
+            int,
+            SumObserver,
+            ("check",),
+        )
+        for field in ["hits", "misses"]
+    )
 
 
 CTX = {
     "re": re,
     ValidationError.__name__: ValidationError,
-    "fmt": Format(),
-    "sec": sec,
-    "now": now,
-    "dec": dec,
+    "fmt": _format,
+    "time_ns": time.time_ns,
     "Counter": Counter,
     validate.__name__: validate,
+    collect.__name__: collect,
+    validate_batch.__name__: validate_batch,
+    Violation.__name__: Violation,
 }
@@ -0,0 +1,56 @@
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Sequence, Tuple
+from contextvars import ContextVar
+
+from ._timings import Timings
+
+
+_log = logging.getLogger(__name__)
+
+_Warmer = Callable[[], Awaitable[None]]
+
+_hooks: ContextVar[List[_Warmer]] = ContextVar("warmup_hooks")
+
+
+def add_warmup(func: _Warmer) -> None:
+    """Registers coroutine function to run during warmup stage, after
+    ``setup`` function returns and before output wires are started.
+    Should be called from the ``setup`` function
+    """
+    try:
+        hooks = _hooks.get()
+    except LookupError:
+        raise RuntimeError("add_warmup() should be called from the setup function")
+    hooks.append(func)
+
+
+async def _run(timings: Timings, name: str, func: _Warmer) -> None:
+    try:
+        with timings.record(name, "warmup"):
+            await func()
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        _log.exception("Warmup of %s failed", name)
+
+
+async def warmup(
+    timings: Timings, warmers: Sequence[Tuple[str, _Warmer]], timeout: Optional[float],
+) -> None:
+    if not warmers:
+        return
+    start = time.monotonic()
+    tasks = {
+        asyncio.ensure_future(_run(timings, name, func)): name for name, func in warmers
+    }
+    _, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+        _log.warning(
+            "Warmup timeout exceeded: %s", ", ".join(tasks[t] for t in pending)
+        )
+    _log.info("Warmup finished in %.3fs", time.monotonic() - start)
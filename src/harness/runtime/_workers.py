@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import signal
+import socket
+import logging
+import traceback
+from types import FrameType
+from typing import Callable, Collection, Dict, List, Optional, NoReturn
+
+
+_log = logging.getLogger(__name__)
+
+RESTART_DELAY = 1.0
+
+_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+_RELOAD_SIGNALS = (signal.SIGHUP,)
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    (family, type_, proto, _, address), *_ = socket.getaddrinfo(
+        host or None, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE,
+    )
+    sock = socket.socket(family, type_, proto)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(address)
+    sock.listen(socket.SOMAXCONN)
+    sock.setblocking(False)
+    return sock
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _worker(
+    target: Callable[[], int],
+    signals: Collection[int],
+    reload_signals: Collection[int],
+) -> NoReturn:
+    # terminal signals are delivered to the parent process only, parent
+    # process forwards them to the workers
+    os.setpgid(0, 0)
+    for sig_num in (*signals, *reload_signals):
+        signal.signal(sig_num, signal.SIG_DFL)
+    # reload signals are kept pending until worker installs its handler
+    signal.pthread_sigmask(signal.SIG_BLOCK, reload_signals)
+    code = 1
+    try:
+        code = target()
+    except SystemExit as exc:
+        if exc.code is None:
+            code = 0
+        elif isinstance(exc.code, int):
+            code = exc.code
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        # os._exit() doesn't flush buffers, output of the failed worker
+        # is needed to find out why it failed
+        try:
+            logging.shutdown()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def run_workers(
+    target: Callable[[], int],
+    count: int,
+    *,
+    signals: Collection[int] = _SIGNALS,
+    reload_signals: Collection[int] = _RELOAD_SIGNALS,
+    reload: Optional[Callable[[], None]] = None,
+) -> int:
+    """Runs ``target`` in ``count`` forked processes and restarts processes
+    which exited abnormally. Received signals are forwarded to every worker,
+    reload signals are forwarded without stopping workers restarts. When
+    reload signal was received, ``reload`` is called before the next restart
+    """
+    workers: Dict[int, int] = {}
+    received: List[int] = []
+    reload_received: List[int] = []
+
+    def forward(sig_num: int, _: Optional[FrameType]) -> None:
+        if sig_num in reload_signals:
+            reload_received.append(sig_num)
+        else:
+            received.append(sig_num)
+        for pid in workers:
+            try:
+                os.kill(pid, sig_num)
+            except ProcessLookupError:
+                pass
+
+    def spawn(number: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            _worker(target, signals, reload_signals)
+        workers[pid] = number
+
+    handlers = {
+        sig_num: signal.signal(sig_num, forward)
+        for sig_num in (*signals, *reload_signals)
+    }
+    try:
+        for number in range(count):
+            spawn(number)
+        exit_code = 0
+        while workers:
+            pid, status = os.waitpid(-1, 0)
+            if pid not in workers:
+                continue
+            number = workers.pop(pid)
+            code = _exit_code(status)
+            if code == 0:
+                continue
+            if received:
+                exit_code = exit_code or code
+                continue
+            _log.warning("Worker %d exited with code %d, restarting", number, code)
+            time.sleep(RESTART_DELAY)
+            if received:
+                continue
+            if reload_received and reload is not None:
+                # workers reload configuration by themselves, new workers
+                # should start with the same configuration
+                reload_received.clear()
+                reload()
+            spawn(number)
+        return exit_code
+    finally:
+        for sig_num, handler in handlers.items():
+            signal.signal(sig_num, handler)
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='harness',
   syntax='proto2',
   serialized_options=None,
-  serialized_pb=b'\n\x12harness/wire.proto\x12\x07harness\x1a google/protobuf/descriptor.proto\x1a\x17validate/validate.proto\"Y\n\x04Mark\x12(\n\x08protocol\x18\x01 \x01(\x0e\x32\x16.harness.Mark.Protocol\"\'\n\x08Protocol\x12\x07\n\x03TCP\x10\x00\x12\x08\n\x04HTTP\x10\x01\x12\x08\n\x04GRPC\x10\x02\"\x85\x01\n\x05Input\x12\x15\n\x04type\x18\x01 \x02(\tB\x07\xfa\x42\x04r\x02\x10\x01\x12#\n\x05reach\x18\x02 \x01(\x0e\x32\x14.harness.Input.Reach\"@\n\x05Reach\x12\r\n\tLOCALHOST\x10\x00\x12\r\n\tNAMESPACE\x10\x01\x12\x0b\n\x07\x43LUSTER\x10\x02\x12\x0c\n\x08\x45XTERNAL\x10\x03\"\x86\x01\n\x06Output\x12\x15\n\x04type\x18\x01 \x02(\tB\x07\xfa\x42\x04r\x02\x10\x01\x12&\n\x06\x65xpose\x18\x02 \x01(\x0e\x32\x16.harness.Output.Expose\"=\n\x06\x45xpose\x12\x0b\n\x07PRIVATE\x10\x00\x12\x0c\n\x08HEADLESS\x10\x01\x12\x0c\n\x08INTERNAL\x10\x02\x12\n\n\x06PUBLIC\x10\x03\"W\n\x04Wire\x12\x1f\n\x05input\x18\x01 \x01(\x0b\x32\x0e.harness.InputH\x00\x12!\n\x06output\x18\x02 \x01(\x0b\x32\x0f.harness.OutputH\x00\x42\x0b\n\x04type\x12\x03\xf8\x42\x01\"\xa8\x02\n\x07Service\x12\x0c\n\x04name\x18\x01 \x01(\t\x12-\n\tcontainer\x18\x02 \x01(\x0b\x32\x1a.harness.Service.Container\x1a\'\n\x08Resource\x12\x0b\n\x03\x63pu\x18\x01 \x01(\t\x12\x0e\n\x06memory\x18\x02 \x01(\t\x1a\x63\n\tResources\x12+\n\x08requests\x18\x01 \x01(\x0b\x32\x19.harness.Service.Resource\x12)\n\x06limits\x18\x02 \x01(\x0b\x32\x19.harness.Service.Resource\x1aR\n\tContainer\x12\x12\n\nrepository\x18\x01 \x01(\t\x12\x31\n\tresources\x18\x02 \x01(\x0b\x32\x1a.harness.Service.ResourcesB\x02\x18\x01:;\n\x04wire\x12\x1d.google.protobuf.FieldOptions\x18\xd1\x0f \x01(\x0b\x32\r.harness.Wire:;\n\x04mark\x12\x1d.google.protobuf.FieldOptions\x18\xd2\x0f \x01(\x0b\x32\r.harness.Mark:C\n\x07service\x12\x1f.google.protobuf.MessageOptions\x18\xd1\x0f \x01(\x0b\x32\x10.harness.Service'
+  serialized_pb=b'\n\x12harness/wire.proto\x12\x07harness\x1a google/protobuf/descriptor.proto\x1a\x17validate/validate.proto\"Y\n\x04Mark\x12(\n\x08protocol\x18\x01 \x01(\x0e\x32\x16.harness.Mark.Protocol\"\'\n\x08Protocol\x12\x07\n\x03TCP\x10\x00\x12\x08\n\x04HTTP\x10\x01\x12\x08\n\x04GRPC\x10\x02\"\x85\x01\n\x05Input\x12\x15\n\x04type\x18\x01 \x02(\tB\x07\xfa\x42\x04r\x02\x10\x01\x12#\n\x05reach\x18\x02 \x01(\x0e\x32\x14.harness.Input.Reach\"@\n\x05Reach\x12\r\n\tLOCALHOST\x10\x00\x12\r\n\tNAMESPACE\x10\x01\x12\x0b\n\x07\x43LUSTER\x10\x02\x12\x0c\n\x08\x45XTERNAL\x10\x03\"\x86\x01\n\x06Output\x12\x15\n\x04type\x18\x01 \x02(\tB\x07\xfa\x42\x04r\x02\x10\x01\x12&\n\x06\x65xpose\x18\x02 \x01(\x0e\x32\x16.harness.Output.Expose\"=\n\x06\x45xpose\x12\x0b\n\x07PRIVATE\x10\x00\x12\x0c\n\x08HEADLESS\x10\x01\x12\x0c\n\x08INTERNAL\x10\x02\x12\n\n\x06PUBLIC\x10\x03\"W\n\x04Wire\x12\x1f\n\x05input\x18\x01 \x01(\x0b\x32\x0e.harness.InputH\x00\x12!\n\x06output\x18\x02 \x01(\x0b\x32\x0f.harness.OutputH\x00\x42\x0b\n\x04type\x12\x03\xf8\x42\x01\"\xc7\x03\n\x07Service\x12\x0c\n\x04name\x18\x01 \x01(\t\x12-\n\tcontainer\x18\x02 \x01(\x0b\x32\x1a.harness.Service.Container\x12\'\n\x06python\x18\x03 \x01(\x0b\x32\x17.harness.Service.Python\x1a\'\n\x08Resource\x12\x0b\n\x03\x63pu\x18\x01 \x01(\t\x12\x0e\n\x06memory\x18\x02 \x01(\t\x1a\x63\n\tResources\x12+\n\x08requests\x18\x01 \x01(\x0b\x32\x19.harness.Service.Resource\x12)\n\x06limits\x18\x02 \x01(\x0b\x32\x19.harness.Service.Resource\x1aR\n\tContainer\x12\x12\n\nrepository\x18\x01 \x01(\t\x12\x31\n\tresources\x18\x02 \x01(\x0b\x32\x1a.harness.Service.ResourcesB\x02\x18\x01\x1at\n\x06Python\x12*\n\x04loop\x18\x01 \x01(\x0e\x32\x1c.harness.Service.Python.Loop\x12\x1d\n\x15validation_cache_size\x18\x02 \x01(\r\"\x1f\n\x04Loop\x12\x0b\n\x07\x41SYNCIO\x10\x00\x12\n\n\x06UVLOOP\x10\x01:;\n\x04wire\x12\x1d.google.protobuf.FieldOptions\x18\xd1\x0f \x01(\x0b\x32\r.harness.Wire:;\n\x04mark\x12\x1d.google.protobuf.FieldOptions\x18\xd2\x0f \x01(\x0b\x32\r.harness.Mark:C\n\x07service\x12\x1f.google.protobuf.MessageOptions\x18\xd1\x0f \x01(\x0b\x32\x10.harness.Service'
   ,
   dependencies=[google_dot_protobuf_dot_descriptor__pb2.DESCRIPTOR,validate_dot_validate__pb2.DESCRIPTOR,])
 
@@ -136,6 +136,28 @@ _OUTPUT_EXPOSE = _descriptor.EnumDescriptor(
 )
 _sym_db.RegisterEnumDescriptor(_OUTPUT_EXPOSE)
 
+_SERVICE_PYTHON_LOOP = _descriptor.EnumDescriptor(
+  name='Loop',
+  full_name='harness.Service.Python.Loop',
+  filename=None,
+  file=DESCRIPTOR,
+  values=[
+    _descriptor.EnumValueDescriptor(
+      name='ASYNCIO', index=0, number=0,
+      serialized_options=None,
+      type=None),
+    _descriptor.EnumValueDescriptor(
+      name='UVLOOP', index=1, number=1,
+      serialized_options=None,
+      type=None),
+  ],
+  containing_type=None,
+  serialized_options=None,
+  serialized_start=968,
+  serialized_end=999,
+)
+_sym_db.RegisterEnumDescriptor(_SERVICE_PYTHON_LOOP)
+
 
 _MARK = _descriptor.Descriptor(
   name='Mark',
@@ -321,8 +343,8 @@ _SERVICE_RESOURCE = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=616,
-  serialized_end=655,
+  serialized_start=657,
+  serialized_end=696,
 )
 
 _SERVICE_RESOURCES = _descriptor.Descriptor(
@@ -358,8 +380,8 @@ _SERVICE_RESOURCES = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=657,
-  serialized_end=756,
+  serialized_start=698,
+  serialized_end=797,
 )
 
 _SERVICE_CONTAINER = _descriptor.Descriptor(
@@ -395,8 +417,46 @@ _SERVICE_CONTAINER = _descriptor.Descriptor(
   extension_ranges=[],
   oneofs=[
   ],
-  serialized_start=758,
-  serialized_end=840,
+  serialized_start=799,
+  serialized_end=881,
+)
+
+_SERVICE_PYTHON = _descriptor.Descriptor(
+  name='Python',
+  full_name='harness.Service.Python',
+  filename=None,
+  file=DESCRIPTOR,
+  containing_type=None,
+  fields=[
+    _descriptor.FieldDescriptor(
+      name='loop', full_name='harness.Service.Python.loop', index=0,
+      number=1, type=14, cpp_type=8, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='validation_cache_size', full_name='harness.Service.Python.validation_cache_size', index=1,
+      number=2, type=13, cpp_type=3, label=1,
+      has_default_value=False, default_value=0,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
+  ],
+  extensions=[
+  ],
+  nested_types=[],
+  enum_types=[
+    _SERVICE_PYTHON_LOOP,
+  ],
+  serialized_options=None,
+  is_extendable=False,
+  syntax='proto2',
+  extension_ranges=[],
+  oneofs=[
+  ],
+  serialized_start=883,
+  serialized_end=999,
 )
 
 _SERVICE = _descriptor.Descriptor(
@@ -420,10 +480,17 @@ _SERVICE = _descriptor.Descriptor(
       message_type=None, enum_type=None, containing_type=None,
       is_extension=False, extension_scope=None,
       serialized_options=None, file=DESCRIPTOR),
+    _descriptor.FieldDescriptor(
+      name='python', full_name='harness.Service.python', index=2,
+      number=3, type=11, cpp_type=10, label=1,
+      has_default_value=False, default_value=None,
+      message_type=None, enum_type=None, containing_type=None,
+      is_extension=False, extension_scope=None,
+      serialized_options=None, file=DESCRIPTOR),
   ],
   extensions=[
   ],
-  nested_types=[_SERVICE_RESOURCE, _SERVICE_RESOURCES, _SERVICE_CONTAINER, ],
+  nested_types=[_SERVICE_RESOURCE, _SERVICE_RESOURCES, _SERVICE_CONTAINER, _SERVICE_PYTHON, ],
   enum_types=[
   ],
   serialized_options=None,
@@ -433,7 +500,7 @@ _SERVICE = _descriptor.Descriptor(
   oneofs=[
   ],
   serialized_start=544,
-  serialized_end=840,
+  serialized_end=999,
 )
 
 _MARK.fields_by_name['protocol'].enum_type = _MARK_PROTOCOL
@@ -456,7 +523,11 @@ _SERVICE_RESOURCES.fields_by_name['limits'].message_type = _SERVICE_RESOURCE
 _SERVICE_RESOURCES.containing_type = _SERVICE
 _SERVICE_CONTAINER.fields_by_name['resources'].message_type = _SERVICE_RESOURCES
 _SERVICE_CONTAINER.containing_type = _SERVICE
+_SERVICE_PYTHON.fields_by_name['loop'].enum_type = _SERVICE_PYTHON_LOOP
+_SERVICE_PYTHON.containing_type = _SERVICE
+_SERVICE_PYTHON_LOOP.containing_type = _SERVICE_PYTHON
 _SERVICE.fields_by_name['container'].message_type = _SERVICE_CONTAINER
+_SERVICE.fields_by_name['python'].message_type = _SERVICE_PYTHON
 DESCRIPTOR.message_types_by_name['Mark'] = _MARK
 DESCRIPTOR.message_types_by_name['Input'] = _INPUT
 DESCRIPTOR.message_types_by_name['Output'] = _OUTPUT
@@ -517,6 +588,13 @@ Service = _reflection.GeneratedProtocolMessageType('Service', (_message.Message,
     # @@protoc_insertion_point(class_scope:harness.Service.Container)
     })
   ,
+
+  'Python' : _reflection.GeneratedProtocolMessageType('Python', (_message.Message,), {
+    'DESCRIPTOR' : _SERVICE_PYTHON,
+    '__module__' : 'harness.wire_pb2'
+    # @@protoc_insertion_point(class_scope:harness.Service.Python)
+    })
+  ,
   'DESCRIPTOR' : _SERVICE,
   '__module__' : 'harness.wire_pb2'
   # @@protoc_insertion_point(class_scope:harness.Service)
@@ -525,6 +603,7 @@ _sym_db.RegisterMessage(Service)
 _sym_db.RegisterMessage(Service.Resource)
 _sym_db.RegisterMessage(Service.Resources)
 _sym_db.RegisterMessage(Service.Container)
+_sym_db.RegisterMessage(Service.Python)
 
 wire.message_type = _WIRE
 google_dot_protobuf_dot_descriptor__pb2.FieldOptions.RegisterExtension(wire)
@@ -1,8 +1,22 @@
+import time
+import asyncio
+import logging
 import ipaddress
 from http import HTTPStatus
-from typing import Dict
+from typing import Dict, Optional, Tuple, Iterator, TYPE_CHECKING
+from functools import lru_cache
+from contextlib import contextmanager
 
 from opentelemetry.trace.status import StatusCanonicalCode
+from google.protobuf.duration_pb2 import Duration
+
+from ..runtime._features import get_meter
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+
+_log = logging.getLogger(__name__)
 
 
 HTTP_STATUS_TO_CODE_MAP: Dict[int, StatusCanonicalCode] = {
@@ -47,3 +61,107 @@ def is_internal_request(host: str) -> bool:
         return address == "localhost"
     else:
         return True
+
+
+def duration_to_seconds(value: Duration) -> float:
+    return value.seconds + value.nanos / 1e9
+
+
+@lru_cache()
+def _drain_metrics() -> Tuple["ValueRecorder", "Counter"]:
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+    meter = get_meter()
+    duration = meter.create_metric(
+        "harness_drain_duration",
+        "Time spent waiting for in-flight requests during shutdown",
+        "s",
+        float,
+        ValueRecorder,
+        ("wire",),
+    )
+    aborted = meter.create_metric(
+        "harness_drain_aborted",
+        "Number of requests aborted after drain timeout",
+        "1",
+        int,
+        Counter,
+        ("wire",),
+    )
+    return duration, aborted
+
+
+class Drain:
+    """Tracks in-flight requests of a server wire, to wait for them during
+    graceful shutdown and to report how long it took
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.in_flight = 0
+        self.aborted = 0
+        self._started_at: Optional[float] = None
+        self._finished = False
+        self._closing = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @property
+    def closing(self) -> bool:
+        return self._started_at is not None
+
+    def acquire(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def release(self, *, aborted: bool = False) -> None:
+        self.in_flight -= 1
+        if aborted and self.closing:
+            self.aborted += 1
+        if not self.in_flight:
+            self._idle.set()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        self.acquire()
+        aborted = False
+        try:
+            yield
+        except asyncio.CancelledError:
+            aborted = True
+            raise
+        finally:
+            self.release(aborted=aborted)
+
+    def track_task(self, task: "asyncio.Task[None]") -> None:
+        self.acquire()
+        task.add_done_callback(lambda t: self.release(aborted=t.cancelled()))
+
+    def begin(self) -> None:
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+            self._closing.set()
+            _log.info("%s draining: in-flight=%d", self.name, self.in_flight)
+
+    async def wait(self, timeout: Optional[float]) -> None:
+        """Waits until drain begins and then until all in-flight requests are
+        finished, but not longer than ``timeout`` seconds
+        """
+        await self._closing.wait()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            _log.warning(
+                "%s drain timeout exceeded: in-flight=%d", self.name, self.in_flight
+            )
+
+    def finish(self) -> None:
+        if self._started_at is None or self._finished:
+            return
+        self._finished = True
+        duration = time.monotonic() - self._started_at
+        duration_metric, aborted_metric = _drain_metrics()
+        labels = {"wire": self.name}
+        duration_metric.record(duration, labels)
+        aborted_metric.add(self.aborted, labels)
+        _log.info("%s drained in %.3fs: aborted=%d", self.name, duration, self.aborted)
@@ -1,11 +1,13 @@
 import logging
 
+from functools import partial
 from types import TracebackType
-from typing import Callable, Awaitable, List, Optional, Type, TypeVar
+from typing import Callable, Awaitable, List, Optional, Type, TypeVar, Tuple
 from typing import TYPE_CHECKING
 from logging import Logger
 
-from aiohttp.web import Application, AppRunner, TCPSite, Request, Response
+from aiohttp.web import Application, AppRunner, BaseSite, TCPSite, SockSite
+from aiohttp.web import Request, Response
 from aiohttp.web import HTTPException, middleware
 from aiohttp.web_response import StreamResponse
 
@@ -15,9 +17,10 @@ from opentelemetry.propagators import extract
 from opentelemetry.trace.status import Status
 
 from ... import http_pb2
+from ...runtime._features import enable_metrics, enable_tracing
 
 from .. import _utils
-from ..base import Wire, WaitMixin
+from ..base import Wire, WaitMixin, SocketMixin, readiness
 
 
 if TYPE_CHECKING:
@@ -40,10 +43,23 @@ async def _healthcheck_middleware(
     if request.path == "/_/health":
         host = request.headers.get("host")
         if not host or _utils.is_internal_request(host):
-            return Response(text="OK")
+            if await readiness.check():
+                return Response(text="OK")
+            return Response(status=503, text="Not ready")
     return await handler(request)
 
 
+def _drain_middleware(drain: _utils.Drain) -> Callable[..., Awaitable[StreamResponse]]:
+    @middleware
+    async def middleware_(
+        request: Request, handler: Callable[[Request], Awaitable[StreamResponse]],
+    ) -> StreamResponse:
+        with drain.track():
+            return await handler(request)
+
+    return middleware_
+
+
 def _headers_getter(request: Request, header_name: str) -> List[str]:
     return request.headers.getall(header_name, [])  # type: ignore
 
@@ -78,7 +94,7 @@ async def _opentracing_middleware(
             return response
 
 
-class ServerWire(WaitMixin, Wire):
+class ServerWire(SocketMixin, WaitMixin, Wire):
     """
     Output wire to start HTTP server and serve aiohttp application.
 
@@ -90,9 +106,12 @@ class ServerWire(WaitMixin, Wire):
 
     """
 
+    _config: http_pb2.Server
+    _drain: _utils.Drain
+    _shutdown_timeout: float
     _runner: AppRunner
-    _site: TCPSite
-    _site_factory: "_Callback[TCPSite]"
+    _site: BaseSite
+    _site_factory: "_Callback[BaseSite]"
 
     def __init__(
         self, app: Application, *, access_log: Optional[Logger] = None,
@@ -107,12 +126,34 @@ class ServerWire(WaitMixin, Wire):
 
     def configure(self, value: http_pb2.Server) -> None:
         assert isinstance(value, http_pb2.Server), type(value)
+        enable_tracing()
+        enable_metrics()
 
+        self._drain = _utils.Drain(self.__class__.__name__)
+        self._app.middlewares.append(_drain_middleware(self._drain))
         self._app.middlewares.append(_healthcheck_middleware)
         self._app.middlewares.append(_opentracing_middleware)
         self._runner = AppRunner(self._app, access_log=self._access_log)
-        self._site_factory = lambda: TCPSite(
-            self._runner, value.bind.host, value.bind.port,
+        self._configure_site(value)
+
+    def _configure_site(self, value: http_pb2.Server) -> None:
+        self._config = value
+        # aiohttp waits for in-flight requests during site shutdown
+        if value.HasField("drain_timeout"):
+            self._shutdown_timeout = _utils.duration_to_seconds(value.drain_timeout)
+        else:
+            self._shutdown_timeout = 60.0
+        self._site_factory = partial(self._create_site, value)
+
+    def _create_site(self, value: http_pb2.Server) -> BaseSite:
+        sock = self.inherited_socket(value.bind.host, value.bind.port)
+        if sock is not None:
+            return SockSite(self._runner, sock, shutdown_timeout=self._shutdown_timeout)
+        return TCPSite(
+            self._runner,
+            value.bind.host,
+            value.bind.port,
+            shutdown_timeout=self._shutdown_timeout,
         )
 
     async def __aenter__(self) -> None:
@@ -127,4 +168,32 @@ class ServerWire(WaitMixin, Wire):
         exc_val: Optional[BaseException],
         exc_tb: Optional[TracebackType],
     ) -> None:
+        self._drain.begin()
         await self._runner.cleanup()
+        self._drain.finish()
+
+    def bound_address(self) -> Optional[Tuple[str, int]]:
+        if not self._runner.addresses:
+            return None
+        host, port, *_ = self._runner.addresses[0]
+        return host, port
+
+    async def reconfigure(self, value: http_pb2.Server) -> None:
+        assert isinstance(value, http_pb2.Server), type(value)
+        bind_changed = value.bind != self._config.bind
+        self._configure_site(value)
+        if not bind_changed:
+            # only drain timeout was changed
+            self._site._shutdown_timeout = self._shutdown_timeout
+            return
+        # application is not restarted, only the site is replaced: new site
+        # is started before the old one is closed, BaseSite.stop() is not
+        # used as it also shuts down the application
+        site = self._site
+        self._site = self._site_factory()
+        await self._site.start()
+        if site._server is not None:
+            site._server.close()
+            await site._server.wait_closed()
+        self._runner._unreg_site(site)
+        _log.info("%s restarted: %s", self.__class__.__name__, self._site.name)
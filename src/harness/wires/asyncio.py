@@ -0,0 +1,154 @@
+import io
+import math
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+from functools import lru_cache
+
+from .. import metrics_pb2
+from ..runtime._features import enable_metrics, get_meter
+
+from ._utils import duration_to_seconds
+from .base import Wire
+
+if TYPE_CHECKING:
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+
+_log = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 0.1
+
+
+@lru_cache()
+def _metrics() -> Tuple["ValueRecorder", "Counter"]:
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+    meter = get_meter()
+    lag = meter.create_metric(
+        "harness_loop_lag", "Event loop scheduling lag", "s", float, ValueRecorder,
+    )
+    slow_callbacks = meter.create_metric(
+        "harness_loop_slow_callbacks",
+        "Number of callbacks which blocked event loop longer than a threshold",
+        "1",
+        int,
+        Counter,
+    )
+    return lag, slow_callbacks
+
+
+def _callback_stack(handle: asyncio.Handle) -> str:
+    task = getattr(handle._callback, "__self__", None)  # type: ignore
+    if not isinstance(task, asyncio.Task):
+        return ""
+    # stack where task was suspended after the slow step
+    output = io.StringIO()
+    task.print_stack(file=output)
+    return output.getvalue()
+
+
+def _report_slow_callback(handle: asyncio.Handle, duration: float) -> None:
+    _, slow_callbacks = _metrics()
+    slow_callbacks.add(1, {})
+    _log.warning(
+        "Slow callback took %.3fs: %r\n%s", duration, handle, _callback_stack(handle)
+    )
+
+
+# asyncio.Handle._run is patched once for all monitors, the lowest of their
+# thresholds is used
+_thresholds: Dict[int, float] = {}
+_threshold = math.inf
+_original_run = asyncio.Handle._run
+_patched = False
+
+
+def _run(self: asyncio.Handle) -> None:
+    start = time.monotonic()
+    _original_run(self)
+    duration = time.monotonic() - start
+    if duration >= _threshold:
+        _report_slow_callback(self, duration)
+
+
+def _patch_handle(key: int, threshold: float) -> None:
+    global _threshold, _original_run, _patched
+    _thresholds[key] = threshold
+    _threshold = min(_thresholds.values())
+    if not _patched:
+        _original_run = asyncio.Handle._run
+        asyncio.Handle._run = _run  # type: ignore
+        _patched = True
+
+
+def _restore_handle(key: int) -> None:
+    global _threshold, _patched
+    if _thresholds.pop(key, None) is None:
+        return
+    _threshold = min(_thresholds.values(), default=math.inf)
+    # if Handle._run was patched again by someone else, our patch stays in the
+    # chain and only measures nothing until next monitor is started
+    if not _thresholds and asyncio.Handle._run is _run:  # type: ignore
+        asyncio.Handle._run = _original_run  # type: ignore
+        _patched = False
+
+
+class LoopMonitorWire(Wire):
+    """Measures event loop scheduling lag and reports callbacks which are
+    blocking event loop longer than a threshold. Slow callbacks are detected
+    only for the default asyncio event loop implementation. When several
+    monitors are running, the lowest of their thresholds is used.
+
+    .. wire:: harness.wires.asyncio.LoopMonitorWire
+      :type: input
+      :runtime: python
+      :config: harness.metrics.LoopMonitor
+
+    """
+
+    _interval: float
+    _threshold: float
+    _task: Optional["asyncio.Task[Any]"] = None
+
+    def configure(self, value: metrics_pb2.LoopMonitor) -> None:
+        assert isinstance(value, metrics_pb2.LoopMonitor), type(value)
+        enable_metrics()
+
+        if value.HasField("interval"):
+            self._interval = duration_to_seconds(value.interval)
+        else:
+            self._interval = DEFAULT_INTERVAL
+        if value.HasField("slow_callback_threshold"):
+            self._threshold = duration_to_seconds(value.slow_callback_threshold)
+        else:
+            self._threshold = DEFAULT_SLOW_CALLBACK_THRESHOLD
+
+    async def _measure(self) -> None:
+        lag, _ = _metrics()
+        loop = asyncio.get_event_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self._interval)
+            lag.record(max(loop.time() - start - self._interval, 0.0), {})
+
+    async def __aenter__(self) -> None:
+        _patch_handle(id(self), self._threshold)
+        self._task = asyncio.ensure_future(self._measure())
+        _log.info(
+            "%s started: interval=%.3fs; threshold=%.3fs",
+            self.__class__.__name__,
+            self._interval,
+            self._threshold,
+        )
+
+    def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        _restore_handle(id(self))
+
+    async def wait_closed(self) -> None:
+        if self._task is not None:
+            await asyncio.wait([self._task])
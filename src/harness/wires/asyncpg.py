@@ -1,8 +1,11 @@
+import asyncio
+
 from asyncpg import Connection, create_pool
 from asyncpg.pool import Pool
 from opentelemetry.trace import get_tracer, SpanKind
 
 from .. import postgres_pb2
+from ..runtime._features import enable_tracing
 from .base import Wire
 
 
@@ -40,12 +43,16 @@ class PoolWire(Wire):
     """
 
     pool: Pool
+    _max_size: int
+    _ready = False
     _connect = None
     _connect_params = None
 
     def configure(self, value: postgres_pb2.Pool):
         assert isinstance(value, postgres_pb2.Pool), type(value)
+        enable_tracing()
 
+        self._max_size = value.max_size or 10
         self.pool = create_pool(
             host=value.address.host,
             port=value.address.port,
@@ -53,14 +60,36 @@ class PoolWire(Wire):
             password=value.password,
             database=value.database,
             min_size=value.min_size,
-            max_size=value.max_size or 10,
+            max_size=self._max_size,
         )
 
         if not getattr(Connection._do_execute, "__wrapped__", False):
             Connection._do_execute = _wrap_do_execute(Connection._do_execute)
 
     async def __aenter__(self):
+        # pool establishes min_size connections during initialization
         await self.pool.__aenter__()
+        self._ready = True
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._ready = False
         await self.pool.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def warmup(self):
+        # opens connections up to max_size, so that requests won't wait for
+        # new connections during load spikes
+        tasks = [
+            asyncio.ensure_future(self.pool.acquire()) for _ in range(self._max_size)
+        ]
+        try:
+            await asyncio.wait(tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+            for task in tasks:
+                if not task.cancelled() and task.exception() is None:
+                    await self.pool.release(task.result())
+
+    async def ready(self) -> bool:
+        return self._ready
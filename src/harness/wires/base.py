@@ -1,6 +1,12 @@
+import time
+import socket
 import asyncio
+import logging
 from types import TracebackType
-from typing import Optional, Type, Any
+from typing import Optional, Type, Any, Dict, Tuple, Callable, Awaitable
+
+
+_log = logging.getLogger(__name__)
 
 
 class Wire:
@@ -25,6 +31,26 @@ class Wire:
     async def wait_closed(self) -> None:
         pass
 
+    async def warmup(self) -> None:
+        """Performs lazy initialization in advance, called after ``setup``
+        function and before output wires are started
+        """
+        pass
+
+    async def ready(self) -> bool:
+        """Reports whether wire is ready to serve requests, used by health
+        checks
+        """
+        return True
+
+    async def reconfigure(self, value: Any) -> None:
+        """Applies changed configuration to a running wire. By default wire is
+        restarted: closed, configured with a new value and started again
+        """
+        await self.__aexit__(None, None, None)
+        self.configure(value)
+        await self.__aenter__()
+
 
 class WaitMixin:
     _event: asyncio.Event
@@ -38,3 +64,89 @@ class WaitMixin:
         if not hasattr(self, "_event"):
             self._event = asyncio.Event()
         await self._event.wait()
+
+    async def reconfigure(self, value: Any) -> None:
+        await super().reconfigure(value)  # type: ignore
+        self._event = asyncio.Event()
+
+
+_inherited_sockets: Dict[Tuple[str, int], socket.socket] = {}
+
+
+def inherit_socket(host: str, port: int, sock: socket.socket) -> None:
+    _inherited_sockets[(host, port)] = sock
+
+
+class SocketMixin:
+    """Marks output wires which are able to serve on a listening socket,
+    bound by the parent process and shared between worker processes
+    """
+
+    def inherited_socket(self, host: str, port: int) -> Optional[socket.socket]:
+        """Returns a duplicate of the inherited listening socket, so the wire
+        owns it and is able to close it when restarted
+        """
+        sock = _inherited_sockets.get((host, port))
+        return sock.dup() if sock is not None else None
+
+    def bound_address(self) -> Optional[Tuple[str, int]]:
+        """Returns address of the listening socket, when wire is started"""
+        return None
+
+
+class Readiness:
+    """Registry of readiness checks, which health checks answer from.
+    Result is cached for ``ttl`` seconds and concurrent checks are coalesced
+    """
+
+    def __init__(self, *, ttl: float = 1.0, timeout: float = 1.0) -> None:
+        self._ttl = ttl
+        self._timeout = timeout
+        self._checks: Dict[str, Callable[[], Awaitable[bool]]] = {}
+        self._ready = True
+        self._checked_at: Optional[float] = None
+        self._pending: Optional["asyncio.Future[bool]"] = None
+
+    def add(self, name: str, check: Callable[[], Awaitable[bool]]) -> None:
+        self._checks[name] = check
+        self._checked_at = None
+
+    def remove(self, name: str) -> None:
+        self._checks.pop(name, None)
+        self._checked_at = None
+
+    async def _run(self, check: Callable[[], Awaitable[bool]]) -> bool:
+        try:
+            return bool(await asyncio.wait_for(check(), self._timeout))
+        except Exception:
+            return False
+
+    async def _check(self) -> bool:
+        try:
+            names = list(self._checks)
+            results = await asyncio.gather(
+                *(self._run(self._checks[name]) for name in names)
+            )
+            failed = [name for name, ok in zip(names, results) if not ok]
+            if failed:
+                _log.warning("Not ready: %s", ", ".join(failed))
+            elif not self._ready:
+                _log.info("Ready")
+            self._ready = not failed
+            self._checked_at = time.monotonic()
+            return self._ready
+        finally:
+            self._pending = None
+
+    async def check(self) -> bool:
+        if (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self._ttl
+        ):
+            return self._ready
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._check())
+        return await asyncio.shield(self._pending)
+
+
+readiness = Readiness()
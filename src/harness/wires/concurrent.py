@@ -0,0 +1,393 @@
+import time
+import asyncio
+import logging
+import importlib
+import threading
+import multiprocessing
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from typing import TYPE_CHECKING
+from functools import lru_cache, partial
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .. import concurrent_pb2
+from ..runtime._features import enable_metrics, get_meter, metrics_enabled
+
+from ._utils import duration_to_seconds
+from .base import Wire
+
+if TYPE_CHECKING:
+    from opentelemetry.metrics import Meter, Observer
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+
+_log = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+@lru_cache()
+def _metrics() -> Tuple["ValueRecorder", "Counter"]:
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+    meter = get_meter()
+    wait_time = meter.create_metric(
+        "harness_executor_wait_time",
+        "Time spent by a task in the queue, waiting for a free thread",
+        "s",
+        float,
+        ValueRecorder,
+    )
+    rejected = meter.create_metric(
+        "harness_executor_rejected",
+        "Number of tasks rejected because executor queue was full",
+        "1",
+        int,
+        Counter,
+    )
+    return wait_time, rejected
+
+
+@lru_cache()
+def _process_pool_metrics() -> Tuple["ValueRecorder", "ValueRecorder", "Counter"]:
+    from opentelemetry.sdk.metrics import Counter, ValueRecorder
+
+    meter = get_meter()
+    wait_time = meter.create_metric(
+        "harness_process_pool_wait_time",
+        "Time spent by a task in the queue, waiting for a free process",
+        "s",
+        float,
+        ValueRecorder,
+    )
+    exec_time = meter.create_metric(
+        "harness_process_pool_exec_time",
+        "Time spent by a process to execute a task",
+        "s",
+        float,
+        ValueRecorder,
+    )
+    timeouts = meter.create_metric(
+        "harness_process_pool_timeouts",
+        "Number of tasks which exceeded their timeout",
+        "1",
+        int,
+        Counter,
+    )
+    return wait_time, exec_time, timeouts
+
+
+class ExecutorQueueFull(RuntimeError):
+    """Raised by :py:meth:`ThreadPoolWire.submit` when executor queue is full"""
+
+
+async def _shutdown(executor: Executor) -> None:
+    # waiting for the running tasks in a separate thread in order to not
+    # block event loop
+    loop = asyncio.get_event_loop()
+    done = loop.create_future()
+
+    def set_done() -> None:
+        if not done.done():
+            done.set_result(None)
+
+    def shutdown() -> None:
+        try:
+            executor.shutdown(wait=True)
+        finally:
+            loop.call_soon_threadsafe(set_done)
+
+    threading.Thread(target=shutdown).start()
+    await done
+
+
+class _ThreadPoolExecutor(ThreadPoolExecutor):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        thread_name_prefix: str = "",
+        queue_size: int = 0,
+    ) -> None:
+        super().__init__(max_workers, thread_name_prefix)
+        self._queue_size = queue_size
+        self._counters_lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+
+    def _dequeue(self, future: "Future[Any]") -> None:
+        if future.cancelled():
+            with self._counters_lock:
+                self.queued -= 1
+
+    def _call(self, submitted: float, fn: Callable[..., Any], *args: Any) -> Any:
+        with self._counters_lock:
+            self.queued -= 1
+            self.active += 1
+        if metrics_enabled():
+            wait_time, _ = _metrics()
+            wait_time.record(time.monotonic() - submitted, {})
+        try:
+            return fn(*args)
+        finally:
+            with self._counters_lock:
+                self.active -= 1
+
+    def submit(  # type: ignore
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> "Future[Any]":
+        return self._submit(partial(fn, *args, **kwargs), (), bounded=False)
+
+    def submit_bounded(self, fn: Callable[..., Any], *args: Any) -> "Future[Any]":
+        return self._submit(fn, args, bounded=True)
+
+    def _submit(
+        self, fn: Callable[..., Any], args: Tuple[Any, ...], *, bounded: bool
+    ) -> "Future[Any]":
+        with self._counters_lock:
+            if bounded and self._queue_size and self.queued >= self._queue_size:
+                if metrics_enabled():
+                    _, rejected = _metrics()
+                    rejected.add(1, {})
+                raise ExecutorQueueFull("Executor queue is full")
+            self.queued += 1
+        try:
+            future = super().submit(self._call, time.monotonic(), fn, *args)
+        except BaseException:
+            with self._counters_lock:
+                self.queued -= 1
+            raise
+        future.add_done_callback(self._dequeue)
+        return future
+
+
+class ThreadPoolWire(Wire):
+    """Installs a thread pool executor as a default executor of the event
+    loop, which is used by the ``loop.run_in_executor(None, ...)`` calls.
+
+    Tasks can be also submitted using this wire to limit the queue:
+
+    .. code-block:: python
+
+      result = await wires_in.executor.submit(read_file, path)
+
+    When ``queue_size`` is set and all threads are busy, tasks submitted
+    using this wire are queued up to this limit, then
+    :py:class:`ExecutorQueueFull` is raised instead of growing the queue
+    indefinitely. Other tasks, e.g. ``loop.run_in_executor(None, ...)`` and
+    ``loop.getaddrinfo(...)`` calls, are not limited, but are counted in the
+    queue.
+
+    .. wire:: harness.wires.concurrent.ThreadPoolWire
+      :type: input
+      :runtime: python
+      :config: harness.concurrent.ThreadPool
+
+    """
+
+    _executor: Optional[_ThreadPoolExecutor] = None
+    _meter: Optional["Meter"] = None
+    _observers: List["Observer"]
+
+    def configure(self, value: concurrent_pb2.ThreadPool) -> None:
+        assert isinstance(value, concurrent_pb2.ThreadPool), type(value)
+        enable_metrics()
+
+        self._executor = _ThreadPoolExecutor(
+            max_workers=value.max_workers or None,
+            thread_name_prefix=value.thread_name_prefix,
+            queue_size=value.queue_size,
+        )
+        self._observers = []
+
+    def _register_observers(self) -> None:
+        from opentelemetry.sdk.metrics import ValueObserver
+
+        assert self._executor is not None
+        executor = self._executor
+        self._meter = meter = get_meter()
+        self._observers = [
+            meter.register_observer(
+                lambda observer: observer.observe(executor.queued, {}),
+                "harness_executor_queue_depth",
+                "Number of tasks waiting for a free thread",
+                "1",
+                int,
+                ValueObserver,
+            ),
+            meter.register_observer(
+                lambda observer: observer.observe(executor.active, {}),
+                "harness_executor_active_threads",
+                "Number of threads executing tasks",
+                "1",
+                int,
+                ValueObserver,
+            ),
+        ]
+
+    async def __aenter__(self) -> None:
+        assert self._executor is not None
+        asyncio.get_event_loop().set_default_executor(self._executor)
+        self._register_observers()
+        _log.info(
+            "%s started: max_workers=%d",
+            self.__class__.__name__,
+            self._executor._max_workers,  # type: ignore
+        )
+
+    async def submit(self, fn: Callable[..., _T], *args: Any) -> _T:
+        """Executes ``fn(*args)`` in a thread, raises
+        :py:class:`ExecutorQueueFull` when executor queue is full
+        """
+        assert self._executor is not None, "Wire is not started"
+        future = self._executor.submit_bounded(fn, *args)
+        result: _T = await asyncio.wrap_future(future)
+        return result
+
+    def close(self) -> None:
+        if self._meter is not None:
+            for observer in self._observers:
+                self._meter.unregister_observer(observer)  # type: ignore
+            self._meter, self._observers = None, []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def wait_closed(self) -> None:
+        if self._executor is not None:
+            await _shutdown(self._executor)
+
+
+def _preload(modules: Sequence[str]) -> None:
+    for module in modules:
+        importlib.import_module(module)
+
+
+def _noop() -> None:
+    pass
+
+
+def _execute(
+    submitted: float, fn: Callable[..., _T], args: Tuple[Any, ...]
+) -> Tuple[float, float, _T]:
+    # wall-clock time is used because monotonic clocks are not comparable
+    # between processes
+    started = time.time()
+    result = fn(*args)
+    return started - submitted, time.time() - started, result
+
+
+class ProcessPoolWire(Wire):
+    """Manages a pool of processes to offload CPU-bound work from the event
+    loop. Functions and their arguments should be picklable:
+
+    .. code-block:: python
+
+      result = await wires_in.pool.submit(transform, payload)
+
+    Workers import modules listed in the ``preload`` option when they are
+    started. With ``max_tasks_per_worker`` option the whole pool is replaced
+    after executing ``max_tasks_per_worker * max_workers`` tasks, old pool
+    finishes its tasks in background. When task exceeds its timeout,
+    ``asyncio.TimeoutError`` is raised, but already running task is not
+    interrupted.
+
+    .. wire:: harness.wires.concurrent.ProcessPoolWire
+      :type: input
+      :runtime: python
+      :config: harness.concurrent.ProcessPool
+
+    """
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_kwargs: Dict[str, Any]
+    _timeout: Optional[float]
+    _recycle_after: int
+    _submitted = 0
+    _retired: List["asyncio.Future[None]"]
+
+    def configure(self, value: concurrent_pb2.ProcessPool) -> None:
+        assert isinstance(value, concurrent_pb2.ProcessPool), type(value)
+        enable_metrics()
+
+        start_method = value.StartMethod.Name(value.start_method).lower()
+        context = multiprocessing.get_context(start_method)
+        if start_method == "forkserver" and value.preload:
+            context.set_forkserver_preload(list(value.preload))  # type: ignore
+
+        self._max_workers = value.max_workers or multiprocessing.cpu_count()
+        self._executor_kwargs = dict(
+            max_workers=self._max_workers,
+            mp_context=context,
+            initializer=_preload,
+            initargs=(tuple(value.preload),),
+        )
+        self._recycle_after = value.max_tasks_per_worker * self._max_workers
+
+        if value.HasField("timeout"):
+            self._timeout = duration_to_seconds(value.timeout)
+        else:
+            self._timeout = None
+
+    def _replace_executor(self) -> None:
+        old_executor = self._executor
+        self._executor = ProcessPoolExecutor(**self._executor_kwargs)
+        self._submitted = 0
+        if old_executor is not None:
+            self._retired = [f for f in self._retired if not f.done()]
+            self._retired.append(asyncio.ensure_future(_shutdown(old_executor)))
+
+    async def __aenter__(self) -> None:
+        self._executor = ProcessPoolExecutor(**self._executor_kwargs)
+        self._retired = []
+        _log.info(
+            "%s started: max_workers=%d", self.__class__.__name__, self._max_workers
+        )
+
+    async def warmup(self) -> None:
+        # task timeout is not applied to the processes startup
+        assert self._executor is not None
+        executor = self._executor
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(executor, _noop) for _ in range(self._max_workers))
+        )
+
+    async def submit(
+        self, fn: Callable[..., _T], *args: Any, timeout: Optional[float] = None,
+    ) -> _T:
+        """Executes ``fn(*args)`` in a worker process, ``timeout`` overrides
+        timeout from the configuration
+        """
+        assert self._executor is not None, "Wire is not started"
+        if self._recycle_after and self._submitted >= self._recycle_after:
+            self._replace_executor()
+        self._submitted += 1
+        executor = self._executor
+        loop = asyncio.get_event_loop()
+        future = loop.run_in_executor(executor, _execute, time.time(), fn, args)
+        timeout = self._timeout if timeout is None else timeout
+        try:
+            wait_time, exec_time, result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            if metrics_enabled():
+                _, _, timeouts = _process_pool_metrics()
+                timeouts.add(1, {})
+            raise
+        except BrokenProcessPool:
+            if self._executor is executor:
+                _log.error("Process pool is broken, creating a new one")
+                self._replace_executor()
+            raise
+        if metrics_enabled():
+            wait_time_metric, exec_time_metric, _ = _process_pool_metrics()
+            wait_time_metric.record(wait_time, {})
+            exec_time_metric.record(exec_time, {})
+        return result
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def wait_closed(self) -> None:
+        if self._executor is not None:
+            await asyncio.gather(_shutdown(self._executor), *self._retired)
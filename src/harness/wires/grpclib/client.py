@@ -7,6 +7,7 @@ from grpclib.client import Channel
 from grpclib.events import listen, SendRequest, RecvTrailingMetadata
 
 from harness import grpc_pb2
+from harness.runtime._features import enable_tracing
 from harness.wires.base import Wire
 
 
@@ -45,10 +46,18 @@ class ChannelWire(Wire):
 
     def configure(self, value: grpc_pb2.Channel):
         assert isinstance(value, grpc_pb2.Channel), type(value)
+        enable_tracing()
 
         self.channel = Channel(value.address.host, value.address.port)
         listen(self.channel, SendRequest, _send_request)
         listen(self.channel, RecvTrailingMetadata, _recv_trailing_metadata)
 
+    async def warmup(self):
+        await self.channel.__connect__()
+
+    async def ready(self) -> bool:
+        await self.channel.__connect__()
+        return True
+
     def close(self):
         self.channel.close()
@@ -1,21 +1,32 @@
+import time
+import asyncio
 import logging
-from typing import TYPE_CHECKING, List, Any
+from typing import TYPE_CHECKING, List, Any, Optional, Tuple
+from functools import lru_cache
 from contextvars import ContextVar
 
-from opentelemetry.trace import get_tracer, SpanKind
+from opentelemetry.trace import get_tracer, get_current_span, SpanKind
 from opentelemetry.context import attach
 from opentelemetry.propagators import extract
 
+from grpclib.const import Status
 from grpclib.server import Server
-from grpclib.events import listen, RecvRequest, SendTrailingMetadata
-from grpclib.health.service import Health
+from grpclib.exceptions import GRPCError
+from grpclib.events import listen, RecvRequest, RecvMessage, SendTrailingMetadata
+from grpclib.health.check import ServiceCheck
+from grpclib.health.service import Health, OVERALL
 from grpclib.reflection.service import ServerReflection
 
 from ... import grpc_pb2
-from ..base import Wire
+from ...runtime._features import enable_metrics, enable_tracing, get_meter
+from ...runtime._validate import compile_validators, has_rules, validate
+from ...runtime._validate import ValidationError
+from .. import _utils
+from ..base import Wire, SocketMixin, readiness
 
 if TYPE_CHECKING:
     from typing_extensions import Protocol
+    from opentelemetry.sdk.metrics import ValueRecorder
 
     class _Servable(Protocol):
         def __mapping__(self) -> Any:
@@ -30,9 +41,25 @@ def _metadata_getter(metadata, header_name: str) -> List[str]:
 
 
 _server_span_ctx = ContextVar("server_span_ctx")
+_method_name = ContextVar("method_name")
+
+
+@lru_cache()
+def _validation_time() -> "ValueRecorder":
+    from opentelemetry.sdk.metrics import ValueRecorder
+
+    return get_meter().create_metric(
+        "harness_grpc_validation_time",
+        "Time spent validating request messages",
+        "s",
+        float,
+        ValueRecorder,
+        ("method",),
+    )
 
 
 async def _recv_request(event: RecvRequest) -> None:
+    _method_name.set(event.method_name)
     tracer = get_tracer(__name__)
     attach(extract(_metadata_getter, event.metadata))
     span_ctx = tracer.start_as_current_span(
@@ -48,8 +75,29 @@ async def _send_trailing_metadata(event: SendTrailingMetadata) -> None:
     _server_span_ctx.get().__exit__(None, None, None)
 
 
-class ServerWire(Wire):
-    """
+async def _validate_request(event: RecvMessage) -> None:
+    message = event.message
+    if not has_rules(message.DESCRIPTOR):
+        return
+    start = time.perf_counter()
+    error = None
+    try:
+        validate(message)
+    except ValidationError as exc:
+        error = str(exc)
+    duration = time.perf_counter() - start
+    _validation_time().record(duration, {"method": _method_name.get()})
+    get_current_span().add_event(
+        "validation", {"duration": duration, "valid": error is None}
+    )
+    if error is not None:
+        raise GRPCError(Status.INVALID_ARGUMENT, error)
+
+
+class ServerWire(SocketMixin, Wire):
+    """With ``validate_requests`` option every received request message is
+    validated before it is returned to the handler. Messages without
+    validation rules are not validated.
 
     .. wire:: harness.wires.grpclib.server.ServerWire
       :type: output
@@ -62,6 +110,7 @@ class ServerWire(Wire):
     """
 
     _config: grpc_pb2.Server
+    _drain: _utils.Drain
     server: Server
 
     def __init__(self, handlers: List["_Servable"]):
@@ -69,19 +118,51 @@ class ServerWire(Wire):
 
     def configure(self, value: grpc_pb2.Server):
         assert isinstance(value, grpc_pb2.Server), type(value)
+        enable_tracing()
+        enable_metrics()
         self._config = value
+        self._drain = _utils.Drain(self.__class__.__name__)
 
         handlers = list(self.handlers)
         if not any(isinstance(h, Health) for h in handlers):
-            handlers.append(Health())
+            handlers.append(Health({OVERALL: [ServiceCheck(readiness.check)]}))
         handlers = ServerReflection.extend(handlers)
 
         self.server = Server(handlers)
         listen(self.server, RecvRequest, _recv_request)
         listen(self.server, SendTrailingMetadata, _send_trailing_metadata)
+        listen(self.server, RecvRequest, self._track_request)
+        if value.validate_requests:
+            listen(self.server, RecvMessage, _validate_request)
+
+    async def _track_request(self, event: RecvRequest) -> None:
+        if self._drain.closing:
+            raise GRPCError(Status.UNAVAILABLE, "Server is shutting down")
+        task = asyncio.current_task()
+        assert task is not None
+        self._drain.track_task(task)
+
+    async def warmup(self):
+        for handler in self.handlers:
+            for method in handler.__mapping__().values():
+                compile_validators(method.request_type)
+                compile_validators(method.reply_type)
+
+    async def ready(self) -> bool:
+        return not self._drain.closing
+
+    def _drain_timeout(self) -> Optional[float]:
+        if self._config.HasField("drain_timeout"):
+            return _utils.duration_to_seconds(self._config.drain_timeout)
+        return None
 
     async def __aenter__(self):
-        await self.server.start(self._config.bind.host, self._config.bind.port)
+        host, port = self._config.bind.host, self._config.bind.port
+        sock = self.inherited_socket(host, port)
+        if sock is not None:
+            await self.server.start(sock=sock)
+        else:
+            await self.server.start(host, port)
         _log.info(
             "%s started: addr=%s:%d",
             self.__class__.__name__,
@@ -89,8 +170,25 @@ class ServerWire(Wire):
             self._config.bind.port,
         )
 
+    def bound_address(self) -> Optional[Tuple[str, int]]:
+        # grpclib doesn't expose listening sockets
+        server = self.server._server
+        if server is None or not server.sockets:
+            return None
+        host, port, *_ = server.sockets[0].getsockname()
+        return host, port
+
     def close(self):
-        self.server.close()
+        # listening socket is closed and new requests on the existing
+        # connections are rejected, in-flight requests are cancelled after
+        # drain timeout
+        self._drain.begin()
+        server = self.server._server
+        if server is not None:
+            server.close()
 
     async def wait_closed(self):
+        await self._drain.wait(self._drain_timeout())
+        self.server.close()
         await self.server.wait_closed()
+        self._drain.finish()
@@ -6,11 +6,16 @@ from opentelemetry.ext.jaeger import JaegerSpanExporter
 from opentelemetry.sdk.trace.export import BatchExportSpanProcessor
 
 from .... import tracing_pb2
+from ....runtime._features import enable_tracing
 from ...base import Wire
 
 
 _log = logging.getLogger(__name__)
 
+# tracer provider is set up on import, entrypoint imports wires before the
+# service module, so its module-level tracers are not no-ops
+enable_tracing()
+
 
 class JaegerSpanExporterWire(Wire):
     """
@@ -2,16 +2,20 @@ import logging
 
 from prometheus_client import start_http_server
 
-from opentelemetry import metrics
 from opentelemetry.ext.prometheus import PrometheusMetricsExporter
 from opentelemetry.sdk.metrics.export.controller import PushController
 
 from .... import metrics_pb2
+from ....runtime._features import enable_metrics, get_meter
 from ...base import Wire, WaitMixin
 
 
 _log = logging.getLogger(__name__)
 
+# meter provider is set up on import, entrypoint imports wires before the
+# service module, so its module-level meters are not no-ops
+enable_metrics()
+
 
 class PrometheusMetricsExporterWire(WaitMixin, Wire):
     """
@@ -31,11 +35,12 @@ class PrometheusMetricsExporterWire(WaitMixin, Wire):
         assert isinstance(value, metrics_pb2.Prometheus), type(value)
         self._config = value
 
-    async def __aenter__(self):
-        meter = metrics.get_meter(__name__)
+    def _start_controller(self):
         exporter = PrometheusMetricsExporter(self._config.prefix)
-        self._controller = PushController(meter, exporter, 5)
+        self._controller = PushController(get_meter(), exporter, 5)
 
+    async def __aenter__(self):
+        self._start_controller()
         start_http_server(self._config.bind.port, self._config.bind.host)
         _log.info(
             "%s started: addr=%s:%d",
@@ -48,3 +53,14 @@ class PrometheusMetricsExporterWire(WaitMixin, Wire):
         super().close()
         if not self._controller.finished.is_set():
             self._controller.shutdown()
+
+    async def reconfigure(self, value: metrics_pb2.Prometheus):
+        assert isinstance(value, metrics_pb2.Prometheus), type(value)
+        if value.bind != self._config.bind:
+            # there is no way to stop HTTP server of the prometheus_client
+            _log.warning(
+                "%s can't change bind address without restart", self.__class__.__name__,
+            )
+        self._controller.shutdown()
+        self._config = value
+        self._start_controller()
@@ -1,12 +1,15 @@
+import asyncio
 import logging
+from typing import Optional, Tuple
 
 from uvicorn import Config, Server
 from opentelemetry.ext.asgi import OpenTelemetryMiddleware
 
 from .. import http_pb2
+from ..runtime._features import enable_metrics, enable_tracing
 
 from . import _utils
-from .base import Wire
+from .base import Wire, SocketMixin, readiness
 
 
 _log = logging.getLogger(__name__)
@@ -14,14 +17,18 @@ _log = logging.getLogger(__name__)
 
 def _healthcheck_middleware(app):
     async def ok(scope, receive, send):
+        if await readiness.check():
+            status, body = 200, b"OK"
+        else:
+            status, body = 503, b"Not ready"
         await send(
             {
                 "type": "http.response.start",
-                "status": 200,
+                "status": status,
                 "headers": [[b"content-type", b"text/plain"]],
             }
         )
-        await send({"type": "http.response.body", "body": b"OK"})
+        await send({"type": "http.response.body", "body": body})
 
     async def middleware(scope, receive, send):
         if scope["type"] == "http" and scope["path"] == "/_/health":
@@ -40,7 +47,18 @@ def _healthcheck_middleware(app):
     return middleware
 
 
-class ServerWire(Wire):
+def _drain_middleware(app, drain: _utils.Drain):
+    async def middleware(scope, receive, send):
+        if scope["type"] == "http":
+            with drain.track():
+                await app(scope, receive, send)
+        else:
+            await app(scope, receive, send)
+
+    return middleware
+
+
+class ServerWire(SocketMixin, Wire):
     """
 
     .. wire:: harness.wires.uvicorn.ServerWire
@@ -53,6 +71,8 @@ class ServerWire(Wire):
 
     """
 
+    _config: http_pb2.Server
+    _drain: _utils.Drain
     server: Server
 
     def __init__(self, app):
@@ -60,7 +80,12 @@ class ServerWire(Wire):
 
     def configure(self, value: http_pb2.Server):
         assert isinstance(value, http_pb2.Server), type(value)
+        enable_tracing()
+        enable_metrics()
+        self._config = value
+        self._drain = _utils.Drain(self.__class__.__name__)
         app = _healthcheck_middleware(self._app)
+        app = _drain_middleware(app, self._drain)
         app = OpenTelemetryMiddleware(app)
         config = Config(
             app, value.bind.host, value.bind.port, log_config=None, access_log=False,
@@ -72,14 +97,31 @@ class ServerWire(Wire):
         config = self.server.config
         config.load()
         self.server.lifespan = config.lifespan_class(config)
-        await self.server.startup()
+        sock = self.inherited_socket(config.host, config.port)
+        await self.server.startup(sockets=[sock] if sock is not None else None)
         _log.info(
             "%s started: addr=%s:%d", self.__class__.__name__, config.host, config.port,
         )
 
+    def bound_address(self) -> Optional[Tuple[str, int]]:
+        for server in self.server.servers:
+            for sock in server.sockets:
+                host, port, *_ = sock.getsockname()
+                return host, port
+        return None
+
     def close(self) -> None:
         self.server.should_exit = True
 
     async def wait_closed(self) -> None:
         await self.server.main_loop()
-        await self.server.shutdown()
+        self._drain.begin()
+        shutdown = asyncio.ensure_future(self.server.shutdown())
+        if self._config.HasField("drain_timeout"):
+            timeout = _utils.duration_to_seconds(self._config.drain_timeout)
+            await asyncio.wait({shutdown}, timeout=timeout)
+            # uvicorn waits for in-flight requests without a deadline
+            for task in self.server.server_state.tasks:
+                task.cancel()
+        await shutdown
+        self._drain.finish()
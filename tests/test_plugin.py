@@ -1,9 +1,11 @@
 from textwrap import dedent
 
 import pytest
+from google.protobuf.message_factory import GetMessages
 from google.protobuf.compiler.plugin_pb2 import CodeGeneratorRequest
 
 from harness.plugin.main import process, ConfigurationError
+from harness.runtime._validate import ValidationError
 
 
 @pytest.fixture()
@@ -115,3 +117,42 @@ def test_python_required_input(python_request):
     """
     )
     assert expected in response.file[0].content
+
+
+def test_python_validators(python_request, message_proto, package):
+    """
+    message Configuration {
+        message Inner {
+            map<string, string> labels = 1;
+            string name = 2 [(validate.rules).string.in = "valid"];
+        }
+        Inner inner = 1 [(validate.rules).message.required = true];
+    }
+    """
+    response = process(python_request)
+    (validators,) = [f for f in response.file if f.name.endswith("_validate.py")]
+
+    namespace = {}
+    exec(validators.content, namespace)
+    assert set(namespace["VALIDATORS"]) == {
+        f"{package}.Configuration",
+        f"{package}.Configuration.Inner",
+    }
+
+    config_type = GetMessages(message_proto.file)[f"{package}.Configuration"]
+    validate_config = namespace["VALIDATORS"][f"{package}.Configuration"]
+    with pytest.raises(ValidationError, match="inner is required"):
+        validate_config(config_type())
+    with pytest.raises(ValidationError, match="name not in"):
+        validate_config(config_type(inner=dict(name="invalid")))
+    validate_config(config_type(inner=dict(name="valid")))
+
+    validate_many = namespace["BATCH_VALIDATORS"][f"{package}.Configuration"]
+    errors = {}
+    validate_many([config_type(), config_type(inner=dict(name="valid"))], errors)
+    assert list(errors) == [0]
+
+    collect_config = namespace["COLLECTORS"][f"{package}.Configuration"]
+    violations = []
+    collect_config(config_type(inner=dict(name="invalid")), violations, "")
+    assert [(v.path, v.rule) for v in violations] == [("inner.name", "string.in")]
@@ -0,0 +1,35 @@
+from harness.cli.profile import parse_import_time, _import_events
+
+
+IMPORT_TIME = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     _codecs
+import time:       200 |        300 |   codecs
+import time:        50 |         50 |   abc
+import time:       400 |        750 | encodings
+import time:        10 |         10 | site
+"""
+
+
+def test_parse_import_time():
+    encodings, site = parse_import_time(IMPORT_TIME.splitlines())
+    assert (encodings.name, encodings.self_us, encodings.cumulative_us) == (
+        "encodings",
+        400,
+        750,
+    )
+    codecs, abc = encodings.children
+    assert codecs.name == "codecs"
+    assert [i.name for i in codecs.children] == ["_codecs"]
+    assert abc.name == "abc"
+    assert site.name == "site"
+    assert site.children == ()
+
+    events = {e["name"]: (e["ts"], e["dur"]) for e in _import_events([encodings, site])}
+    assert events == {
+        "encodings": (0, 750),
+        "codecs": (0, 300),
+        "_codecs": (0, 100),
+        "abc": (300, 50),
+        "site": (750, 10),
+    }
@@ -1,3 +1,11 @@
+import gc
+import os
+import time
+import sys
+import signal
+import socket
+import subprocess
+import asyncio
 import tempfile
 from typing import Optional
 from dataclasses import dataclass
@@ -5,8 +13,10 @@ from unittest.mock import Mock
 
 import pytest
 
-from harness.runtime import Runner, ValidationError
-from harness.wires.base import Wire
+from harness.runtime import Runner, ValidationError, add_warmup
+from harness.runtime._utils import snapshot_key
+from harness.runtime._workers import run_workers
+from harness.wires.base import Wire, WaitMixin, SocketMixin, Readiness, readiness
 
 
 async def awaitable(value):
@@ -131,3 +141,755 @@ def test_required_wire(config_type, empty_type, config_empty):
             setup.assert_called_once_with(
                 config_type(db=empty_type()), WiresIn(db=expected_db),
             )
+
+
+def test_concurrent_start(config_type, empty_type):
+    """
+    import "google/protobuf/empty.proto";
+
+    message Configuration {
+        google.protobuf.Empty db = 1;
+        google.protobuf.Empty cache = 2;
+        google.protobuf.Empty queue = 3;
+    }
+    """
+    events = []
+
+    class SlowWire(Wire):
+        delay = 0.01
+
+        async def __aenter__(self):
+            events.append(("enter", type(self).__name__))
+            await asyncio.sleep(self.delay)
+            events.append(("entered", type(self).__name__))
+
+        def close(self):
+            events.append(("close", type(self).__name__))
+
+    class DBWire(SlowWire):
+        delay = 10
+
+    class CacheWire(SlowWire):
+        pass
+
+    class QueueWire(SlowWire):
+        delay = 0.02
+
+        async def __aenter__(self):
+            events.append(("enter", type(self).__name__))
+            await asyncio.sleep(self.delay)
+            raise ConnectionError("Connection refused")
+
+    @dataclass
+    class WiresIn:
+        db: DBWire
+        cache: CacheWire
+        queue: QueueWire
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+
+    setup = Mock()
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+        config_yaml.write(b"db: {}\ncache: {}\nqueue: {}\n")
+        config_yaml.flush()
+        start = time.monotonic()
+        with pytest.raises(ConnectionError, match="Connection refused"):
+            runner.run(setup, ["test", config_yaml.name, "--concurrent-start"])
+        # slow wire is cancelled after the first failure
+        assert time.monotonic() - start < 5
+
+    # wires are entered concurrently, before any of them is started
+    assert events == [
+        ("enter", "DBWire"),
+        ("enter", "CacheWire"),
+        ("enter", "QueueWire"),
+        ("entered", "CacheWire"),
+        ("close", "CacheWire"),
+    ]
+    assert not setup.called
+
+
+def test_workers(config_type):
+    """
+    message Configuration {}
+    """
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+
+    with tempfile.NamedTemporaryFile() as output:
+
+        async def setup(config, wires_in):
+            with open(output.name, "a") as f:
+                f.write(f"{os.getpid()}\n")
+            return WiresOut()
+
+        with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+            assert runner.run(setup, ["test", config_yaml.name, "--workers=3"]) == 0
+
+        pids = set(output.read().decode().split())
+    assert len(pids) == 3
+    assert str(os.getpid()) not in pids
+
+
+def test_workers_restart(monkeypatch):
+    monkeypatch.setattr("harness.runtime._workers.RESTART_DELAY", 0.01)
+
+    with tempfile.NamedTemporaryFile() as output, tempfile.NamedTemporaryFile() as log:
+
+        def target():
+            with open(output.name, "a") as f:
+                f.write(f"{os.getpid()}\n")
+            with open(output.name) as f:
+                if len(f.read().split()) == 1:
+                    # block-buffered, like stdout redirected to a pipe
+                    sys.stdout = open(log.name, "w")
+                    print("worker failed")
+                    return 1
+            return 0
+
+        assert run_workers(target, 1) == 0
+        pids = output.read().decode().split()
+        # failed worker is restarted, its output is not lost
+        assert len(set(pids)) == 2
+        assert log.read() == b"worker failed\n"
+
+
+def test_workers_reload(config_type, monkeypatch):
+    """
+    message Configuration {
+        string name = 1;
+    }
+    """
+    monkeypatch.setattr("harness.runtime._workers.RESTART_DELAY", 0.01)
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+
+    with tempfile.NamedTemporaryFile() as output, tempfile.NamedTemporaryFile(
+        suffix=".yaml"
+    ) as config_yaml:
+
+        async def setup(config, wires_in):
+            with open(output.name, "a") as f:
+                f.write(f"{config.name}\n")
+            if config.name == "initial":
+                with open(config_yaml.name, "w") as f:
+                    f.write("{name: changed}")
+                # parent forwards SIGHUP to the worker
+                os.kill(os.getppid(), signal.SIGHUP)
+                await asyncio.sleep(0.1)
+                with open(output.name, "a") as f:
+                    f.write("alive\n")
+                sys.exit(1)
+            return WiresOut()
+
+        config_yaml.write(b"{name: initial}")
+        config_yaml.flush()
+        assert runner.run(setup, ["test", config_yaml.name, "--workers=2"]) == 0
+
+        # workers survived SIGHUP and were restarted with reloaded configuration
+        lines = output.read().decode().split()
+        assert sorted(lines) == sorted(["initial", "alive", "changed"] * 2)
+
+
+def test_timings(config_type, empty_type, caplog):
+    """
+    import "google/protobuf/empty.proto";
+
+    message Configuration {
+        google.protobuf.Empty db = 1;
+        google.protobuf.Empty server = 2;
+    }
+    """
+
+    class ServerWire(WaitMixin, Wire):
+        async def __aenter__(self):
+            self.close()
+
+    @dataclass
+    class WiresIn:
+        db: Wire
+
+    @dataclass
+    class WiresOut:
+        server: ServerWire
+
+    async def setup(config, wires_in):
+        return WiresOut(server=ServerWire())
+
+    caplog.set_level("INFO")
+    runner = Runner(config_type, WiresIn, WiresOut)
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+        config_yaml.write(b"{db: {}, server: {}}")
+        config_yaml.flush()
+        assert runner.run(setup, ["test", config_yaml.name]) == 0
+
+    started, stopped = [
+        r.getMessage()
+        for r in caplog.records
+        if r.getMessage().startswith(("Started in", "Stopped in"))
+    ]
+    stages = [part.split("=")[0] for part in started.split(": ")[1].split()]
+    assert stages == [
+        "config.read",
+        "config.load",
+        "config.parse",
+        "config.validate",
+        "db.configure",
+        "db.enter",
+        "main.call",
+        "server.configure",
+        "server.enter",
+    ]
+    stages = [part.split("=")[0] for part in stopped.split(": ")[1].split()]
+    assert stages == ["server.exit", "db.exit"]
+
+
+def test_gc(config_type, empty_type, monkeypatch):
+    """
+    import "google/protobuf/empty.proto";
+
+    message Configuration {
+        google.protobuf.Empty server = 1;
+    }
+    """
+    threshold = gc.get_threshold()
+    stats = []
+
+    class ServerWire(WaitMixin, Wire):
+        async def __aenter__(self):
+            self.close()
+
+        async def wait_closed(self):
+            stats.append((gc.get_threshold(), gc.get_freeze_count()))
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        server: ServerWire
+
+    async def setup(config, wires_in):
+        return WiresOut(server=ServerWire())
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+        config_yaml.write(b"{server: {}}")
+        config_yaml.flush()
+        try:
+            argv = ["test", config_yaml.name, "--gc-freeze", "--gc-threshold=5000,20"]
+            assert runner.run(setup, argv) == 0
+        finally:
+            gc.unfreeze()
+            gc.set_threshold(*threshold)
+
+    gc_threshold, freeze_count = stats[0]
+    assert gc_threshold == (5000, 20, threshold[2])
+    assert freeze_count > 0
+
+
+def test_gc_monitor(config_type):
+    """
+    message Configuration {}
+    """
+    from harness.runtime._features import enable_metrics
+    from harness.runtime._gc import _gc_callback
+
+    enable_metrics()
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    async def setup(config, wires_in):
+        return WiresOut()
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+        # disabled by default
+        assert runner.run(setup, ["test", config_yaml.name]) == 0
+        assert _gc_callback not in gc.callbacks
+        try:
+            assert runner.run(setup, ["test", config_yaml.name, "--gc-monitor"]) == 0
+            assert _gc_callback in gc.callbacks
+        finally:
+            if _gc_callback in gc.callbacks:
+                gc.callbacks.remove(_gc_callback)
+
+
+def test_warmup(config_type, empty_type, caplog):
+    """
+    import "google/protobuf/empty.proto";
+
+    message Configuration {
+        google.protobuf.Empty db = 1;
+        google.protobuf.Empty server = 2;
+    }
+    """
+    calls = []
+
+    class DBWire(Wire):
+        async def warmup(self):
+            calls.append("db.warmup")
+
+    class ServerWire(WaitMixin, Wire):
+        async def __aenter__(self):
+            calls.append("server.enter")
+            self.close()
+
+    @dataclass
+    class WiresIn:
+        db: DBWire
+
+    @dataclass
+    class WiresOut:
+        server: ServerWire
+
+    async def hook():
+        calls.append("hook")
+
+    async def slow_hook():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            calls.append("slow_hook.cancelled")
+            raise
+
+    async def setup(config, wires_in):
+        add_warmup(hook)
+        add_warmup(slow_hook)
+        return WiresOut(server=ServerWire())
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+        config_yaml.write(b"{db: {}, server: {}}")
+        config_yaml.flush()
+        argv = ["test", config_yaml.name, "--warmup-timeout=0.1"]
+        assert runner.run(setup, argv) == 0
+    assert calls == ["db.warmup", "hook", "slow_hook.cancelled", "server.enter"]
+    assert "Warmup timeout exceeded: test_warmup.<locals>.slow_hook" in caplog.text
+
+    with pytest.raises(RuntimeError):
+        add_warmup(hook)
+
+
+def test_readiness(config_type, empty_type):
+    """
+    import "google/protobuf/empty.proto";
+
+    message Configuration {
+        google.protobuf.Empty db = 1;
+        google.protobuf.Empty server = 2;
+    }
+    """
+    checks = []
+
+    class DBWire(Wire):
+        async def ready(self):
+            checks.append("db")
+            return False
+
+    class ServerWire(WaitMixin, Wire):
+        async def __aenter__(self):
+            checks.append(await readiness.check())
+            checks.append(await readiness.check())
+            self.close()
+
+    @dataclass
+    class WiresIn:
+        db: DBWire
+
+    @dataclass
+    class WiresOut:
+        server: ServerWire
+
+    async def setup(config, wires_in):
+        return WiresOut(server=ServerWire())
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+        config_yaml.write(b"{db: {}, server: {}}")
+        config_yaml.flush()
+        assert runner.run(setup, ["test", config_yaml.name]) == 0
+    # second check is answered from cache
+    assert checks == ["db", False, False]
+
+
+def test_readiness_coalesce():
+    calls = []
+
+    async def check():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return True
+
+    async def main():
+        registry = Readiness(ttl=10)
+        registry.add("a", check)
+        assert await asyncio.gather(registry.check(), registry.check()) == [
+            True,
+            True,
+        ]
+        assert len(calls) == 1
+        registry.add("b", check)
+        assert await registry.check()
+        assert len(calls) == 3
+
+    asyncio.run(main())
+
+
+def test_reload(config_type, message_types, caplog):
+    """
+    import "google/protobuf/wrappers.proto";
+
+    message Configuration {
+        google.protobuf.StringValue db = 1;
+        google.protobuf.StringValue server = 2;
+        google.protobuf.StringValue cache = 3;
+        string name = 4;
+    }
+    """
+    string_value_type = message_types["google.protobuf.StringValue"]
+    calls = []
+
+    class ValueWire(Wire):
+        def configure(self, value):
+            assert isinstance(value, string_value_type), type(value)
+            calls.append(("configure", value.value))
+
+        async def reconfigure(self, value):
+            calls.append(("reconfigure", value.value))
+            await super().reconfigure(value)
+
+    class ServerWire(WaitMixin, ValueWire):
+        pass
+
+    @dataclass
+    class WiresIn:
+        db: ValueWire
+        cache: Optional[ValueWire]
+
+    @dataclass
+    class WiresOut:
+        server: ServerWire
+
+    names = []
+
+    with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+
+        async def control(config, wires_out):
+            await asyncio.sleep(0.1)
+            with open(config_yaml.name, "w") as f:
+                f.write("{db: a, server: b2, cache: c, name: changed}")
+            os.kill(os.getpid(), signal.SIGHUP)
+            while ("reconfigure", "b2") not in calls:
+                await asyncio.sleep(0.01)
+            names.append(config.name)
+            wires_out.server.close()
+
+        async def setup(config, wires_in):
+            wires_out = WiresOut(server=ServerWire())
+            asyncio.ensure_future(control(config, wires_out))
+            return wires_out
+
+        config_yaml.write(b"{db: a, server: b1, name: initial}")
+        config_yaml.flush()
+        runner = Runner(config_type, WiresIn, WiresOut)
+        assert runner.run(setup, ["test", config_yaml.name]) == 0
+
+    assert calls == [
+        ("configure", "a"),
+        ("configure", "b1"),
+        ("reconfigure", "b2"),
+        ("configure", "b2"),
+    ]
+    assert names == ["changed"]
+    assert "Wire cache can't be added or removed without restart" in caplog.text
+
+
+def test_snapshot(config_type, monkeypatch):
+    """
+    message Configuration {
+        string name = 1;
+    }
+    """
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    names = []
+
+    async def setup(config, wires_in):
+        names.append(config.name)
+        return WiresOut()
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+    with tempfile.TemporaryDirectory() as snapshot_dir, tempfile.NamedTemporaryFile(
+        suffix=".yaml"
+    ) as config_yaml:
+        config_yaml.write(b"name: test")
+        config_yaml.flush()
+        argv = ["test", config_yaml.name, f"--snapshot-dir={snapshot_dir}"]
+        assert runner.run(setup, argv) == 0
+        assert len(os.listdir(snapshot_dir)) == 1
+
+        load_config = Mock(side_effect=AssertionError("config loaded"))
+        monkeypatch.setattr("harness.runtime._runner.load_config", load_config)
+        assert runner.run(setup, argv) == 0
+        assert not load_config.called
+
+        config_yaml.write(b"-changed")
+        config_yaml.flush()
+        with pytest.raises(AssertionError, match="config loaded"):
+            runner.run(setup, argv)
+    assert names == ["test", "test"]
+
+
+def test_snapshot_key(message_proto, package):
+    """
+    message Configuration {
+        string name = 1 [(validate.rules).string.min_len = 1];
+    }
+    """
+    from google.protobuf.descriptor_pool import DescriptorPool
+    from validate import validate_pb2
+
+    def key():
+        pool = DescriptorPool()
+        for file_proto in message_proto.file:
+            pool.Add(file_proto)
+        descriptor = pool.FindMessageTypeByName(f"{package}.Configuration")
+        return snapshot_key(descriptor, "name: test")
+
+    key1 = key()
+    assert key() == key1
+    field_proto = message_proto.file[-1].message_type[0].field[0]
+    field_proto.options.Extensions[validate_pb2.rules].string.min_len = 2
+    assert key() != key1
+
+
+def test_check_snapshot(tmp_path, monkeypatch):
+    from harness.cli.check import check
+
+    example = os.path.join(os.path.dirname(__file__), "..", "examples", "web")
+    monkeypatch.syspath_prepend(example)
+    import kirk_pb2
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    names = []
+
+    async def setup(config, wires_in):
+        names.append(config.tracing.service_name)
+        return WiresOut()
+
+    # snapshot written by "harness check" is used by the service
+    config_path = os.path.join(example, "kirk.yaml")
+    with open(config_path) as config_file:
+        check(
+            os.path.join(example, "kirk.proto"),
+            config_file,
+            [],
+            snapshot_dir=str(tmp_path),
+        )
+    assert len(os.listdir(tmp_path)) == 1
+
+    load_config = Mock(side_effect=AssertionError("config loaded"))
+    monkeypatch.setattr("harness.runtime._runner.load_config", load_config)
+    runner = Runner(kirk_pb2.Configuration, WiresIn, WiresOut)
+    argv = ["test", config_path, f"--snapshot-dir={tmp_path}"]
+    assert runner.run(setup, argv) == 0
+    assert not load_config.called
+    assert names == ["kirk"]
+
+
+def test_loop_fallback(config_type, monkeypatch, caplog):
+    """
+    message Configuration {}
+    """
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        pass
+
+    loops = []
+
+    async def setup(config, wires_in):
+        loops.append(asyncio.get_event_loop())
+        return WiresOut()
+
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    runner = Runner(config_type, WiresIn, WiresOut)
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+            assert runner.run(setup, ["test", config_yaml.name, "--loop=uvloop"]) == 0
+    finally:
+        asyncio.set_event_loop_policy(None)
+    assert isinstance(loops[0], asyncio.BaseEventLoop)
+    assert "uvloop is not installed" in caplog.text
+
+
+def test_workers_inherit_sockets(config_type, message_types):
+    """
+    import "harness/net.proto";
+
+    message Configuration {
+        harness.net.Server server = 1;
+    }
+    """
+    server_type = message_types["harness.net.Server"]
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        _, port = sock.getsockname()
+
+    with tempfile.NamedTemporaryFile() as output:
+
+        class ServerWire(SocketMixin, WaitMixin, Wire):
+            def configure(self, value: server_type):
+                self._sock = self.inherited_socket(value.bind.host, value.bind.port)
+
+            async def __aenter__(self):
+                with open(output.name, "a") as f:
+                    f.write(f"{self._sock.getsockname()[1]}\n")
+                self.close()
+
+        @dataclass
+        class WiresIn:
+            pass
+
+        @dataclass
+        class WiresOut:
+            server: ServerWire
+
+        runner = Runner(config_type, WiresIn, WiresOut)
+
+        async def setup(config, wires_in):
+            return WiresOut(server=ServerWire())
+
+        with tempfile.NamedTemporaryFile(suffix=".yaml") as config_yaml:
+            config_yaml.write(
+                f"server: {{bind: {{host: 127.0.0.1, port: {port}}}}}\n".encode()
+            )
+            config_yaml.flush()
+            assert runner.run(setup, ["test", config_yaml.name, "--workers=2"]) == 0
+
+        assert output.read().decode().split() == [str(port), str(port)]
+
+
+def test_start(config_type, message_types):
+    """
+    import "harness/net.proto";
+
+    message Configuration {
+        harness.net.Server server = 1;
+    }
+    """
+    server_type = message_types["harness.net.Server"]
+
+    class ServerWire(SocketMixin, WaitMixin, Wire):
+        def configure(self, value: server_type):
+            self._host, self._port = value.bind.host, value.bind.port
+
+        async def _handle(self, reader, writer):
+            writer.write(b"pong")
+            await writer.drain()
+            writer.close()
+
+        async def __aenter__(self):
+            self._server = await asyncio.start_server(
+                self._handle, self._host, self._port
+            )
+
+        async def __aexit__(self, *exc_info):
+            self._server.close()
+            await self._server.wait_closed()
+
+        def bound_address(self):
+            return self._server.sockets[0].getsockname()[:2]
+
+    @dataclass
+    class WiresIn:
+        pass
+
+    @dataclass
+    class WiresOut:
+        server: ServerWire
+
+    runner = Runner(config_type, WiresIn, WiresOut)
+
+    async def setup(config, wires_in):
+        return WiresOut(server=ServerWire())
+
+    async def main():
+        handle = await runner.start(
+            setup, {"server": {"bind": {"host": "127.0.0.1", "port": 0}}}
+        )
+        await handle.ready
+        host, port = handle.addresses["server"]
+        assert port != 0
+        reader, writer = await asyncio.open_connection(host, port)
+        assert await reader.read() == b"pong"
+        writer.close()
+        await handle.stop()
+        assert handle._task.done()
+
+    asyncio.run(main())
+
+
+IMPORT_TIME_BUDGET = 1.0
+
+
+def test_import_time():
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import harness.runtime\n"
+        "print(time.perf_counter() - start)\n"
+        "print(any(m.startswith('opentelemetry') for m in sys.modules))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.check_output([sys.executable, "-c", code], env=env)
+    elapsed, telemetry_imported = output.decode().split()
+    assert telemetry_imported == "False"
+    assert float(elapsed) < IMPORT_TIME_BUDGET
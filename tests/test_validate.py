@@ -1,9 +1,15 @@
 import re
+import sys
+import types
 from ipaddress import ip_address
 
 import pytest
 
 from harness.runtime._validate import validate, ValidationError
+from harness.runtime._validate import compile_validators, _validators
+from harness.runtime._validate import validators_module, validate_all, validate_many
+from harness.runtime._validate import Format, _batch_validators, file_gen
+from harness.runtime import _validate
 
 
 @pytest.fixture()
@@ -39,6 +45,101 @@ def test_disabled(message_type):
     validate(message_type(field=dict(value="invalid")))
 
 
+def test_compile_validators(message_type, package):
+    """
+    message Message {
+        message Inner {
+            string value = 1 [(validate.rules).string.const = "valid"];
+            repeated Message items = 2;
+        }
+        Inner field = 1;
+    }
+    """
+    compile_validators(message_type)
+    assert f"{package}.Message" in _validators
+    assert f"{package}.Message.Inner" in _validators
+
+
+def test_generated_validators(message_type, package, monkeypatch):
+    """
+    message Message {
+        string value = 1 [(validate.rules).string.const = "valid"];
+    }
+    """
+    validated = []
+    module = types.ModuleType("generated")
+    module.VALIDATORS = {f"{package}.Message": validated.append}
+    module.COLLECTORS = {}
+    module_name = validators_module(message_type.DESCRIPTOR.file.name)
+    monkeypatch.setitem(sys.modules, module_name, module)
+
+    message = message_type(value="invalid")
+    validate(message)
+    assert validated == [message]
+
+
+def test_validate_all(message_type):
+    """
+    message Message {
+        message Inner {
+            string email = 1 [(validate.rules).string.email = true];
+            uint32 port = 2 [(validate.rules).uint32.gt = 0];
+        }
+        string name = 1 [(validate.rules).string.min_len = 1];
+        Inner inner = 2 [(validate.rules).message.required = true];
+        repeated Inner items = 3 [(validate.rules).repeated.max_items = 1];
+        oneof kind {
+            option (validate.required) = true;
+            string a = 4;
+            string b = 5;
+        }
+    }
+    """
+    valid = {"email": "admin@example.com", "port": 1}
+    assert validate_all(message_type(name="n", inner=valid, items=[valid], a="a")) == []
+    violations = validate_all(
+        message_type(
+            items=[{"email": "invalid", "port": 1}, {"email": "invalid", "port": 0}]
+        )
+    )
+    assert [(v.path, v.rule) for v in violations] == [
+        ("kind", "oneof.required"),
+        ("name", "string.min_len"),
+        ("inner", "message.required"),
+        ("items", "repeated.max_items"),
+        ("items[0].email", "string.email"),
+        ("items[1].email", "string.email"),
+        ("items[1].port", "uint32.gt"),
+    ]
+    assert violations[1].message == "name length is less than 1"
+
+    with pytest.raises(ValidationError, match="Oneof kind is required"):
+        validate(message_type())
+
+
+def test_validate_all_items(message_type):
+    """
+    message Message {
+        repeated uint32 nums = 1 [(validate.rules).repeated.items.uint32.gt = 1];
+        repeated string emails = 2 [
+            (validate.rules).repeated.items.string.email = true
+        ];
+    }
+    """
+    violations = validate_all(
+        message_type(nums=[2, 1, 3, 0], emails=["admin@example.com", "invalid"])
+    )
+    assert [(v.path, v.rule) for v in violations] == [
+        ("nums[1]", "uint32.gt"),
+        ("nums[3]", "uint32.gt"),
+        ("emails[1]", "string.email"),
+    ]
+    assert violations[0].message == "nums[] is not greater than 1"
+
+    with pytest.raises(ValidationError, match=re.escape("nums[] is not greater")):
+        validate(message_type(nums=[2, 1]))
+
+
 def test_oneof_required(message_type):
     """
     message Message {
@@ -130,6 +231,130 @@ def test_duration_lte(message_type, duration_type):
         validate(message_type(value=duration_type(seconds=60, nanos=1)))
 
 
+def test_duration_limits(message_types, package, duration_type):
+    """
+    message Lt {
+        google.protobuf.Duration value = 1 [
+            (validate.rules).duration.lt = {seconds: -1}
+        ];
+    }
+    message Lte {
+        google.protobuf.Duration value = 1 [
+            (validate.rules).duration.lte = {seconds: -1}
+        ];
+    }
+    message Gt {
+        google.protobuf.Duration value = 1 [
+            (validate.rules).duration.gt = {seconds: -1}
+        ];
+    }
+    message Gte {
+        google.protobuf.Duration value = 1 [
+            (validate.rules).duration.gte = {seconds: -1}
+        ];
+    }
+    """
+    expected = {
+        "Lt": [True, False, False],
+        "Lte": [True, True, False],
+        "Gt": [False, False, True],
+        "Gte": [False, True, True],
+    }
+    for name, results in expected.items():
+        message_type = message_types[f"{package}.{name}"]
+        for delta, valid in zip([-1, 0, 1], results):
+            value = duration_type()
+            value.FromNanoseconds(-1_000_000_000 + delta)
+            if valid:
+                validate(message_type(value=value))
+            else:
+                with pytest.raises(ValidationError, match="value is not"):
+                    validate(message_type(value=value))
+
+
+def test_timestamp_limits(message_types, package, timestamp_type):
+    """
+    message Lt {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.lt = {seconds: -1, nanos: 500}
+        ];
+    }
+    message Lte {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.lte = {seconds: -1, nanos: 500}
+        ];
+    }
+    message Gt {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.gt = {seconds: -1, nanos: 500}
+        ];
+    }
+    message Gte {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.gte = {seconds: -1, nanos: 500}
+        ];
+    }
+    """
+    expected = {
+        "Lt": [True, False, False],
+        "Lte": [True, True, False],
+        "Gt": [False, False, True],
+        "Gte": [False, True, True],
+    }
+    for name, results in expected.items():
+        message_type = message_types[f"{package}.{name}"]
+        for delta, valid in zip([-1, 0, 1], results):
+            value = timestamp_type()
+            value.FromNanoseconds(-999_999_500 + delta)
+            if valid:
+                validate(message_type(value=value))
+            else:
+                with pytest.raises(ValidationError, match="value is not"):
+                    validate(message_type(value=value))
+
+
+def test_timestamp_within_limits(message_types, package, timestamp_type, monkeypatch):
+    """
+    message Now {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.within = {seconds: 60}
+        ];
+    }
+    message Past {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.lt_now = true,
+            (validate.rules).timestamp.within = {seconds: 60}
+        ];
+    }
+    message Future {
+        google.protobuf.Timestamp value = 1 [
+            (validate.rules).timestamp.gt_now = true,
+            (validate.rules).timestamp.within = {seconds: 60}
+        ];
+    }
+    """
+    now = 1_600_000_000_000_000_000
+    monkeypatch.setitem(_validate.CTX, "time_ns", lambda: now)
+    minute = 60_000_000_000
+    offsets = [-minute - 1, -minute, -minute + 1, -1, 0, 1]
+    offsets += [minute - 1, minute, minute + 1]
+    expected = {
+        "Now": [False, False, True, True, True, True, True, False, False],
+        "Past": [False, False, True, True, False, False, False, False, False],
+        "Future": [False, False, False, False, False, True, True, False, False],
+    }
+    for name, results in expected.items():
+        message_type = message_types[f"{package}.{name}"]
+        for offset, valid in zip(offsets, results):
+            value = timestamp_type()
+            value.FromNanoseconds(now + offset)
+            if valid:
+                validate(message_type(value=value))
+            else:
+                with pytest.raises(ValidationError, match="value is not within"):
+                    validate(message_type(value=value))
+
+
 def test_enum_defined_only(message_type):
     """
     message Message {
@@ -266,6 +491,13 @@ def test_email(message_type):
         ValidationError, match="field contains more than one email address"
     ):
         validate(message_type(field="foo@example.com, bar@example.com"))
+    invalid = ["", "a@", "@example.com", ":;@", "g:;@example.com", "a@[", '""@x']
+    invalid.append("team: admin@example.com;")
+    for value in invalid:
+        with pytest.raises(
+            ValidationError, match="field contains invalid email address"
+        ):
+            validate(message_type(field=value))
 
 
 def test_hostname(message_type):
@@ -306,6 +538,47 @@ def test_string_pattern(message_type):
         validate(message_type(field="invalid"))
 
 
+def test_hoisted_constants(message_type):
+    """
+    message Message {
+        enum Kind {
+            A = 0;
+            B = 2;
+        }
+        string first = 1 [(validate.rules).string.pattern = "^(foo|bar)-[0-9]+$"];
+        string second = 2 [(validate.rules).string.pattern = "^(foo|bar)-[0-9]+$"];
+        string name = 3 [(validate.rules).string = {in: ["a", "b"]}];
+        Kind kind = 4 [(validate.rules).enum.defined_only = true];
+    }
+    """
+    source = file_gen(message_type.DESCRIPTOR, "check")
+    _, _, body = source.partition("def check(p):")
+    # same pattern is compiled once and outside of the function
+    assert source.count("re.compile(") == 1
+    assert source.count("frozenset(") == 2
+    assert "re.compile(" not in body and "frozenset(" not in body
+
+    namespace = dict(_validate.CTX)
+    exec(source, namespace)
+    check = namespace["check"]
+    pattern = "^(foo|bar)-[0-9]+$"
+    for value in ["foo-1", "bar-42", "baz-1", "foo-", "xfoo-1", "foo-1\n", ""]:
+        matches = re.search(pattern, value) is not None
+        for field in ["first", "second"]:
+            other = "second" if field == "first" else "first"
+            message = message_type(**{field: value, other: "foo-1", "name": "a"})
+            if matches:
+                check(message)
+            else:
+                with pytest.raises(ValidationError, match=f"{field} does not match"):
+                    check(message)
+    check(message_type(first="foo-1", second="bar-2", name="b", kind=2))
+    with pytest.raises(ValidationError, match="name not in"):
+        check(message_type(first="foo-1", second="bar-2", name="c"))
+    with pytest.raises(ValidationError, match="kind is not defined"):
+        check(message_type(first="foo-1", second="bar-2", name="a", kind=1))
+
+
 def test_string_ip(message_type):
     """
     message Message {
@@ -447,3 +720,123 @@ def test_uuid(message_type):
         validate(message_type(field="adbf3fd46a4141a8b5c1df09adc3a9b3"))
     with pytest.raises(ValidationError, match="field contains invalid UUID"):
         validate(message_type(field="adbf3fd4-6a41-41a8-b5c1-df09adc3a9b3-ext"))
+
+
+def test_recursive_message(message_type, package):
+    """
+    message Message {
+        message Plain {
+            string value = 1;
+        }
+        string name = 1 [(validate.rules).string.min_len = 1];
+        repeated Message children = 2;
+        Plain plain = 3;
+    }
+    """
+    valid = message_type(name="a", children=[dict(name="b")], plain=dict(value="c"))
+    validate(valid)
+    assert f"{package}.Message.Plain" not in _validators
+    invalid = message_type(name="a", children=[dict(name="b", children=[{}])])
+    with pytest.raises(ValidationError, match="name length is less than 1"):
+        validate(invalid)
+    assert [v.path for v in validate_all(invalid)] == ["children[0].children[0].name"]
+
+
+def test_format_cache():
+    fmt = Format(cache_size=2)
+    fmt.check_email("a", "admin@example.com")
+    fmt.check_email("b", "admin@example.com")
+    with pytest.raises(ValidationError, match="^c contains invalid hostname$"):
+        fmt.check_hostname("c", "-example.com")
+    with pytest.raises(ValidationError, match="^d contains invalid hostname$"):
+        fmt.check_hostname("d", "-example.com")
+    with pytest.raises(ValidationError, match="^e contains invalid email address$"):
+        fmt.check_email("e", "")
+    info = fmt.cache_info()
+    assert (info["email"].hits, info["email"].misses) == (1, 2)
+    assert (info["hostname"].hits, info["hostname"].misses) == (1, 1)
+    assert info["email"].maxsize == 2
+
+    fmt.set_cache_size(0)
+    assert fmt.cache_info() == {}
+
+
+def test_format_cache_metrics(message_type):
+    """
+    message Message {
+        string field = 1 [(validate.rules).string.hostname = true];
+    }
+    """
+    from opentelemetry.sdk.metrics.export.controller import PushController
+    from opentelemetry.sdk.metrics.export.in_memory_metrics_exporter import (
+        InMemoryMetricsExporter,
+    )
+    from harness.runtime._features import get_meter
+
+    _validate.monitor_format_cache()
+    _validate.set_format_cache_size(16)
+    try:
+        validate(message_type(field="example.com"))
+        validate(message_type(field="example.com"))
+        exporter = InMemoryMetricsExporter()
+        PushController(get_meter(), exporter, 3600).shutdown()
+    finally:
+        _validate.set_format_cache_size(0)
+    exported = {
+        record.instrument.name
+        for record in exporter.get_exported_metrics()
+        if record.labels == (("check", "hostname"),)
+    }
+    assert exported == {
+        "harness_validation_cache_hits",
+        "harness_validation_cache_misses",
+    }
+
+
+def test_validate_many(message_type):
+    """
+    message Message {
+        message Inner {
+            uint32 port = 1 [(validate.rules).uint32.gt = 0];
+        }
+        string name = 1 [(validate.rules).string.min_len = 1];
+        repeated Inner items = 2;
+    }
+    """
+    messages = [
+        message_type(name="a", items=[{"port": 1}]),
+        message_type(name=""),
+        message_type(name="b", items=[{"port": 1}, {"port": 0}]),
+    ]
+    errors = validate_many(messages)
+    assert {i: str(e) for i, e in errors.items()} == {
+        1: "name length is less than 1",
+        2: "port is not greater than 0",
+    }
+    assert validate_many([]) == {}
+    with pytest.raises(ValidationError, match="port is not greater than 0"):
+        validate(messages[2])
+
+
+def test_code_cache(message_type, package, tmp_path, monkeypatch):
+    """
+    message Message {
+        message Inner {
+            string value = 1 [(validate.rules).string.const = "valid"];
+        }
+        repeated Inner items = 1;
+    }
+    """
+    monkeypatch.setattr(_validate, "_code_cache_dir", str(tmp_path))
+    message = message_type(items=[dict(value="invalid")])
+    with pytest.raises(ValidationError, match="value not equal to 'valid'"):
+        validate(message)
+    assert len(list(tmp_path.iterdir())) == 2
+
+    # validators are loaded from the cache without generating them again
+    monkeypatch.delitem(_validators, f"{package}.Message")
+    monkeypatch.delitem(_batch_validators, f"{package}.Message.Inner")
+    monkeypatch.setattr(_validate, "file_gen", None)
+    with pytest.raises(ValidationError, match="value not equal to 'valid'"):
+        validate(message)
+    assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,512 @@
+import os
+import sys
+import time
+import socket
+import asyncio
+import logging
+import threading
+
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+from opentelemetry.sdk.metrics.export.controller import PushController
+from opentelemetry.sdk.metrics.export.in_memory_metrics_exporter import (
+    InMemoryMetricsExporter,
+)
+
+from harness import metrics_pb2, concurrent_pb2
+from harness.runtime._features import get_meter
+from harness.wires._utils import Drain
+from harness.wires.base import _inherited_sockets
+from harness.wires.asyncio import LoopMonitorWire
+from harness.wires.concurrent import ThreadPoolWire, ExecutorQueueFull
+from harness.wires.concurrent import ProcessPoolWire
+
+
+def exported_metrics():
+    exporter = InMemoryMetricsExporter()
+    controller = PushController(get_meter(), exporter, 3600)
+    controller.shutdown()
+    return {
+        (record.instrument.name, tuple(record.labels)): record.aggregator.checkpoint
+        for record in exporter.get_exported_metrics()
+    }
+
+
+def test_drain():
+    async def main():
+        drain = Drain("test_drain")
+        assert not drain.closing
+        drain.acquire()
+        drain.acquire()
+        drain.begin()
+        assert drain.closing
+
+        async def release():
+            await asyncio.sleep(0.01)
+            drain.release()
+            drain.release()
+
+        task = asyncio.ensure_future(release())
+        await drain.wait(1)
+        assert drain.in_flight == 0
+        drain.finish()
+        await task
+
+    asyncio.run(main())
+    metrics = exported_metrics()
+    labels = (("wire", "test_drain"),)
+    assert metrics[("harness_drain_duration", labels)].count == 1
+    assert metrics[("harness_drain_aborted", labels)] == 0
+
+
+def test_drain_timeout():
+    async def main():
+        drain = Drain("test_drain_timeout")
+
+        async def request():
+            with drain.track():
+                await asyncio.sleep(1)
+
+        task = asyncio.ensure_future(request())
+        await asyncio.sleep(0)
+        assert drain.in_flight == 1
+        drain.begin()
+        await drain.wait(0.01)
+        assert drain.in_flight == 1
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert drain.in_flight == 0
+        assert drain.aborted == 1
+        drain.finish()
+
+    asyncio.run(main())
+    metrics = exported_metrics()
+    labels = (("wire", "test_drain_timeout"),)
+    assert metrics[("harness_drain_aborted", labels)] == 1
+
+
+def test_grpclib_server_drain():
+    pytest.importorskip("grpclib")
+    from grpclib.const import Cardinality, Handler, Status
+    from grpclib.client import Channel
+    from grpclib.exceptions import GRPCError
+    from google.protobuf.empty_pb2 import Empty
+
+    from harness import grpc_pb2
+    from harness.wires.grpclib.server import ServerWire
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    class Service:
+        async def Slow(self, stream):
+            await stream.recv_message()
+            started.set()
+            await release.wait()
+            await stream.send_message(Empty())
+
+        def __mapping__(self):
+            return {
+                "/test.Service/Slow": Handler(
+                    self.Slow, Cardinality.UNARY_UNARY, Empty, Empty
+                )
+            }
+
+    async def main():
+        config = grpc_pb2.Server()
+        config.bind.host = "127.0.0.1"
+        config.bind.port = 0
+        config.drain_timeout.seconds = 5
+
+        wire = ServerWire([Service()])
+        wire.configure(config)
+        await wire.__aenter__()
+        host, port = wire.bound_address()
+
+        channel = Channel(host, port)
+        try:
+            slow = channel.request(
+                "/test.Service/Slow", Cardinality.UNARY_UNARY, Empty, Empty
+            )
+            async with slow as stream:
+                await stream.send_message(Empty(), end=True)
+                await started.wait()
+
+                wire.close()
+                # listening socket is closed when drain begins
+                with pytest.raises(ConnectionRefusedError):
+                    socket.create_connection((host, port)).close()
+                # new requests on the existing connection are rejected
+                with pytest.raises(GRPCError) as err:
+                    other = channel.request(
+                        "/test.Service/Slow", Cardinality.UNARY_UNARY, Empty, Empty
+                    )
+                    async with other as other_stream:
+                        await other_stream.send_message(Empty(), end=True)
+                        await other_stream.recv_message()
+                assert err.value.status is Status.UNAVAILABLE
+
+                closed = asyncio.ensure_future(wire.wait_closed())
+                await asyncio.sleep(0.01)
+                assert not closed.done()
+                release.set()
+                assert await stream.recv_message() == Empty()
+            await asyncio.wait_for(closed, 5)
+        finally:
+            channel.close()
+
+    asyncio.run(main())
+    metrics = exported_metrics()
+    labels = (("wire", "ServerWire"),)
+    assert metrics[("harness_drain_aborted", labels)] == 0
+
+
+def test_grpclib_server_inherited_socket(monkeypatch):
+    pytest.importorskip("grpclib")
+    from grpclib.const import Cardinality, Handler
+    from grpclib.client import Channel
+    from google.protobuf.empty_pb2 import Empty
+
+    from harness import grpc_pb2
+    from harness.runtime._workers import bind_socket
+    from harness.wires.grpclib.server import ServerWire
+
+    class Service:
+        async def Ping(self, stream):
+            await stream.recv_message()
+            await stream.send_message(Empty())
+
+        def __mapping__(self):
+            return {
+                "/test.Service/Ping": Handler(
+                    self.Ping, Cardinality.UNARY_UNARY, Empty, Empty
+                )
+            }
+
+    sock = bind_socket("127.0.0.1", 0)
+    monkeypatch.setitem(_inherited_sockets, ("127.0.0.1", 0), sock)
+
+    async def ping(address):
+        channel = Channel(*address)
+        try:
+            ping = channel.request(
+                "/test.Service/Ping", Cardinality.UNARY_UNARY, Empty, Empty
+            )
+            async with ping as stream:
+                await stream.send_message(Empty(), end=True)
+                assert await stream.recv_message() == Empty()
+        finally:
+            channel.close()
+
+    async def main():
+        config = grpc_pb2.Server()
+        config.bind.host = "127.0.0.1"
+        wire = ServerWire([Service()])
+        wire.configure(config)
+        await wire.__aenter__()
+        assert wire.bound_address() == sock.getsockname()
+        await ping(sock.getsockname())
+
+        # wire is restarted on the same inherited socket
+        new_config = grpc_pb2.Server()
+        new_config.CopyFrom(config)
+        new_config.drain_timeout.seconds = 1
+        await wire.reconfigure(new_config)
+        assert sock.fileno() != -1
+        assert wire.bound_address() == sock.getsockname()
+        await ping(sock.getsockname())
+
+        wire.close()
+        await wire.wait_closed()
+        assert sock.fileno() != -1
+
+    try:
+        asyncio.run(main())
+    finally:
+        sock.close()
+
+
+def test_grpclib_server_validation(message_types, package):
+    """
+    message Request {
+        string name = 1 [(validate.rules).string.min_len = 1];
+    }
+    message Reply {
+        string greeting = 1;
+    }
+    """
+    pytest.importorskip("grpclib")
+    from grpclib.const import Cardinality, Handler, Status
+    from grpclib.client import Channel
+    from grpclib.exceptions import GRPCError
+
+    from harness import grpc_pb2
+    from harness.wires.grpclib.server import ServerWire
+
+    request_type = message_types[f"{package}.Request"]
+    reply_type = message_types[f"{package}.Reply"]
+    method = f"/{package}.Greeter/Greet"
+
+    class Greeter:
+        async def Greet(self, stream):
+            request = await stream.recv_message()
+            await stream.send_message(reply_type(greeting=f"Hello, {request.name}"))
+
+        def __mapping__(self):
+            return {
+                method: Handler(
+                    self.Greet, Cardinality.UNARY_UNARY, request_type, reply_type
+                )
+            }
+
+    before = exported_metrics()
+
+    async def main():
+        config = grpc_pb2.Server(validate_requests=True)
+        config.bind.host = "127.0.0.1"
+        wire = ServerWire([Greeter()])
+        wire.configure(config)
+        await wire.__aenter__()
+        channel = Channel(*wire.bound_address())
+        try:
+            greet = channel.request(
+                method, Cardinality.UNARY_UNARY, request_type, reply_type
+            )
+            async with greet as stream:
+                await stream.send_message(request_type(name="Kirk"), end=True)
+                reply = await stream.recv_message()
+            assert reply.greeting == "Hello, Kirk"
+
+            with pytest.raises(GRPCError) as err:
+                greet = channel.request(
+                    method, Cardinality.UNARY_UNARY, request_type, reply_type
+                )
+                async with greet as stream:
+                    await stream.send_message(request_type(name=""), end=True)
+                    await stream.recv_message()
+            assert err.value.status is Status.INVALID_ARGUMENT
+            assert err.value.message == "name length is less than 1"
+        finally:
+            channel.close()
+            wire.close()
+            await wire.wait_closed()
+
+    asyncio.run(main())
+    after = exported_metrics()
+    labels = (("method", method),)
+    assert ("harness_grpc_validation_time", labels) not in before
+    assert after[("harness_grpc_validation_time", labels)].count == 2
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_aiohttp_server_reconfigure():
+    pytest.importorskip("aiohttp")
+    from aiohttp import web, ClientSession
+
+    from harness import http_pb2
+    from harness.wires.aiohttp.web import ServerWire
+
+    shutdown = []
+
+    async def index(request):
+        return web.Response(text="OK")
+
+    async def on_shutdown(app):
+        shutdown.append(app)
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/", index)
+        app.on_shutdown.append(on_shutdown)
+
+        config = http_pb2.Server()
+        config.bind.host = "127.0.0.1"
+        config.bind.port = free_port()
+        wire = ServerWire(app)
+        wire.configure(config)
+        await wire.__aenter__()
+        async with ClientSession() as session:
+            host, port = wire.bound_address()
+            async with session.get(f"http://{host}:{port}/") as response:
+                assert await response.text() == "OK"
+
+            new_config = http_pb2.Server()
+            new_config.CopyFrom(config)
+            new_config.bind.port = free_port()
+            await wire.reconfigure(new_config)
+            # application is not shut down, only the site is replaced
+            assert not shutdown
+            assert wire.bound_address() == (host, new_config.bind.port)
+            with pytest.raises(ConnectionRefusedError):
+                socket.create_connection((host, port)).close()
+            url = f"http://{host}:{new_config.bind.port}/"
+            async with session.get(url) as response:
+                assert await response.text() == "OK"
+
+        await wire.__aexit__(None, None, None)
+        assert shutdown == [app]
+
+    asyncio.run(main())
+
+
+def loop_monitor(interval, threshold):
+    config = metrics_pb2.LoopMonitor()
+    config.interval.FromNanoseconds(int(interval * 1e9))
+    config.slow_callback_threshold.FromNanoseconds(int(threshold * 1e9))
+    wire = LoopMonitorWire()
+    wire.configure(config)
+    return wire
+
+
+def test_loop_monitor(caplog):
+    caplog.set_level(logging.WARNING, "harness.wires.asyncio")
+    before = exported_metrics()
+
+    async def main():
+        wire = loop_monitor(0.01, 0.05)
+        await wire.__aenter__()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        wire.close()
+        await wire.wait_closed()
+
+    asyncio.run(main())
+    after = exported_metrics()
+    lag = after[("harness_loop_lag", ())]
+    assert lag.max >= 0.05
+    slow_callbacks = ("harness_loop_slow_callbacks", ())
+    assert after[slow_callbacks] - before.get(slow_callbacks, 0) == 1
+    assert "Slow callback took" in caplog.text
+
+
+def test_loop_monitor_close(monkeypatch):
+    original_run = asyncio.Handle._run
+    slow = []
+    monkeypatch.setattr(
+        "harness.wires.asyncio._report_slow_callback", lambda h, d: slow.append(d)
+    )
+
+    async def main():
+        first = loop_monitor(1, 0.05)
+        second = loop_monitor(1, 0.05)
+        await first.__aenter__()
+        await second.__aenter__()
+        assert asyncio.Handle._run is not original_run
+
+        first.close()
+        await first.wait_closed()
+        # second monitor still reports slow callbacks
+        assert asyncio.Handle._run is not original_run
+        time.sleep(0.1)
+        await asyncio.sleep(0)
+
+        second.close()
+        await second.wait_closed()
+        assert asyncio.Handle._run is original_run
+
+    asyncio.run(main())
+    assert len(slow) == 1
+    assert asyncio.Handle._run is original_run
+
+
+def test_thread_pool():
+    before = exported_metrics()
+    release = threading.Event()
+
+    async def main():
+        config = concurrent_pb2.ThreadPool(
+            max_workers=1, queue_size=1, thread_name_prefix="test-pool"
+        )
+        wire = ThreadPoolWire()
+        wire.configure(config)
+        await wire.__aenter__()
+        loop = asyncio.get_event_loop()
+
+        busy = asyncio.ensure_future(wire.submit(release.wait))
+        queued = asyncio.ensure_future(wire.submit(threading.current_thread))
+        await asyncio.sleep(0.01)
+        with pytest.raises(ExecutorQueueFull):
+            await wire.submit(time.sleep, 0)
+        # other tasks of the default executor are not limited
+        default = loop.run_in_executor(None, threading.current_thread)
+        addrinfo = asyncio.ensure_future(loop.getaddrinfo("127.0.0.1", 80))
+        await asyncio.sleep(0.01)
+        assert wire._executor.queued == 3
+        assert wire._executor.active == 1
+
+        release.set()
+        assert await busy is True
+        assert (await queued).name.startswith("test-pool")
+        assert (await default).name.startswith("test-pool")
+        assert await addrinfo
+        assert wire._executor.queued == 0
+        # keyword arguments are passed as usual
+        assert wire._executor.submit(int, "11", base=2).result(1) == 3
+
+        wire.close()
+        await wire.wait_closed()
+        with pytest.raises(RuntimeError):
+            await wire.submit(time.sleep, 0)
+
+    asyncio.run(main())
+    after = exported_metrics()
+    rejected = ("harness_executor_rejected", ())
+    assert after[rejected] - before.get(rejected, 0) == 1
+    assert after[("harness_executor_wait_time", ())].count >= 4
+
+
+def is_loaded(module):
+    return module in sys.modules
+
+
+def crash():
+    os._exit(1)
+
+
+def test_process_pool():
+    before = exported_metrics()
+
+    async def main():
+        # functions of this module are executed in workers
+        preload = ["colorsys", __name__]
+        config = concurrent_pb2.ProcessPool(max_workers=2, preload=preload)
+        config.timeout.FromMilliseconds(100)
+        wire = ProcessPoolWire()
+        wire.configure(config)
+        await wire.__aenter__()
+        await wire.warmup()
+        assert len(wire._executor._processes) == 2
+
+        assert await wire.submit(is_loaded, "colorsys") is True
+        assert await wire.submit(pow, 2, 10) == 1024
+        assert await wire.submit(os.getpid) != os.getpid()
+        with pytest.raises(asyncio.TimeoutError):
+            await wire.submit(time.sleep, 1)
+        assert await wire.submit(time.sleep, 0.2, timeout=1) is None
+
+        # broken pool is replaced
+        executor = wire._executor
+        with pytest.raises(BrokenProcessPool):
+            await wire.submit(crash)
+        assert wire._executor is not executor
+        # new processes are started on demand
+        assert await wire.submit(pow, 2, 10, timeout=10) == 1024
+
+        wire.close()
+        await wire.wait_closed()
+        assert not wire._executor._processes
+        with pytest.raises(RuntimeError):
+            await wire.submit(pow, 2, 10)
+
+    asyncio.run(main())
+    after = exported_metrics()
+    timeouts = ("harness_process_pool_timeouts", ())
+    assert after[timeouts] - before.get(timeouts, 0) == 1
+    assert after[("harness_process_pool_exec_time", ())].count >= 5